@@ -1,7 +1,8 @@
 """ Code to allow module store to interface with courseware index """
 from __future__ import absolute_import
 from abc import ABCMeta, abstractmethod
-from datetime import timedelta
+import hashlib
+import json
 import logging
 import re
 from six import add_metaclass
@@ -19,12 +20,10 @@ from xmodule.annotator_mixin import html_to_text
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.library_tools import normalize_key_for_search
 
-# REINDEX_AGE is the default amount of time that we look back for changes
-# that might have happened. If we are provided with a time at which the
-# indexing is triggered, then we know it is safe to only index items
-# recently changed at that time. This is the time period that represents
-# how far back from the trigger point to look back in order to index
-REINDEX_AGE = timedelta(0, 60)  # 60 seconds
+# INDEX_CHUNK_SIZE is the default number of index documents that are sent to
+# the search engine at once, so that only that many documents are held in
+# memory while a large course is being indexed
+INDEX_CHUNK_SIZE = 500
 
 log = logging.getLogger('edx.modulestore')
 
@@ -114,7 +113,25 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def content_hash(cls, item_index):
+        """ Returns a hash of the index document of an item, which changes whenever the document does """
+        return hashlib.sha1(json.dumps(item_index, sort_keys=True, default=unicode)).hexdigest()
+
+    @classmethod
+    def _get_content_hashes(cls, structure_key):
+        """ Returns the content hashes of the items of the structure as last indexed, or None """
+        # import here, because this module is also imported by the LMS, where contentstore isn't an installed app
+        from contentstore.models import SearchIndexState
+        return SearchIndexState.get_content_hashes(cls.INDEX_NAME, structure_key)
+
+    @classmethod
+    def _set_content_hashes(cls, structure_key, content_hashes):
+        """ Stores the content hashes of the items of the structure as indexed """
+        from contentstore.models import SearchIndexState
+        SearchIndexState.set_content_hashes(cls.INDEX_NAME, structure_key, content_hashes)
+
+    @classmethod
+    def index(cls, modulestore, structure_key, triggered_at=None):
         """
         Process course for indexing
 
@@ -124,11 +141,10 @@ class SearchIndexerBase(object):
         structure_key (CourseKey|LibraryKey) - course or library identifier
 
         triggered_at (datetime) - provides time at which indexing was triggered;
-            useful for index updates - only things changed recently from that date
-            (within REINDEX_AGE above ^^) will have their index updated, others skip
-            updating their index but are still walked through in order to identify
-            which items may need to be removed from the index
-            If None, then a full reindex takes place
+            useful for index updates - only items whose index document has changed
+            since the last time the structure was indexed are sent to the index, and
+            only items which were indexed then but have since gone are removed from it.
+            If None, or if the structure was never indexed, then a full reindex takes place
 
         Returns:
         Number of items that have been added to the index
@@ -140,6 +156,14 @@ class SearchIndexerBase(object):
 
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
+        chunk_size = getattr(settings, 'SEARCH_INDEX_CHUNK_SIZE', INDEX_CHUNK_SIZE)
+
+        # The content hashes of the items as last indexed, which are None for a full reindex
+        previous_hashes = cls._get_content_hashes(structure_key) if triggered_at is not None else None
+
+        # content_hashes are the content hashes of all the items with an index document,
+        # whether or not they have changed, to compare with on the next update.
+        content_hashes = {}
 
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
         indexed_count = {
@@ -152,9 +176,9 @@ class SearchIndexerBase(object):
         # list - those are ready to be destroyed
         indexed_items = set()
 
-        # items_index is a list of all the items index dictionaries.
-        # it is used to collect all indexes and index them using bulk API,
-        # instead of per item index API call.
+        # items_index is a list of the index dictionaries of the items to be indexed.
+        # it is used to collect indexes and index them using bulk API, instead of per
+        # item index API call, in chunks of chunk_size items.
         items_index = []
 
         def get_item_location(item):
@@ -163,18 +187,21 @@ class SearchIndexerBase(object):
             """
             return item.location.version_agnostic().replace(branch=None)
 
-        def prepare_item_index(item, skip_index=False, groups_usage_info=None):
+        def submit_items_index():
+            """
+            Send the collected index dictionaries to the index
+            """
+            if items_index:
+                searcher.index(cls.DOCUMENT_TYPE, items_index)
+                del items_index[:]
+
+        def prepare_item_index(item, groups_usage_info=None):
             """
-            Add this item to the items_index and indexed_items list
+            Add this item to the items_index, if its content changed, and indexed_items list
 
             Arguments:
             item - item to add to index, its children will be processed recursively
 
-            skip_index - simply walk the children in the tree, the content change is
-                older than the REINDEX_AGE window and would have been already indexed.
-                This should really only be passed from the recursive child calls when
-                this method has determined that it is safe to do so
-
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
@@ -209,23 +236,19 @@ class SearchIndexerBase(object):
             item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
             indexed_items.add(item_id)
             if item.has_children:
-                # determine if it's okay to skip adding the children herein based upon how recently any may have changed
-                skip_child_index = skip_index or \
-                    (triggered_at is not None and (triggered_at - item.subtree_edited_on) > reindex_age)
                 children_groups_usage = []
                 for child_item in item.get_children():
                     if modulestore.has_published_version(child_item):
                         children_groups_usage.append(
                             prepare_item_index(
                                 child_item,
-                                skip_index=skip_child_index,
                                 groups_usage_info=groups_usage_info
                             )
                         )
                 if None in children_groups_usage:
                     item_content_groups = None
 
-            if skip_index or not item_index_dictionary:
+            if not item_index_dictionary:
                 return
 
             item_index = {}
@@ -238,13 +261,21 @@ class SearchIndexerBase(object):
                     item_index['start_date'] = item.start
                 item_index['content_groups'] = item_content_groups if item_content_groups else None
                 item_index.update(cls.supplemental_fields(item))
-                items_index.append(item_index)
-                indexed_count["count"] += 1
-                return item_content_groups
+                content_hash = cls.content_hash(item_index)
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
                 log.warning('Could not index item: %s - %r', item.location, err)
                 error_list.append(_('Could not index item: {}').format(item.location))
+                return
+
+            content_hashes[item_id] = content_hash
+            # only send the items whose index document has changed since they were last indexed
+            if previous_hashes is None or previous_hashes.get(item_id) != content_hash:
+                items_index.append(item_index)
+                indexed_count["count"] += 1
+                if len(items_index) >= chunk_size:
+                    submit_items_index()
+            return item_content_groups
 
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
@@ -257,8 +288,14 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                submit_items_index()
+                if previous_hashes is None:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                else:
+                    deleted_items = set(previous_hashes) - indexed_items
+                    if deleted_items:
+                        searcher.remove(cls.DOCUMENT_TYPE, list(deleted_items))
+                cls._set_content_hashes(structure_key, content_hashes)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import util.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contentstore', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexState',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('index_name', models.CharField(max_length=255)),
+                ('structure_key', models.CharField(max_length=255)),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('content_hashes_json', util.models.CompressedTextField(blank=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchindexstate',
+            unique_together=set([('index_name', 'structure_key')]),
+        ),
+    ]
@@ -1,10 +1,13 @@
 """
 Models for contentstore
 """
+import json
 
+from django.db import models
 from django.db.models.fields import TextField
 
 from config_models.models import ConfigurationModel
+from util.models import CompressedTextField
 
 
 class VideoUploadConfig(ConfigurationModel):
@@ -22,3 +25,41 @@ class VideoUploadConfig(ConfigurationModel):
 
 class PushNotificationConfig(ConfigurationModel):
     """Configuration for mobile push notifications."""
+
+
+class SearchIndexState(models.Model):
+    """
+    The content hashes of the items of a course or library, as of the last
+    time that they were sent to a search index.
+    """
+    index_name = models.CharField(max_length=255)
+    structure_key = models.CharField(max_length=255)
+    modified = models.DateTimeField(auto_now=True)
+    # JSON mapping of the ids of the indexed items to the hashes of their index documents
+    content_hashes_json = CompressedTextField(blank=True)
+
+    class Meta(object):
+        unique_together = ('index_name', 'structure_key')
+
+    @classmethod
+    def get_content_hashes(cls, index_name, structure_key):
+        """
+        Returns the dict of the content hashes of the items of structure_key
+        in the index, or None if they were never stored.
+        """
+        try:
+            state = cls.objects.get(index_name=index_name, structure_key=unicode(structure_key))
+        except cls.DoesNotExist:
+            return None
+        return json.loads(state.content_hashes_json or '{}')
+
+    @classmethod
+    def set_content_hashes(cls, index_name, structure_key, content_hashes):
+        """
+        Stores the dict of the content hashes of the items of structure_key in the index.
+        """
+        cls.objects.update_or_create(
+            index_name=index_name,
+            structure_key=unicode(structure_key),
+            defaults={'content_hashes_json': json.dumps(content_hashes)},
+        )
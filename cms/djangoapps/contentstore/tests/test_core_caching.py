@@ -3,8 +3,10 @@ Tests core caching facilities.
 """
 
 from django.test import TestCase
+from mock import patch
 
 from opaque_keys.edx.locations import Location
+from openedx.core.djangoapps.contentserver import caching
 from openedx.core.djangoapps.contentserver.caching import get_cached_content, set_cached_content, del_cached_content
 
 
@@ -12,9 +14,11 @@ class Content(object):
     """
     Mock cached content
     """
-    def __init__(self, location, content):
+    def __init__(self, location, content, content_digest=None):
         self.location = location
         self.content = content
+        self.length = len(content)
+        self.content_digest = content_digest
 
     def get_id(self):
         return self.location.to_deprecated_son()
@@ -43,3 +47,63 @@ class CachingTestCase(TestCase):
                          'should not be stored in cache with unicodeLocation')
         self.assertEqual(None, get_cached_content(self.nonUnicodeLocation),
                          'should not be stored in cache with nonUnicodeLocation')
+
+
+class LocalCachingTestCase(TestCase):
+    """
+    Tests for the process-local tier of the content cache.
+    """
+    location = Location(u'c4x', u'mitX', u'800', u'run', u'asset', u'logo.png')
+
+    def setUp(self):
+        super(LocalCachingTestCase, self).setUp()
+        for patcher in (
+            patch.object(caching.LOCAL_CONTENT_CACHE, 'max_size', 1024),
+            patch.dict(caching.LOCAL_CACHE_SETTINGS, {
+                'MAX_ITEM_SIZE': 100, 'TTL': 60, 'INVALIDATION_CHECK_INTERVAL': 0,
+            }),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        caching.LOCAL_CONTENT_CACHE.clear()
+        self.addCleanup(caching.LOCAL_CONTENT_CACHE.clear)
+        self.addCleanup(del_cached_content, self.location)
+
+    def _delete_from_shared_cache(self):
+        """
+        Deletes the content from the shared cache only.
+        """
+        caching.CONTENT_CACHE.delete(unicode(self.location).encode('utf-8'), version=caching.STATIC_CONTENT_VERSION)
+
+    def test_get_from_local_cache(self):
+        content = Content(self.location, 'small content')
+        set_cached_content(content)
+        self._delete_from_shared_cache()
+        self.assertIs(get_cached_content(self.location), content)
+
+    def test_large_content_not_cached_locally(self):
+        set_cached_content(Content(self.location, 'x' * 101))
+        self._delete_from_shared_cache()
+        self.assertIsNone(get_cached_content(self.location))
+
+    def test_ttl(self):
+        with patch('openedx.core.djangoapps.contentserver.caching.time.time', return_value=1000):
+            set_cached_content(Content(self.location, 'small content'))
+        self._delete_from_shared_cache()
+        with patch('openedx.core.djangoapps.contentserver.caching.time.time', return_value=1061):
+            self.assertIsNone(get_cached_content(self.location))
+
+    def test_digest_mismatch(self):
+        set_cached_content(Content(self.location, 'small content', content_digest='old'))
+        new_content = Content(self.location, 'new content', content_digest='new')
+        caching.CONTENT_CACHE.set(
+            unicode(self.location).encode('utf-8'), new_content, version=caching.STATIC_CONTENT_VERSION
+        )
+        self.assertEqual(get_cached_content(self.location, 'new').content, 'new content')
+
+    def test_invalidation_broadcast(self):
+        set_cached_content(Content(self.location, 'small content'))
+        self._delete_from_shared_cache()
+        # Another process invalidates some content.
+        caching._broadcast_invalidation()  # pylint: disable=protected-access
+        self.assertIsNone(get_cached_content(self.location))
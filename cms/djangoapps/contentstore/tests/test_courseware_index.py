@@ -248,15 +248,9 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         """ kick off complete reindex of the course """
         return CoursewareSearchIndexer.do_course_reindex(store, self.course.id)
 
-    def index_recent_changes(self, store, since_time):
+    def index_recent_changes(self, store):
         """ index course using recent changes """
-        trigger_time = datetime.now(UTC)
-        return CoursewareSearchIndexer.index(
-            store,
-            self.course.id,
-            triggered_at=trigger_time,
-            reindex_age=(trigger_time - since_time)
-        )
+        return CoursewareSearchIndexer.index(store, self.course.id, triggered_at=datetime.now(UTC))
 
     def _get_default_search(self):
         return {"course": unicode(self.course.id)}
@@ -397,12 +391,15 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertFalse(indexed_count)
 
-    def _test_time_based_index(self, store):
-        """ Make sure that a time based request to index does not index anything too old """
+    def _test_incremental_index(self, store):
+        """ Make sure that a request to update the index only indexes what has changed """
         self.publish_item(store, self.vertical.location)
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 4)
 
+        # nothing has changed
+        self.assertEqual(self.index_recent_changes(store), 0)
+
         # Add a new sequential
         sequential2 = ItemFactory.create(
             parent_location=self.chapter.location,
@@ -429,18 +426,52 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
             modulestore=store,
         )
 
-        before_time = datetime.now(UTC)
         self.publish_item(store, vertical2.location)
-        # index based on time, will include an index of the origin sequential
-        # because it is in a common subtree but not of the original vertical
-        # because the original sequential's subtree is too old
-        new_indexed_count = self.index_recent_changes(store, before_time)
-        self.assertEqual(new_indexed_count, 5)
+        # only the new sequential, vertical and html are indexed, the
+        # index documents of the other items haven't changed
+        new_indexed_count = self.index_recent_changes(store)
+        self.assertEqual(new_indexed_count, 3)
+        response = self.search()
+        self.assertEqual(response["total"], 7)
+
+        # renaming the vertical changes its own document, and the location of its child
+        self.vertical.display_name = "Subsection 1 renamed"
+        self.update_item(store, self.vertical)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_recent_changes(store), 2)
 
         # full index again
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_deletion(self, store):
+        """ Make sure that a request to update the index removes deleted items """
+        self.publish_item(store, self.vertical.location)
+        self.reindex_course(store)
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(self.index_recent_changes(store), 0)
+        response = self.search()
+        self.assertEqual(response["total"], 3)
+
+    def _test_chunked_index(self, store):
+        """ Make sure that documents are sent to the index in chunks """
+        self.publish_item(store, self.vertical.location)
+        searcher = SearchEngine.get_search_engine(CoursewareSearchIndexer.INDEX_NAME)
+        with patch.object(SearchEngine, 'get_search_engine', return_value=searcher):
+            with patch.object(searcher, 'index', wraps=searcher.index) as mock_index:
+                with self.settings(SEARCH_INDEX_CHUNK_SIZE=3):
+                    self.reindex_course(store)
+        self.assertEqual(
+            [len(call[0][1]) for call in mock_index.call_args_list if call[0][0] == self.DOCUMENT_TYPE],
+            [3, 1]
+        )
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -569,8 +600,16 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         self._perform_test_using_store(store_type, self._test_search_disabled)
 
     @ddt.data(*WORKS_WITH_STORES)
-    def test_time_based_index(self, store_type):
-        self._perform_test_using_store(store_type, self._test_time_based_index)
+    def test_incremental_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_deletion(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_deletion)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_chunked_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_chunked_index)
 
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
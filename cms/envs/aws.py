@@ -323,6 +323,14 @@ for name, database in DATABASES.items():
         })
 
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE', COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE
+)
+COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE', COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE
+)
+CONTENTSERVER_LOCAL_CACHE.update(ENV_TOKENS.get('CONTENTSERVER_LOCAL_CACHE', {}))
+COURSE_IMPORT_STATIC_WORKERS = ENV_TOKENS.get('COURSE_IMPORT_STATIC_WORKERS', COURSE_IMPORT_STATIC_WORKERS)
 
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ENV_TOKENS.get(
     'MODULESTORE_FIELD_OVERRIDE_PROVIDERS',
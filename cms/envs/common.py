@@ -470,6 +470,32 @@ MODULESTORE = {
     }
 }
 
+# Maximum size, in bytes of uncompressed pickled data, of the per-process
+# cache of split modulestore course structures that sits in front of the
+# 'course_structure_cache'.  Set to 0 to disable it.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 50 * 1024 * 1024
+
+# Maximum size, in bytes of pickled data, of the per-process cache of split
+# modulestore definitions that sits in front of the 'course_definition_cache',
+# if there is one.  Set to 0 to disable it.
+COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE = 20 * 1024 * 1024
+
+# Number of threads which upload the static files of a course being imported
+# into the contentstore concurrently.
+COURSE_IMPORT_STATIC_WORKERS = 4
+
+# Process-local cache of small course assets, in front of the 'course_assets' cache.
+CONTENTSERVER_LOCAL_CACHE = {
+    # Maximum total size, in bytes, of the cached assets.  Set to 0 to disable the cache.
+    'MAX_SIZE': 32 * 1024 * 1024,
+    # Maximum size, in bytes, of each cached asset.
+    'MAX_ITEM_SIZE': 256 * 1024,
+    # Number of seconds for which an asset is served from the cache.
+    'TTL': 60,
+    # Minimum number of seconds between checks for assets invalidated by other processes.
+    'INVALIDATION_CHECK_INTERVAL': 5,
+}
+
 # Modulestore-level field override providers. These field override providers don't
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
@@ -182,6 +182,15 @@ CACHES = {
     },
 }
 
+# Don't cache course structures, definitions or assets per process, so that they don't leak between tests.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 0
+COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE = 0
+CONTENTSERVER_LOCAL_CACHE = dict(CONTENTSERVER_LOCAL_CACHE, MAX_SIZE=0)
+
+# Don't cache the roles of users or enrollment counts, so that they don't leak between tests.
+ROLE_CACHE_TIMEOUT = 0
+ENROLLMENT_COUNTS_CACHE_TIMEOUT = 0
+
 # hide ratelimit warnings while running tests
 filterwarnings('ignore', message='No request passed to the backend, unable to rate-limit')
 
@@ -872,6 +872,29 @@ class AlreadyEnrolledError(CourseEnrollmentException):
     pass
 
 
+# Number of seconds for which the enrollment counts of a course are cached, 0 for not at all.
+DEFAULT_ENROLLMENT_COUNTS_CACHE_TIMEOUT = 300
+
+
+def _enrollment_counts_cache_timeout():
+    """Returns the number of seconds for which enrollment counts are cached."""
+    return getattr(settings, 'ENROLLMENT_COUNTS_CACHE_TIMEOUT', DEFAULT_ENROLLMENT_COUNTS_CACHE_TIMEOUT)
+
+
+def _enrollment_counts_cache_key(course_id, name):
+    """Returns the cache key of one of the enrollment counts of a course."""
+    return u'student.enrollment_counts.{}.{}'.format(course_id, name)
+
+
+def _incr_enrollment_count(cache_key, delta):
+    """Adds `delta` to a cached enrollment count, if it is cached."""
+    try:
+        cache.incr(cache_key, delta)
+    except ValueError:
+        # The count isn't cached.
+        pass
+
+
 class CourseEnrollmentManager(models.Manager):
     """
     Custom manager for CourseEnrollment with Table-level filter methods.
@@ -883,18 +906,14 @@ class CourseEnrollmentManager(models.Manager):
 
         'course_id' is the course_id to return enrollments
         """
-
-        enrollment_number = super(CourseEnrollmentManager, self).get_queryset().filter(
-            course_id=course_id,
-            is_active=1
-        ).count()
-
-        return enrollment_number
+        return self.enrollment_counts(course_id)['total']
 
     def num_enrolled_in_exclude_admins(self, course_id):
         """
         Returns the count of active enrollments in a course excluding instructors, staff and CCX coaches.
 
+        The count is cached, see `update_cached_counts`.
+
         Arguments:
             course_id (CourseLocator): course_id to return enrollments (count).
 
@@ -902,6 +921,13 @@ class CourseEnrollmentManager(models.Manager):
             int: Count of enrollments excluding staff, instructors and CCX coaches.
 
         """
+        timeout = _enrollment_counts_cache_timeout()
+        cache_key = _enrollment_counts_cache_key(course_id, 'excluding_admins')
+        if timeout:
+            count = cache.get(cache_key)
+            if count is not None:
+                return count
+
         # To avoid circular imports.
         from student.roles import CourseCcxCoachRole, CourseInstructorRole, CourseStaffRole
         course_locator = course_id
@@ -913,11 +939,15 @@ class CourseEnrollmentManager(models.Manager):
         admins = CourseInstructorRole(course_locator).users_with_role()
         coaches = CourseCcxCoachRole(course_locator).users_with_role()
 
-        return super(CourseEnrollmentManager, self).get_queryset().filter(
+        count = super(CourseEnrollmentManager, self).get_queryset().filter(
             course_id=course_id,
             is_active=1,
         ).exclude(user__in=staff).exclude(user__in=admins).exclude(user__in=coaches).count()
 
+        if timeout:
+            cache.set(cache_key, count, timeout)
+        return count
+
     def is_course_full(self, course):
         """
         Returns a boolean value regarding whether a course has already reached it's max enrollment
@@ -940,7 +970,23 @@ class CourseEnrollmentManager(models.Manager):
         """
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
-        """
+
+        The counts are cached, see `update_cached_counts`.
+        """
+        timeout = _enrollment_counts_cache_timeout()
+        if timeout:
+            modes = cache.get(_enrollment_counts_cache_key(course_id, 'modes'))
+            if modes is not None:
+                mode_keys = {_enrollment_counts_cache_key(course_id, u'mode.' + mode): mode for mode in modes}
+                counts = cache.get_many(mode_keys.keys())
+                if len(counts) == len(mode_keys):
+                    enroll_dict = defaultdict(int)
+                    for cache_key, count in counts.iteritems():
+                        if count > 0:
+                            enroll_dict[mode_keys[cache_key]] = count
+                    enroll_dict['total'] = sum(enroll_dict.values())
+                    return enroll_dict
+
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super(CourseEnrollmentManager, self).get_queryset().filter(course_id=course_id, is_active=True).values(
@@ -950,9 +996,74 @@ class CourseEnrollmentManager(models.Manager):
         for item in query:
             enroll_dict[item['mode']] = item['mode__count']
             total += item['mode__count']
+
+        if timeout:
+            values = {
+                _enrollment_counts_cache_key(course_id, u'mode.' + mode): count
+                for mode, count in enroll_dict.iteritems()
+            }
+            values[_enrollment_counts_cache_key(course_id, 'modes')] = tuple(enroll_dict)
+            cache.set_many(values, timeout)
+
         enroll_dict['total'] = total
         return enroll_dict
 
+    def update_cached_counts(self, course_id, user, previous_mode, mode):
+        """
+        Updates the cached enrollment counts of a course, after the
+        enrollment of `user` changed.
+
+        `previous_mode` and `mode` are the modes of the enrollment before and
+        after the change, or None if it wasn't or isn't active.
+
+        Counts that aren't cached are left alone, to be counted when they are
+        next needed.  Cached counts expire after ENROLLMENT_COUNTS_CACHE_TIMEOUT
+        seconds, so that they are periodically reconciled with the database
+        even if enrollments are changed without calling this method.
+        """
+        if not _enrollment_counts_cache_timeout() or previous_mode == mode:
+            return
+
+        modes = cache.get(_enrollment_counts_cache_key(course_id, 'modes'))
+        for changed_mode, delta in ((previous_mode, -1), (mode, 1)):
+            if changed_mode is None:
+                continue
+            if modes is not None and changed_mode not in modes:
+                # The first enrollment in this mode, so count the modes again.
+                cache.delete(_enrollment_counts_cache_key(course_id, 'modes'))
+            else:
+                _incr_enrollment_count(_enrollment_counts_cache_key(course_id, u'mode.' + changed_mode), delta)
+
+        active_delta = (mode is not None) - (previous_mode is not None)
+        if active_delta and not self._is_course_admin(course_id, user):
+            _incr_enrollment_count(_enrollment_counts_cache_key(course_id, 'excluding_admins'), active_delta)
+
+    def invalidate_cached_counts(self, course_id):
+        """
+        Drops the cached enrollment counts of a course, so that they are
+        counted when they are next needed.
+        """
+        cache.delete_many([
+            _enrollment_counts_cache_key(course_id, 'modes'),
+            _enrollment_counts_cache_key(course_id, 'excluding_admins'),
+        ])
+
+    def _is_course_admin(self, course_id, user):
+        """
+        Returns whether the user is excluded from `num_enrolled_in_exclude_admins`.
+        """
+        # To avoid circular imports.
+        from student.roles import CourseCcxCoachRole, CourseInstructorRole, CourseStaffRole
+        course_locator = course_id
+
+        if getattr(course_id, 'ccx', None):
+            course_locator = course_id.to_course_locator()
+
+        return any(
+            role(course_locator).has_user(user, check_user_activation=False)
+            for role in (CourseStaffRole, CourseInstructorRole, CourseCcxCoachRole)
+        )
+
     def enrolled_and_dropped_out_users(self, course_id):
         """Return a queryset of Users in the course."""
         return User.objects.filter(
@@ -1102,6 +1213,7 @@ class CourseEnrollment(models.Model):
         This saves immediately.
 
         """
+        previous_mode = self.mode if self.is_active else None
         activation_changed = False
         # if is_active is None, then the call to update_enrollment didn't specify
         # any value, so just leave is_active as it is
@@ -1123,6 +1235,9 @@ class CourseEnrollment(models.Model):
                 self.course_id,
                 CourseEnrollmentState(self.mode, self.is_active),
             )
+            CourseEnrollment.objects.update_cached_counts(
+                self.course_id, self.user, previous_mode, self.mode if self.is_active else None
+            )
 
         if activation_changed:
             if self.is_active:
@@ -1681,6 +1796,13 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     cache.delete(cache_key)
 
 
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def update_cached_enrollment_counts(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Don't count a deleted enrollment in the cached enrollment counts of its course."""
+    if instance.is_active:
+        CourseEnrollment.objects.update_cached_counts(instance.course_id, instance.user, instance.mode, None)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -1808,6 +1930,17 @@ class CourseAccessRole(models.Model):
         return "[CourseAccessRole] user: {}   role: {}   org: {}   course: {}".format(self.user.username, self.role, self.org, self.course_id)
 
 
+@receiver(models.signals.post_save, sender=CourseAccessRole)
+@receiver(models.signals.post_delete, sender=CourseAccessRole)
+def invalidate_role_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the shared cache of the roles of the user whose CourseAccessRole changed."""
+    from student.roles import RoleCache  # avoid a circular import, as student.roles imports this module
+    RoleCache.invalidate(instance.user_id)
+    if instance.course_id:
+        # Admins aren't counted by CourseEnrollmentManager.num_enrolled_in_exclude_admins.
+        CourseEnrollment.objects.invalidate_cached_counts(instance.course_id)
+
+
 #### Helper methods for use from python manage.py shell and other classes.
 
 
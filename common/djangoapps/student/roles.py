@@ -4,8 +4,11 @@ adding users, removing users, and listing members
 """
 
 from abc import ABCMeta, abstractmethod
+from uuid import uuid4
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 import logging
 
 from student.models import CourseAccessRole
@@ -14,6 +17,9 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
 
 log = logging.getLogger(__name__)
 
+# Number of seconds for which the roles of a user are kept in the shared cache, or 0 not to cache them.
+DEFAULT_ROLE_CACHE_TIMEOUT = 300
+
 # A list of registered access roles.
 REGISTERED_ACCESS_ROLES = {}
 
@@ -37,22 +43,81 @@ def register_access_role(cls):
 class RoleCache(object):
     """
     A cache of the CourseAccessRoles held by a particular user
+
+    The roles are indexed by (role, course_id, org), so that checking for a
+    role doesn't depend on the number of roles the user holds.  They are also
+    kept in the shared cache, under a version of the user's roles that is
+    changed whenever one of the user's CourseAccessRoles is saved or deleted,
+    so that they aren't read from the database on every request.
     """
+    CACHE_KEY_PREFIX = 'student.roles.RoleCache'
+
     def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
+        self._roles = self._get_roles(user.id)
+
+    @classmethod
+    def _cache_keys(cls, user_id):
+        """
+        Return the shared cache keys of the version of the user's roles, and of the roles.
+        """
+        return (
+            u'{}.version.{}'.format(cls.CACHE_KEY_PREFIX, user_id),
+            u'{}.roles.{}'.format(cls.CACHE_KEY_PREFIX, user_id),
         )
 
+    @classmethod
+    def _get_roles(cls, user_id):
+        """
+        Return the set of (role, course_id, org) held by the user, from the shared cache if it's up to date.
+        """
+        timeout = getattr(settings, 'ROLE_CACHE_TIMEOUT', DEFAULT_ROLE_CACHE_TIMEOUT)
+        if not timeout:
+            return cls._get_roles_from_db(user_id)
+
+        version_key, roles_key = cls._cache_keys(user_id)
+        cached = cache.get_many([version_key, roles_key])
+        version = cached.get(version_key)
+        if version is not None and roles_key in cached:
+            cached_version, roles = cached[roles_key]
+            if cached_version == version:
+                return roles
+
+        if version is None:
+            version = uuid4().hex
+            cache.set(version_key, version, timeout)
+        roles = cls._get_roles_from_db(user_id)
+        cache.set(roles_key, (version, roles), timeout)
+        return roles
+
+    @staticmethod
+    def _get_roles_from_db(user_id):
+        """
+        Return the set of (role, course_id, org) held by the user, from the database.
+        """
+        # values_list returns course ids as strings, which the field converts to CourseKeys (or None).
+        course_id_field = CourseAccessRole._meta.get_field('course_id')  # pylint: disable=protected-access
+        return frozenset(
+            (role, course_id_field.to_python(course_id), org)
+            for role, course_id, org in CourseAccessRole.objects.filter(user_id=user_id).values_list(
+                'role', 'course_id', 'org'
+            )
+        )
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        Make the shared cache of the user's roles out of date, after they were changed.
+        """
+        timeout = getattr(settings, 'ROLE_CACHE_TIMEOUT', DEFAULT_ROLE_CACHE_TIMEOUT)
+        if timeout:
+            version_key, __ = cls._cache_keys(user_id)
+            cache.set(version_key, uuid4().hex, timeout)
+
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return (role, course_id, org) in self._roles
 
 
 class AccessRole(object):
@@ -5,10 +5,12 @@ import hashlib
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
 from django.db.models.functions import Lower
+from django.test.utils import override_settings
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
 from student.models import CourseEnrollment
+from student.roles import CourseStaffRole
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 
 
@@ -82,3 +84,63 @@ class CourseEnrollmentTests(SharedModuleStoreTestCase):
         # Modifying enrollments should delete the cached value.
         CourseEnrollmentFactory.create(user=self.user)
         self.assertIsNone(cache.get(CourseEnrollment.enrollment_status_hash_cache_key(self.user)))
+
+    def assert_enrollment_counts(self, course_id, expected_counts, expected_excluding_admins):
+        """Verify the cached enrollment counts, and that they match the database."""
+        with self.assertNumQueries(0):
+            counts = CourseEnrollment.objects.enrollment_counts(course_id)
+            self.assertEqual(dict(counts), expected_counts)
+            self.assertEqual(CourseEnrollment.objects.num_enrolled_in(course_id), expected_counts['total'])
+            excluding_admins = CourseEnrollment.objects.num_enrolled_in_exclude_admins(course_id)
+            self.assertEqual(excluding_admins, expected_excluding_admins)
+
+        with override_settings(ENROLLMENT_COUNTS_CACHE_TIMEOUT=0):
+            self.assertEqual(dict(CourseEnrollment.objects.enrollment_counts(course_id)), expected_counts)
+            self.assertEqual(
+                CourseEnrollment.objects.num_enrolled_in_exclude_admins(course_id), expected_excluding_admins
+            )
+
+    @override_settings(ENROLLMENT_COUNTS_CACHE_TIMEOUT=300)
+    def test_cached_enrollment_counts(self):
+        course_id = self.course.id  # pylint: disable=no-member
+        other_user = UserFactory.create()
+        CourseEnrollment.enroll(self.user, course_id, mode='honor')
+
+        # The counts are cached when they are first needed.
+        self.assertEqual(CourseEnrollment.objects.enrollment_counts(course_id)['total'], 1)
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in_exclude_admins(course_id), 1)
+        self.assert_enrollment_counts(course_id, {'honor': 1, 'total': 1}, 1)
+
+        # Then they are updated as enrollments change.
+        CourseEnrollment.enroll(other_user, course_id, mode='honor')
+        self.assert_enrollment_counts(course_id, {'honor': 2, 'total': 2}, 2)
+
+        CourseEnrollment.enroll(self.user, course_id, mode='verified')
+        self.assertEqual(dict(CourseEnrollment.objects.enrollment_counts(course_id)), {
+            'honor': 1, 'verified': 1, 'total': 2,
+        })
+        self.assert_enrollment_counts(course_id, {'honor': 1, 'verified': 1, 'total': 2}, 2)
+
+        CourseEnrollment.unenroll(other_user, course_id)
+        self.assert_enrollment_counts(course_id, {'verified': 1, 'total': 1}, 1)
+
+        CourseEnrollment.objects.get(user=self.user, course_id=course_id).delete()
+        self.assert_enrollment_counts(course_id, {'total': 0}, 0)
+
+    @override_settings(ENROLLMENT_COUNTS_CACHE_TIMEOUT=300)
+    def test_cached_enrollment_counts_exclude_admins(self):
+        course_id = self.course.id  # pylint: disable=no-member
+        staff = UserFactory.create()
+        CourseStaffRole(course_id).add_users(staff)
+        CourseEnrollment.enroll(self.user, course_id, mode='honor')
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in_exclude_admins(course_id), 1)
+
+        CourseEnrollment.enroll(staff, course_id, mode='honor')
+        CourseEnrollment.objects.enrollment_counts(course_id)
+        self.assert_enrollment_counts(course_id, {'honor': 2, 'total': 2}, 1)
+
+        # Changing the roles of users drops the cached counts.
+        CourseStaffRole(course_id).remove_users(staff)
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in_exclude_admins(course_id), 2)
+        CourseStaffRole(course_id).add_users(self.user)
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in_exclude_admins(course_id), 1)
@@ -3,6 +3,7 @@ Tests of student.roles
 """
 import ddt
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
 from student.tests.factories import AnonymousUserFactory
@@ -13,6 +14,13 @@ from student.roles import (
 )
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'student.tests.test_roles',
+    }
+}
+
 
 class RolesTestCase(TestCase):
     """
@@ -193,3 +201,23 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_roles_from_shared_cache(self):
+        with override_settings(CACHES=LOCMEM_CACHES, ROLE_CACHE_TIMEOUT=300):
+            CourseStaffRole(self.IN_KEY).add_users(self.user)
+            RoleCache(self.user)
+
+            with self.assertNumQueries(0):
+                cache = RoleCache(self.user)
+            self.assertTrue(cache.has_role('staff', self.IN_KEY, 'edX'))
+
+    def test_shared_cache_invalidated(self):
+        with override_settings(CACHES=LOCMEM_CACHES, ROLE_CACHE_TIMEOUT=300):
+            CourseStaffRole(self.IN_KEY).add_users(self.user)
+            self.assertFalse(RoleCache(self.user).has_role('instructor', self.IN_KEY, 'edX'))
+
+            CourseInstructorRole(self.IN_KEY).add_users(self.user)
+            self.assertTrue(RoleCache(self.user).has_role('instructor', self.IN_KEY, 'edX'))
+
+            CourseStaffRole(self.IN_KEY).remove_users(self.user)
+            self.assertFalse(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
@@ -25,3 +25,8 @@ class BaseBackend(object):
     def send(self, event):
         """Send event to tracker."""
         pass
+
+    def send_many(self, events):
+        """Send a batch of events to tracker."""
+        for event in events:
+            self.send(event)
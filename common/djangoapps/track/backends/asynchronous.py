@@ -0,0 +1,162 @@
+"""
+Event tracker backend that sends events to another backend asynchronously.
+
+Events are put on a bounded, in-process queue, from which a background
+thread sends them to the wrapped backend in batches, using its `send_many`
+method.  The request that emits an event therefore doesn't wait for the
+event to be stored.
+
+When the queue is full, which happens if the wrapped backend can't keep up,
+events are dropped rather than slowing down requests.  The number of dropped
+events is counted, and reported as the `track.async.dropped` metric.
+
+"""
+
+from __future__ import absolute_import
+
+import atexit
+import logging
+import os
+import threading
+import time
+from Queue import Queue, Empty, Full
+
+from dogapi import dog_stats_api
+
+from track.backends import BaseBackend
+
+
+log = logging.getLogger(__name__)
+
+
+class AsyncBackend(BaseBackend):
+    """
+    Event tracker backend that sends events to another backend from a
+    background thread, in batches.
+
+    """
+
+    def __init__(self, backend, name='', max_queue_size=10000, batch_size=100, flush_interval=1.0, **kwargs):
+        """
+        Send events to `backend` asynchronously.
+
+        :Parameters:
+
+          - `backend`: the backend to send events to
+          - `name`: name of the backend, with which metrics are tagged
+          - `max_queue_size`: number of events that can wait to be sent,
+            beyond which events are dropped
+          - `batch_size`: maximum number of events sent at once
+          - `flush_interval`: maximum number of seconds for which an
+            event waits for more events to send with it
+
+        """
+        super(AsyncBackend, self).__init__(**kwargs)
+
+        self.backend = backend
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.stats_lock = threading.Lock()
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._start_lock = threading.Lock()
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self):
+        """Empty the queue, and forget about the background thread."""
+        self.queue = Queue(maxsize=self.max_queue_size)
+        self._thread = None
+        self._pid = os.getpid()
+
+    def send(self, event):
+        """Queue the event, or drop it if the queue is full."""
+        self._ensure_thread()
+        try:
+            # Copy the event, as it is shared with other backends.
+            self.queue.put_nowait(dict(event))
+        except Full:
+            self._count('dropped', 1)
+
+    def _ensure_thread(self):
+        """Start the background thread, if it isn't running in this process."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                # The queue and thread were inherited from the process that forked this one.
+                self._reset()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='track-async-{}'.format(self.name))
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self):
+        """Send the queued events, in batches, forever."""
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except Empty:
+                    break
+            self._send_batch(batch)
+
+    def _send_batch(self, batch):
+        """Send a batch of events to the wrapped backend."""
+        tags = ['backend:{}'.format(self.name)]
+        dog_stats_api.histogram('track.async.batch_size', len(batch), tags=tags)
+        dog_stats_api.histogram('track.async.queue_size', self.queue.qsize(), tags=tags)
+        try:
+            with dog_stats_api.timer('track.async.send_batch', tags=tags):
+                self.backend.send_many(batch)
+        except Exception:  # pylint: disable=broad-except
+            # Nobody is waiting for these events, so log the error and carry on.
+            log.exception('Error sending events to the %s event tracker backend', self.name)
+            self._count('failed', len(batch))
+        else:
+            self._count('sent', len(batch))
+
+    def _count(self, counter, num_events):
+        """Add `num_events` to one of the sent, dropped and failed counters."""
+        with self.stats_lock:
+            setattr(self, counter, getattr(self, counter) + num_events)
+        if counter != 'sent':
+            dog_stats_api.increment('track.async.{}'.format(counter), num_events, tags=['backend:{}'.format(self.name)])
+
+    def flush(self):
+        """Send the queued events, from the calling thread."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+            if not batch:
+                return
+            self._send_batch(batch)
+
+    def stats(self):
+        """
+        Return a dict of the number of events that are queued, and that
+        were sent, dropped because the queue was full, and lost because the
+        wrapped backend failed to send them.
+
+        """
+        with self.stats_lock:
+            return {
+                'queued': self.queue.qsize(),
+                'sent': self.sent,
+                'dropped': self.dropped,
+                'failed': self.failed,
+            }
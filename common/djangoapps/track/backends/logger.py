@@ -34,6 +34,27 @@ class LoggerBackend(BaseBackend):
         self.event_logger = logging.getLogger(name)
 
     def send(self, event):
+        self.event_logger.info(self._serialize(event))
+
+    def send_many(self, events):
+        """
+        Serialize the events, then log them one after the other.
+
+        Each event is still logged as its own record, since the tracking
+        logs are usually shipped through syslog, one event per message.
+        """
+        event_strs = []
+        for event in events:
+            try:
+                event_strs.append(self._serialize(event))
+            except UnicodeDecodeError:
+                # The error has been logged, and shouldn't prevent logging the other events.
+                pass
+        for event_str in event_strs:
+            self.event_logger.info(event_str)
+
+    def _serialize(self, event):
+        """Return the event as a JSON string, truncated to TRACK_MAX_EVENT."""
         try:
             event_str = json.dumps(event, cls=DateTimeJSONEncoder)
         except UnicodeDecodeError:
@@ -45,6 +66,4 @@ class LoggerBackend(BaseBackend):
         # TODO: remove trucation of the serialized event, either at a
         # higher level during the emittion of the event, or by
         # providing warnings when the events exceed certain size.
-        event_str = event_str[:settings.TRACK_MAX_EVENT]
-
-        self.event_logger.info(event_str)
+        return event_str[:settings.TRACK_MAX_EVENT]
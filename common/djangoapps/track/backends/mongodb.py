@@ -97,3 +97,16 @@ class MongoBackend(BaseBackend):
             # during the next event.
             msg = 'Error inserting to MongoDB event tracker backend'
             log.exception(msg)
+
+    def send_many(self, events):
+        """Insert the events in to the Mongo collection, with a single request"""
+        try:
+            # insert_many adds an _id to the documents, which are shared with other backends.
+            self.collection.insert_many([dict(event) for event in events], ordered=False)
+        except BSONError:
+            # One of the events can't be encoded, so insert them one at a time to keep the others.
+            for event in events:
+                self.send(event)
+        except PyMongoError:
+            msg = 'Error inserting to MongoDB event tracker backend'
+            log.exception(msg)
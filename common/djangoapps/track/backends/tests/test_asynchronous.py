@@ -0,0 +1,89 @@
+"""Tests for the asynchronous event tracker backend."""
+from __future__ import absolute_import
+
+import threading
+
+from django.test import TestCase
+from mock import Mock, patch
+
+from track.backends import BaseBackend
+from track.backends.asynchronous import AsyncBackend
+
+
+class RecordingBackend(BaseBackend):
+    """Backend that records the batches of events sent to it."""
+    def __init__(self, **kwargs):
+        super(RecordingBackend, self).__init__(**kwargs)
+        self.batches = []
+        self.sent = threading.Event()
+
+    def send(self, event):
+        self.send_many([event])
+
+    def send_many(self, events):
+        self.batches.append(list(events))
+        self.sent.set()
+
+
+class FailingBackend(BaseBackend):
+    """Backend that fails to send events."""
+    def send(self, event):
+        raise Exception("Can't send events")
+
+
+class TestAsyncBackend(TestCase):
+    def setUp(self):
+        super(TestAsyncBackend, self).setUp()
+        self.wrapped = RecordingBackend()
+
+    def test_send_in_background(self):
+        backend = AsyncBackend(self.wrapped, name='test', flush_interval=0)
+
+        backend.send({'test': 1})
+
+        self.assertTrue(self.wrapped.sent.wait(5))
+        self.assertEqual(self.wrapped.batches, [[{'test': 1}]])
+        self.assertEqual(backend.stats(), {'queued': 0, 'sent': 1, 'dropped': 0, 'failed': 0})
+
+    def test_events_are_copied(self):
+        backend = AsyncBackend(self.wrapped, name='test')
+        event = {'test': 1}
+
+        backend.send(event)
+        event['test'] = 2
+        backend.flush()
+
+        self.assertEqual(self.wrapped.batches, [[{'test': 1}]])
+
+    def test_flush_in_batches(self):
+        backend = AsyncBackend(self.wrapped, name='test', batch_size=2)
+        for index in xrange(5):
+            backend.queue.put({'test': index})
+
+        backend.flush()
+
+        self.assertEqual(
+            self.wrapped.batches,
+            [[{'test': 0}, {'test': 1}], [{'test': 2}, {'test': 3}], [{'test': 4}]]
+        )
+        self.assertEqual(backend.stats()['queued'], 0)
+
+    @patch.object(AsyncBackend, '_ensure_thread', Mock())
+    def test_drop_events_when_queue_is_full(self):
+        backend = AsyncBackend(self.wrapped, name='test', max_queue_size=2)
+
+        for index in xrange(5):
+            backend.send({'test': index})
+
+        self.assertEqual(backend.stats(), {'queued': 2, 'sent': 0, 'dropped': 3, 'failed': 0})
+        backend.flush()
+        self.assertEqual(self.wrapped.batches, [[{'test': 0}, {'test': 1}]])
+
+    def test_count_failed_events(self):
+        backend = AsyncBackend(FailingBackend(), name='test')
+        backend.queue.put({'test': 1})
+        backend.queue.put({'test': 2})
+
+        backend.flush()
+
+        self.assertEqual(backend.stats(), {'queued': 0, 'sent': 0, 'dropped': 0, 'failed': 2})
@@ -37,3 +37,13 @@ class TestMongoBackend(TestCase):
 
         self.assertEqual(events[0], first_argument(calls[0]))
         self.assertEqual(events[1], first_argument(calls[1]))
+
+    def test_mongo_backend_send_many(self):
+        events = [{'test': 1}, {'test': 2}]
+
+        self.backend.send_many(events)
+
+        self.backend.collection.insert_many.assert_called_once_with(events, ordered=False)
+        # The events are copied, so that mongo doesn't add an _id to them.
+        inserted_events = self.backend.collection.insert_many.call_args[0][0]
+        self.assertIsNot(inserted_events[0], events[0])
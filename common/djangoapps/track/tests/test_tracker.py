@@ -4,6 +4,7 @@ from django.test.utils import override_settings
 
 import track.tracker as tracker
 from track.backends import BaseBackend
+from track.backends.asynchronous import AsyncBackend
 
 
 SIMPLE_SETTINGS = {
@@ -24,6 +25,15 @@ MULTI_SETTINGS = {
     }
 }
 
+ASYNC_SETTINGS = {
+    'default': {
+        'ENGINE': 'track.tests.test_tracker.DummyBackend',
+        'ASYNC': {
+            'batch_size': 10,
+        }
+    }
+}
+
 
 class TestTrackerInstantiation(TestCase):
     """Test that a helper function can instantiate backends from their name."""
@@ -88,6 +98,21 @@ class TestTrackerDjangoInstantiation(TestCase):
         self.assertEqual(backends[0].count, event_count)
         self.assertEqual(backends[1].count, event_count)
 
+    @override_settings(TRACKING_BACKENDS=ASYNC_SETTINGS.copy())
+    def test_django_async_settings(self):
+        """Test configuration of an asynchronous backend"""
+
+        backends = self._reload_backends()
+
+        backend = backends['default']
+        self.assertIsInstance(backend, AsyncBackend)
+        self.assertIsInstance(backend.backend, DummyBackend)
+        self.assertEqual(backend.batch_size, 10)
+
+        backend.queue.put({})
+        backend.flush()
+        self.assertEqual(backend.backend.count, 1)
+
     @override_settings(TRACKING_BACKENDS=MULTI_SETTINGS.copy())
     def test_django_remove_settings(self):
         """Test if a backend can be remove by setting it to None."""
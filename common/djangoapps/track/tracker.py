@@ -16,6 +16,23 @@ below::
       }
   }
 
+A backend can be made asynchronous, so that its events are sent in
+batches from a background thread rather than during the request, by
+adding an 'ASYNC' entry to its configuration::
+
+  'tracker_name': {
+      'ENGINE': ...,
+      'OPTIONS': {...},
+      'ASYNC': {
+          'max_queue_size': 10000,
+          'batch_size': 100,
+          'flush_interval': 1.0,
+      }
+  }
+
+'ASYNC' can also be set to True, to use the default options of
+track.backends.asynchronous.AsyncBackend.
+
 """
 
 import inspect
@@ -26,6 +43,7 @@ from dogapi import dog_stats_api
 from django.conf import settings
 
 from track.backends import BaseBackend
+from track.backends.asynchronous import AsyncBackend
 
 
 __all__ = ['send']
@@ -49,7 +67,13 @@ def _initialize_backends_from_django_settings():
         if values:
             engine = values['ENGINE']
             options = values.get('OPTIONS', {})
-            backends[name] = _instantiate_backend_from_name(engine, options)
+            backend = _instantiate_backend_from_name(engine, options)
+            async_options = values.get('ASYNC')
+            if async_options:
+                if not isinstance(async_options, dict):
+                    async_options = {}
+                backend = AsyncBackend(backend, name=name, **async_options)
+            backends[name] = backend
 
 
 def _instantiate_backend_from_name(name, options):
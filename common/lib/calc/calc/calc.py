@@ -2,11 +2,18 @@
 Parser and evaluator for FormulaResponse and NumericalResponse
 
 Uses pyparsing to parse. Main function as of now is evaluator().
+
+To evaluate the same expression many times, e.g. with many samples of its
+variables, use compile_expression(), which parses the expression once and can
+evaluate it for all the samples at once.
 """
 
 import math
 import operator
 import numbers
+import threading
+from collections import OrderedDict
+
 import numpy
 import scipy.constants
 import functions
@@ -73,6 +80,15 @@ SUFFIXES = {
 }
 
 
+# Functions that accept numpy arrays, and so can be evaluated for many samples at once.
+VECTORIZED_FUNCTIONS = frozenset(
+    function for function in DEFAULT_FUNCTIONS.values() if function is not math.factorial
+)
+
+# Maximum number of parsed expressions kept by parse_expression().
+PARSE_CACHE_SIZE = 1000
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -200,6 +216,66 @@ def eval_product(parse_result):
     return prod
 
 
+# The following evaluation actions are the ones used to evaluate expressions
+# for many samples at once, when numbers may be numpy arrays of the values of
+# each sample, and so can't be told from strings by being numbers.
+
+def eval_atom_many(parse_result):
+    """
+    Return the value wrapped by the atom, which may be an array.
+    """
+    return next(k for k in parse_result if not isinstance(k, basestring))
+
+
+def eval_power_many(parse_result):
+    """
+    Exponentiate a list of numbers or arrays, right to left.
+    """
+    parse_result = reversed([k for k in parse_result if not isinstance(k, basestring)])
+    return reduce(lambda a, b: b ** a, parse_result)
+
+
+def eval_parallel_many(parse_result):
+    """
+    Compute numbers or arrays according to the parallel resistors operator.
+
+    The result is NaN for each sample in which one of the inputs is zero.
+    """
+    if len(parse_result) == 1:
+        return parse_result[0]
+    values = [k for k in parse_result if not isinstance(k, basestring)]
+    has_zero = reduce(numpy.logical_or, [numpy.equal(value, 0) for value in values])
+    return numpy.where(has_zero, float('nan'), 1. / sum(1. / value for value in values))
+
+
+def eval_sum_many(parse_result):
+    """
+    Add the inputs, which may be arrays, keeping in mind their sign.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if isinstance(token, basestring):
+            current_op = operator.sub if token == '-' else operator.add
+        else:
+            total = current_op(total, token)
+    return total
+
+
+def eval_product_many(parse_result):
+    """
+    Multiply the inputs, which may be arrays.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if isinstance(token, basestring):
+            current_op = operator.truediv if token == '/' else operator.mul
+        else:
+            prod = current_op(prod, token)
+    return prod
+
+
 def add_defaults(variables, functions, case_sensitive):
     """
     Create dictionaries with both the default and user-defined variables.
@@ -224,38 +300,165 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
     """
-    # No need to go further.
-    if math_expr.strip() == "":
-        return float('nan')
+    return compile_expression(math_expr, case_sensitive).evaluate(variables, functions)
+
+
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return a CompiledExpression for the given string of math.
+
+    Raises the same parsing errors as evaluator().
+    """
+    return CompiledExpression(math_expr, case_sensitive)
+
+
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def parse_expression(math_expr, case_sensitive=False):
+    """
+    Return a ParseAugmenter that has parsed the given string of math.
+
+    The most recently used PARSE_CACHE_SIZE ParseAugmenters are kept, so
+    that expressions which are evaluated again, e.g. the instructor's answer
+    to a problem, aren't parsed again.  They must not be modified.
+    """
+    key = (math_expr, case_sensitive)
+    with _parse_cache_lock:
+        math_interpreter = _parse_cache.pop(key, None)
+        if math_interpreter is not None:
+            _parse_cache[key] = math_interpreter
+            return math_interpreter
 
-    # Parse the tree.
     math_interpreter = ParseAugmenter(math_expr, case_sensitive)
     math_interpreter.parse_algebra()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+    with _parse_cache_lock:
+        _parse_cache[key] = math_interpreter
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return math_interpreter
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
-
-    return math_interpreter.reduce_tree(evaluate_actions)
+class CompiledExpression(object):
+    """
+    A string of math, parsed once, that can be evaluated with different variables.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        if math_expr.strip() == "":
+            self.math_interpreter = None
+        else:
+            self.math_interpreter = parse_expression(math_expr, case_sensitive)
+
+    def casify(self, name):
+        """
+        Return the name under which a variable or function is looked up.
+        """
+        return name if self.case_sensitive else name.lower()
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression with the given variables and functions, as
+        evaluator() does.
+        """
+        # No need to go further.
+        if self.math_interpreter is None:
+            return float('nan')
+
+        # Get our variables together...
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+
+        # ...and check them
+        self.math_interpreter.check_variables(all_variables, all_functions)
+
+        # Create a recursion to evaluate the tree.
+        casify = self.casify
+        evaluate_actions = {
+            'number': eval_number,
+            'variable': lambda x: all_variables[casify(x[0])],
+            'function': lambda x: all_functions[casify(x[0])](x[1]),
+            'atom': eval_atom,
+            'power': eval_power,
+            'parallel': eval_parallel,
+            'product': eval_product,
+            'sum': eval_sum
+        }
+
+        return self.math_interpreter.reduce_tree(evaluate_actions)
+
+    def evaluate_many(self, variables_list, functions):
+        """
+        Evaluate the expression for each dictionary of variables in
+        `variables_list`, and return the list of results.
+
+        When possible, the expression is evaluated once, with numpy arrays of
+        the values of each variable.  If that isn't possible, or any of the
+        results isn't finite, the expression is evaluated for each dictionary
+        of variables in turn, so that the results, and errors, are the same as
+        evaluate()'s.
+        """
+        results = None
+        if self.math_interpreter is not None and len(variables_list) > 1:
+            results = self._evaluate_vectorized(variables_list, functions)
+        if results is None:
+            results = [self.evaluate(variables, functions) for variables in variables_list]
+        return results
+
+    def _evaluate_vectorized(self, variables_list, functions):
+        """
+        Return the list of results of evaluating the expression once, with
+        numpy arrays of the values of each variable, or None if that isn't
+        possible.
+        """
+        names = set(variables_list[0])
+        if any(set(variables) != names for variables in variables_list):
+            return None
+        arrays = {}
+        for name in names:
+            array = numpy.array([variables[name] for variables in variables_list])
+            # Integers aren't vectorized, as numpy's integer arithmetic differs from Python's.
+            if array.dtype.kind not in 'fc':
+                return None
+            arrays[name] = array
+
+        all_variables, all_functions = add_defaults(arrays, functions, self.case_sensitive)
+        try:
+            self.math_interpreter.check_variables(all_variables, all_functions)
+        except UndefinedVariable:
+            return None
+        casify = self.casify
+        if any(all_functions[casify(name)] not in VECTORIZED_FUNCTIONS
+               for name in self.math_interpreter.functions_used):
+            return None
+
+        evaluate_actions = {
+            'number': eval_number,
+            'variable': lambda x: all_variables[casify(x[0])],
+            'function': lambda x: all_functions[casify(x[0])](x[1]),
+            'atom': eval_atom_many,
+            'power': eval_power_many,
+            'parallel': eval_parallel_many,
+            'product': eval_product_many,
+            'sum': eval_sum_many
+        }
+        try:
+            with numpy.errstate(all='ignore'):
+                result = numpy.asarray(self.math_interpreter.reduce_tree(evaluate_actions))
+        except Exception:  # pylint: disable=broad-except
+            return None
+
+        if result.shape == ():
+            # The expression doesn't depend on the variables.
+            result = numpy.repeat(result, len(variables_list))
+        if result.shape != (len(variables_list),) or result.dtype.kind not in 'fc':
+            return None
+        if not numpy.all(numpy.isfinite(result)):
+            # Evaluating each sample raises the errors, e.g. division by zero, that numpy ignored.
+            return None
+        return result.tolist()
 
 
 class ParseAugmenter(object):
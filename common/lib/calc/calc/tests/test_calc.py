@@ -5,6 +5,7 @@ Unit tests for calc.py
 import unittest
 import numpy
 import calc
+from mock import patch
 from pyparsing import ParseException
 
 # numpy's default behavior when it evaluates a function outside its domain
@@ -559,3 +560,71 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Run tests for calc.compile_expression, and evaluating an expression for
+    many samples at once.
+    """
+    samples = [{'x': 0.5, 'y': 2.0}, {'x': 1.5, 'y': -3.0}, {'x': -2.25, 'y': 7.0}]
+
+    def assert_same_as_evaluator(self, math_expr, samples=None, functions=None, case_sensitive=False):
+        """
+        Check that evaluating `math_expr` for all the samples gives the same
+        results as evaluating it for each sample.
+        """
+        samples = samples or self.samples
+        functions = functions or {}
+        results = calc.compile_expression(math_expr, case_sensitive).evaluate_many(samples, functions)
+        self.assertEqual(len(results), len(samples))
+        for result, variables in zip(results, samples):
+            expected = calc.evaluator(variables, functions, math_expr, case_sensitive)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(result))
+            else:
+                self.assertAlmostEqual(result, expected, delta=1e-12 * max(1, abs(expected)))
+
+    def test_evaluate(self):
+        expression = calc.compile_expression('x^2 + 3*x')
+        self.assertEqual(expression.evaluate({'x': 2.0}, {}), 10.0)
+        self.assertEqual(expression.evaluate({'x': 1.0}, {}), 4.0)
+
+    def test_evaluate_many(self):
+        for math_expr in ['x^2 + 3*x', '-x/y + 2^x^2', 'sin(x)*cos(y) + sqrt(y^2)', 'x || y', 'e^(i*x)',
+                          '5k + x', 'arcsec(y) + coth(x)', 'X*Y', '(x)', '2']:
+            self.assert_same_as_evaluator(math_expr)
+
+    def test_evaluate_many_falls_back(self):
+        # Errors are raised as they are for a single sample.
+        with self.assertRaises(ZeroDivisionError):
+            calc.compile_expression('1/(x-1.5)').evaluate_many(self.samples, {})
+        with self.assertRaises(ValueError):
+            calc.compile_expression('fact(x)').evaluate_many(self.samples, {})
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'z'):
+            calc.compile_expression('x+z').evaluate_many(self.samples, {})
+
+        # Results that aren't finite, custom functions and integers are evaluated per sample.
+        self.assert_same_as_evaluator('x || (y-2)')
+        self.assert_same_as_evaluator('f(x)', functions={'f': lambda x: 1 if x > 0 else 0})
+        self.assert_same_as_evaluator('x^(-y)', samples=[{'x': 2, 'y': 1}, {'x': 3, 'y': 2}])
+        self.assert_same_as_evaluator('x', samples=[{'x': 1.0}, {'x': 2.0, 'y': 1.0}])
+
+    def test_case_sensitive(self):
+        samples = [{'x': 1.0, 'X': 2.0}, {'x': 3.0, 'X': 5.0}]
+        self.assertEqual(calc.compile_expression('x+2*X', True).evaluate_many(samples, {}), [5.0, 13.0])
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'Y'):
+            calc.compile_expression('Y', True).evaluate_many(samples, {})
+
+    def test_empty(self):
+        results = calc.compile_expression(' ').evaluate_many(self.samples, {})
+        self.assertTrue(all(numpy.isnan(result) for result in results))
+
+    def test_parse_cache(self):
+        first = calc.parse_expression('x + 1')
+        self.assertIs(calc.parse_expression('x + 1'), first)
+        self.assertIsNot(calc.parse_expression('x + 1', case_sensitive=True), first)
+
+        with patch.object(calc.calc, 'PARSE_CACHE_SIZE', 1):
+            calc.parse_expression('x + 2')
+            self.assertIsNot(calc.parse_expression('x + 1'), first)
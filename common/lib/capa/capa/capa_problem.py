@@ -30,7 +30,7 @@ import capa.customrender as customrender
 import capa.responsetypes as responsetypes
 from capa.util import contextualize_text, convert_files_to_filenames
 import capa.xqueue_interface as xqueue_interface
-from capa.safe_exec import safe_exec
+from capa.safe_exec import safe_exec, SafeExecCache
 from openedx.core.djangolib.markup import HTML
 from xmodule.stringify import stringify_children
 
@@ -111,6 +111,8 @@ class LoncapaSystem(object):
         self.ajax_url = ajax_url
         self.anonymous_student_id = anonymous_student_id
         self.cache = cache
+        # The cache of the safe_exec results of this problem's code.
+        self.safe_exec_cache = SafeExecCache(cache) if cache is not None else None
         self.can_execute_unsafe_code = can_execute_unsafe_code
         self.get_python_lib_zip = get_python_lib_zip
         self.DEBUG = DEBUG                              # pylint: disable=invalid-name
@@ -743,7 +745,7 @@ class LoncapaProblem(object):
                     random_seed=self.seed,
                     python_path=python_path,
                     extra_files=extra_files,
-                    cache=self.capa_system.cache,
+                    cache=self.capa_system.safe_exec_cache,
                     slug=self.problem_id,
                     unsafely=self.capa_system.can_execute_unsafe_code(),
                 )
@@ -0,0 +1,173 @@
+"""
+A warm, sandboxed Python process for capa's safe_exec worker pool.
+
+This file isn't imported: its source is run by the sandboxed Python, see
+worker_pool.py.  It preloads the modules that capa problems use, then reads
+one JSON request per line from stdin, and writes one JSON response per line
+to stdout.
+
+Each request is executed in a forked child, so that the code never sees the
+globals or modules of a previous execution, while sharing the modules
+preloaded here.  The child reseeds the random number generators it inherits,
+runs with the same resource limits that codejail applies to jailed code, and
+is killed if it runs for too long.
+"""
+
+import json
+import os
+import resource
+import select
+import shutil
+import signal
+import sys
+import time
+import traceback
+
+# The modules to preload, see ASSUMED_IMPORTS in safe_exec.py.
+PRELOADED_MODULES = [
+    "numpy", "math", "scipy", "calc", "eia", "chem.chemcalc", "chem.chemtools", "chem.miller",
+    "verifiers.draganddrop",
+]
+
+# Globals that are never sent back, as in codejail.
+BAD_GLOBALS = ("__builtins__",)
+
+
+def preload_modules():
+    """Import the modules that capa problems use, so that children don't have to."""
+    for module_name in PRELOADED_MODULES:
+        try:
+            __import__(module_name)
+        except Exception:  # pylint: disable=broad-except
+            # The code will import it lazily, and report any error then.
+            pass
+
+
+def reseed_random_modules():
+    """
+    Reseed the random number generators of the modules loaded in the parent,
+    which every forked child would otherwise share, from fresh entropy, as
+    a new sandboxed Python would be.
+    """
+    if "random" in sys.modules:
+        sys.modules["random"].seed()
+    if "numpy" in sys.modules:
+        sys.modules["numpy"].random.seed()
+
+
+def set_limits(limits):
+    """Apply codejail's resource limits to the current process."""
+    # No subprocesses.
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    cpu = limits.get("CPU")
+    if cpu:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    vmem = limits.get("VMEM")
+    if vmem:
+        resource.setrlimit(resource.RLIMIT_AS, (vmem, vmem))
+    fsize = limits.get("FSIZE")
+    if fsize is not None:
+        resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+
+
+def jsonable(value):
+    """Returns whether `value` can be sent back as JSON."""
+    try:
+        json.dumps(value)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def run_child(request, result_fd):
+    """Execute the requested code, and write its response to `result_fd`."""
+    reseed_random_modules()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    os.chdir(request["cwd"])
+    tmp_dir = os.path.join(request["cwd"], "tmp")
+    os.environ["TMPDIR"] = tmp_dir
+    if "tempfile" in sys.modules:
+        sys.modules["tempfile"].tempdir = tmp_dir
+    sys.path.extend(request["python_path"])
+    set_limits(request["limits"])
+
+    g_dict = request["globals"]
+    try:
+        exec compile(request["code"], "jailed_code", "exec") in g_dict  # pylint: disable=exec-used
+    except BaseException:  # pylint: disable=broad-except
+        response = {"error": traceback.format_exc()}
+    else:
+        response = {
+            "globals": {
+                name: value for name, value in g_dict.iteritems()
+                if name not in BAD_GLOBALS and jsonable(value)
+            }
+        }
+
+    data = json.dumps(response)
+    while data:
+        data = data[os.write(result_fd, data):]
+    os._exit(0)  # pylint: disable=protected-access
+
+
+def execute(request):
+    """Execute a request in a forked child, and return its response."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            run_child(request, write_fd)
+        finally:
+            os._exit(1)  # pylint: disable=protected-access
+    os.close(write_fd)
+
+    chunks = []
+    timed_out = False
+    realtime = request["limits"].get("REALTIME")
+    deadline = time.time() + realtime if realtime else None
+    while True:
+        remaining = None
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                timed_out = True
+                os.kill(pid, signal.SIGKILL)
+                break
+        readable, __, __ = select.select([read_fd], [], [], remaining)
+        if readable:
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    os.close(read_fd)
+    __, status = os.waitpid(pid, 0)
+    shutil.rmtree(os.path.join(request["cwd"], "tmp"), ignore_errors=True)
+
+    if timed_out:
+        return {"error": "Jailed code timed out", "failed": True}
+    if status != 0 or not chunks:
+        return {"error": "Jailed code exited with status {}".format(status), "failed": True}
+    return json.loads("".join(chunks))
+
+
+def main():
+    """Serve requests until stdin is closed."""
+    preload_modules()
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        try:
+            response = execute(json.loads(line))
+        except Exception:  # pylint: disable=broad-except
+            response = {"error": traceback.format_exc(), "failed": True}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@
 from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
-from . import lazymod
+from . import lazymod, worker_pool
 from dogapi import dog_stats_api
+from openedx.core.lib.cache_utils import LRUCache
 
+import cPickle as pickle
 import hashlib
 
 # Establish the Python environment for Capa.
@@ -70,6 +72,75 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+class SafeExecCache(object):
+    """
+    A cache of safe_exec results, in front of a shared cache such as memcached.
+
+    Results are also kept in a per-process LRU cache, bounded by the total
+    size of the pickled results, so that the many executions of the same code
+    with the same globals and random seed, e.g. for all the learners in the
+    same random seed bucket, only reach the shared cache once per process.
+
+    The digest of each piece of code is computed once per SafeExecCache, and
+    a SafeExecCache is created for each problem, see LoncapaSystem.
+    """
+    # Shared by all instances; the LMS sets its max_size, see lms/startup.py.
+    process_cache = LRUCache(max_size=0)
+
+    def __init__(self, shared_cache):
+        self.shared_cache = shared_cache
+        self._code_hashers = {}
+
+    def make_key(self, code, safe_globals, random_seed):
+        """
+        Returns the key of the result of executing `code` with the given
+        JSON-safe globals and random seed.
+        """
+        code_hasher = self._code_hashers.get(code)
+        if code_hasher is None:
+            code_hasher = self._code_hashers[code] = hashlib.md5()
+            code_hasher.update(repr(code))
+        md5er = code_hasher.copy()
+        update_hash(md5er, safe_globals)
+        return "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+
+    def get(self, key):
+        """
+        Returns the cached result for `key`, or None.
+        """
+        pickled_result = self.process_cache.get(key)
+        if pickled_result is not None:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=['result:process_hit'])
+            return pickle.loads(pickled_result)
+
+        result = self.shared_cache.get(key) if self.shared_cache is not None else None
+        if result is not None:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=['result:shared_hit'])
+            self._set_in_process_cache(key, result)
+        else:
+            dog_stats_api.increment('capa.safe_exec.cache', tags=['result:miss'])
+        return result
+
+    def set(self, key, result):
+        """
+        Caches the result for `key`.
+        """
+        self._set_in_process_cache(key, result)
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, result)
+
+    def _set_in_process_cache(self, key, result):
+        """
+        Caches a pickled copy of the result in the process, so that callers
+        can't modify the cached result.
+        """
+        if not self.process_cache.max_size:
+            return
+        pickled_result = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        self.process_cache.set(key, pickled_result, size=len(pickled_result))
+        dog_stats_api.gauge('capa.safe_exec.cache.process_size', self.process_cache.size)
+
+
 @dog_stats_api.timed('capa.safe_exec.time')
 def safe_exec(
     code,
@@ -97,23 +168,25 @@ def safe_exec(
     `extra_files` is a list of (filename, contents) pairs.  These files are
     created in the sandbox.
 
-    `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
-    to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    `cache` is a SafeExecCache, or an object with .get(key) and .set(key, value)
+    methods that is used as the shared cache of a new SafeExecCache.  It will be
+    used to cache the execution, taking into account the code, the values of the
+    globals, and the random seed.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
 
     If `unsafely` is true, then the code will actually be executed without sandboxing.
+    Otherwise, it is executed by a warm worker if a worker pool is configured,
+    see worker_pool.py.
 
     """
     # Check the cache for a previous result.
     if cache:
+        if not isinstance(cache, SafeExecCache):
+            cache = SafeExecCache(cache)
         safe_globals = json_safe(globals_dict)
-        md5er = hashlib.md5()
-        md5er.update(repr(code))
-        update_hash(md5er, safe_globals)
-        key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
+        key = cache.make_key(code, safe_globals, random_seed)
         cached = cache.get(key)
         if cached is not None:
             # We have a cached result.  The result is a pair: the exception
@@ -128,8 +201,11 @@ def safe_exec(
     code_prolog = CODE_PROLOG % random_seed
 
     # Decide which code executor to use.
+    pool = worker_pool.get_pool()
     if unsafely:
         exec_fn = codejail_not_safe_exec
+    elif pool is not None:
+        exec_fn = pool.safe_exec
     else:
         exec_fn = codejail_safe_exec
 
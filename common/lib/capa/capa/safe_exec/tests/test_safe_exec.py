@@ -4,13 +4,16 @@ import hashlib
 import os
 import os.path
 import random
+import sys
 import textwrap
 import unittest
 
+from mock import patch
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, worker_pool, SafeExecCache
 from codejail.safe_exec import SafeExecException
+from openedx.core.lib.cache_utils import LRUCache
 from codejail.jail_code import is_configured
 
 
@@ -72,6 +75,82 @@ class TestSafeExec(unittest.TestCase):
         self.assertIn("ZeroDivisionError", cm.exception.message)
 
 
+class TestSafeExecWorkerPool(unittest.TestCase):
+    """Test executing code with a pool of workers, which aren't sandboxed here."""
+
+    def setUp(self):
+        super(TestSafeExecWorkerPool, self).setUp()
+        worker_pool.configure(1, max_executions=3, cmdline=[sys.executable, "-E", "-B"])
+        self.addCleanup(worker_pool.configure, 0)
+        self.pool = worker_pool.get_pool()
+
+    def test_set_values(self):
+        g = {'b': [1, 2]}
+        safe_exec("a = 17 + len(b)\nc = 1/2", g)
+        self.assertEqual(g, {'a': 19, 'b': [1, 2], 'c': 0.5})
+
+    def test_assumed_imports_and_seeding(self):
+        g = {}
+        safe_exec("a = int(math.pi)\nn = random.randint(0, 999)", g, random_seed=17)
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(g['n'], random.Random(17).randint(0, 999))
+
+    def test_numpy_random_is_reseeded(self):
+        # Executions are forked from the same worker, but don't share the
+        # state of its random number generators.
+        values = []
+        for __ in range(2):
+            g = {}
+            safe_exec("n = int(numpy.random.randint(0, 2 ** 30))", g)
+            values.append(g['n'])
+        self.assertNotEqual(values[0], values[1])
+
+    def test_python_lib(self):
+        pylib = os.path.dirname(__file__) + "/test_files/pylib"
+        g = {}
+        safe_exec("import constant; a = constant.THE_CONST", g, python_path=[pylib])
+        self.assertIn('a', g)
+
+    def test_raising_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", cm.exception.message)
+        # The worker is still used after the code raised an exception.
+        g = {}
+        safe_exec("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    def test_executions_are_isolated(self):
+        safe_exec("import json; json.leaked = 1; a = 1", {})
+        g = {}
+        safe_exec("import json; a = hasattr(json, 'leaked')", g)
+        self.assertEqual(g['a'], False)
+
+    def test_workers_are_replaced(self):
+        pids = []
+        for __ in range(4):
+            g = {}
+            safe_exec("import os; pid = os.getppid()", g)
+            pids.append(g['pid'])
+        self.assertEqual(len(set(pids[:3])), 1)
+        self.assertNotEqual(pids[2], pids[3])
+
+    def test_timeout(self):
+        with patch.dict(worker_pool.jail_code.LIMITS, {'REALTIME': 1, 'CPU': 0}):
+            with self.assertRaises(SafeExecException) as cm:
+                safe_exec("while True: pass", {})
+        self.assertIn("timed out", cm.exception.message)
+        g = {}
+        safe_exec("a = 1", g)
+        self.assertEqual(g['a'], 1)
+
+    def test_unsafely_bypasses_pool(self):
+        with patch.object(self.pool, 'safe_exec') as mock_safe_exec:
+            safe_exec("a = 1", {}, unsafely=True)
+            safe_exec("a = 1", {})
+        self.assertEqual(mock_safe_exec.call_count, 1)
+
+
 class TestSafeOrNot(unittest.TestCase):
     def test_cant_do_something_forbidden(self):
         # Can't test for forbiddenness if CodeJail isn't configured for python.
@@ -177,6 +256,59 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestSafeExecProcessCache(unittest.TestCase):
+    """Test the per-process cache of SafeExecCache."""
+
+    def setUp(self):
+        super(TestSafeExecProcessCache, self).setUp()
+        patcher = patch.object(SafeExecCache, 'process_cache', LRUCache(max_size=10000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key(self):
+        # The key is the same as when the code digest wasn't memoized.
+        md5er = hashlib.md5()
+        md5er.update(repr("a = b"))
+        update_hash(md5er, {'b': 1})
+        cache = SafeExecCache(None)
+        self.assertEqual(cache.make_key("a = b", {'b': 1}, 17), "safe_exec.17.%s" % md5er.hexdigest())
+        self.assertEqual(cache.make_key("a = b", {'b': 1}, 17), "safe_exec.17.%s" % md5er.hexdigest())
+        self.assertNotEqual(cache.make_key("a = b", {'b': 2}, 17), cache.make_key("a = b", {'b': 1}, 17))
+
+    def test_process_hit(self):
+        shared = {}
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=SafeExecCache(DictCache(shared)))
+        self.assertEqual(shared.values(), [(None, {'a': [3]})])
+
+        # The shared cache isn't read when the result is cached in the process.
+        shared[shared.keys()[0]] = (None, {'a': [17]})
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=SafeExecCache(DictCache(shared)))
+        self.assertEqual(g['a'], [3])
+
+        # Modifying the result doesn't modify the cached result.
+        g['a'].append(4)
+        g = {}
+        safe_exec("a = [int(math.pi)]", g, cache=SafeExecCache(DictCache(shared)))
+        self.assertEqual(g['a'], [3])
+
+    def test_shared_hit_is_cached_in_process(self):
+        shared = {}
+        cache = SafeExecCache(DictCache(shared))
+        key = cache.make_key("a = 1", {}, None)
+        shared[key] = (None, {'a': 2})
+        g = {}
+        safe_exec("a = 1", g, cache=cache)
+        self.assertEqual(g['a'], 2)
+        self.assertIn(key, SafeExecCache.process_cache)
+
+    def test_disabled(self):
+        SafeExecCache.process_cache.max_size = 0
+        safe_exec("a = 1", {}, cache=SafeExecCache(DictCache({})))
+        self.assertEqual(len(SafeExecCache.process_cache), 0)
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -0,0 +1,280 @@
+"""
+A pool of warm, sandboxed Python processes that execute code for safe_exec.
+
+Executing code with codejail starts a new sandboxed Python each time, which
+then has to import numpy, scipy and the other modules that capa problems use.
+Instead, the pool keeps sandboxed Pythons running pool_worker.py, which
+preloads those modules and executes each piece of code in a forked child,
+with codejail's limits applied.
+
+A worker is replaced after `max_executions` executions, and whenever an
+execution fails other than by the code raising an exception.
+"""
+
+import json
+import logging
+import os
+import os.path
+import select
+import shutil
+import subprocess
+import tempfile
+import time
+from Queue import Queue, Empty
+
+from codejail import jail_code
+from codejail.safe_exec import json_safe, SafeExecException
+from dogapi import dog_stats_api
+
+log = logging.getLogger(__name__)
+
+# The source of the workers, which is run rather than imported.
+pool_worker_py_file = os.path.join(os.path.dirname(__file__), "pool_worker.py")
+POOL_WORKER_PY = open(pool_worker_py_file).read()
+
+# Number of seconds to wait for a worker beyond the REALTIME limit, before replacing it.
+RESPONSE_TIMEOUT_MARGIN = 5
+
+DEFAULT_MAX_EXECUTIONS = 100
+
+
+class WorkerFailure(Exception):
+    """
+    A worker didn't respond properly, and needs to be replaced.
+    """
+    pass
+
+
+def sandbox_cmdline():
+    """
+    Returns the command line that codejail uses to run the sandboxed Python.
+    """
+    command = jail_code.COMMANDS["python"]
+    cmdline = []
+    if command.get("user"):
+        cmdline.extend(["sudo", "-u", command["user"]])
+    cmdline.extend(command["cmdline_start"])
+    return cmdline
+
+
+class SafeExecWorker(object):
+    """
+    A sandboxed Python process, running pool_worker.py.
+    """
+    def __init__(self, cmdline):
+        self.executions = 0
+        self._buffer = ""
+        with open(os.devnull, "w") as devnull:
+            self.process = subprocess.Popen(
+                cmdline + ["-c", POOL_WORKER_PY],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=devnull,
+                cwd=tempfile.gettempdir(),
+                env={},
+                close_fds=True,
+            )
+
+    def execute(self, request, timeout=None):
+        """
+        Sends a request to the worker, and returns its response.
+
+        Raises WorkerFailure if the worker doesn't respond within `timeout`
+        seconds, or exits.
+        """
+        self.executions += 1
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except (IOError, OSError) as exc:
+            raise WorkerFailure("Couldn't send the code to the worker: {}".format(exc))
+        line = self._read_line(timeout)
+        try:
+            return json.loads(line)
+        except ValueError:
+            raise WorkerFailure("The worker sent an invalid response: {!r}".format(line[:100]))
+
+    def _read_line(self, timeout):
+        """
+        Returns the next line written by the worker.
+        """
+        deadline = time.time() + timeout if timeout else None
+        stdout_fd = self.process.stdout.fileno()
+        while "\n" not in self._buffer:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise WorkerFailure("The worker timed out")
+            readable, __, __ = select.select([stdout_fd], [], [], remaining)
+            if readable:
+                chunk = os.read(stdout_fd, 65536)
+                if not chunk:
+                    raise WorkerFailure("The worker exited with status {}".format(self.process.wait()))
+                self._buffer += chunk
+        line, self._buffer = self._buffer.split("\n", 1)
+        return line
+
+    def close(self):
+        """
+        Stops the worker.
+        """
+        try:
+            self.process.stdin.close()
+        except (IOError, OSError):
+            pass
+        if self.process.poll() is None:
+            # SIGKILL wouldn't be relayed to the sandboxed Python by sudo.
+            self.process.terminate()
+        self.process.wait()
+
+
+class SafeExecWorkerPool(object):
+    """
+    Executes code in up to `size` workers, started as they are first needed.
+
+    `cmdline` is the command line that runs Python, by default the sandboxed
+    Python that codejail is configured with.
+    """
+    def __init__(self, size, max_executions=DEFAULT_MAX_EXECUTIONS, cmdline=None):
+        self.size = size
+        self.max_executions = max_executions
+        self.cmdline = cmdline
+        self._reset()
+
+    def _reset(self):
+        """
+        Empties the pool.  Each None in the queue is a worker yet to be started.
+        """
+        self._pid = os.getpid()
+        self._workers = Queue()
+        for __ in xrange(self.size):
+            self._workers.put(None)
+
+    def is_enabled(self):
+        """
+        Returns whether the pool can execute code.
+        """
+        return bool(self.size) and (self.cmdline is not None or jail_code.is_configured("python"))
+
+    def safe_exec(self, code, globals_dict, python_path=None, extra_files=None, slug=None):
+        """
+        Executes code as codejail.safe_exec.safe_exec does, in a worker.
+        """
+        if self._pid != os.getpid():
+            # The pool was inherited from the process that forked this one, so its workers aren't ours.
+            self._reset()
+
+        limits = dict(jail_code.LIMITS)
+        home_dir = self._make_home_dir(python_path or (), extra_files or ())
+        request = {
+            "code": code,
+            "globals": json_safe(globals_dict),
+            "cwd": home_dir,
+            "python_path": [os.path.basename(path) for path in python_path or ()],
+            "limits": limits,
+        }
+        timeout = limits["REALTIME"] + RESPONSE_TIMEOUT_MARGIN if limits.get("REALTIME") else None
+
+        worker = self._workers.get()
+        try:
+            worker, response = self._execute_in_worker(worker, request, timeout, slug)
+        finally:
+            self._workers.put(worker)
+            shutil.rmtree(home_dir, ignore_errors=True)
+
+        if "error" in response:
+            raise SafeExecException(u"Couldn't execute jailed code: {}".format(response["error"]))
+        globals_dict.update(response["globals"])
+
+    def _execute_in_worker(self, worker, request, timeout, slug):
+        """
+        Executes a request in `worker`, or in a new worker if it is None.
+
+        Returns the worker to put back in the pool, which is None if it was
+        stopped, and the response.
+        """
+        if worker is None:
+            worker = SafeExecWorker(self.cmdline or sandbox_cmdline())
+            dog_stats_api.increment("capa.safe_exec.worker_pool.started")
+
+        start_time = time.time()
+        try:
+            response = worker.execute(request, timeout)
+        except WorkerFailure as exc:
+            log.warning("Replacing the safe_exec worker after a failure executing %s: %s", slug, exc)
+            response = {"error": unicode(exc), "failed": True}
+        dog_stats_api.histogram("capa.safe_exec.worker_pool.execution_time", time.time() - start_time)
+
+        if response.get("failed") or worker.executions >= self.max_executions:
+            dog_stats_api.increment(
+                "capa.safe_exec.worker_pool.replaced",
+                tags=["reason:{}".format("failure" if response.get("failed") else "max_executions")],
+            )
+            worker.close()
+            worker = None
+        return worker, response
+
+    def _make_home_dir(self, python_path, extra_files):
+        """
+        Returns a new directory for an execution, readable by the sandbox,
+        containing the Python path and extra files as codejail would.
+        """
+        home_dir = tempfile.mkdtemp(prefix="codejail-")
+        os.chmod(home_dir, 0755)
+        extra_names = set()
+        for name, content in extra_files:
+            extra_names.add(name)
+            with open(os.path.join(home_dir, name), "wb") as extra_file:
+                extra_file.write(content)
+        for path in python_path:
+            name = os.path.basename(path)
+            if name in extra_names:
+                continue
+            if os.path.isdir(path):
+                shutil.copytree(path, os.path.join(home_dir, name))
+            else:
+                shutil.copyfile(path, os.path.join(home_dir, name))
+        tmp_dir = os.path.join(home_dir, "tmp")
+        os.mkdir(tmp_dir)
+        os.chmod(tmp_dir, 0777)
+        return home_dir
+
+    def close(self):
+        """
+        Stops the idle workers.
+        """
+        stopped = 0
+        while True:
+            try:
+                worker = self._workers.get_nowait()
+            except Empty:
+                break
+            if worker is not None:
+                worker.close()
+            stopped += 1
+        for __ in xrange(stopped):
+            self._workers.put(None)
+
+
+# The pool used by safe_exec, if any.
+_POOL = None
+
+
+def configure(size, max_executions=DEFAULT_MAX_EXECUTIONS, cmdline=None):
+    """
+    Makes safe_exec use a pool of `size` workers, or none if `size` is 0.
+    """
+    global _POOL  # pylint: disable=global-statement
+    if _POOL is not None:
+        _POOL.close()
+    _POOL = SafeExecWorkerPool(size, max_executions, cmdline) if size else None
+
+
+def get_pool():
+    """
+    Returns the pool that safe_exec should use, or None.
+    """
+    if _POOL is not None and _POOL.is_enabled():
+        return _POOL
+    return None
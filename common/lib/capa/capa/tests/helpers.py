@@ -60,6 +60,7 @@ def test_capa_system(render_template=None):
         ajax_url='/dummy-ajax-url',
         anonymous_student_id='student',
         cache=None,
+        safe_exec_cache=None,
         can_execute_unsafe_code=lambda: False,
         get_python_lib_zip=lambda: None,
         DEBUG=True,
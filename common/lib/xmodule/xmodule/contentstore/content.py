@@ -314,9 +314,19 @@ class StaticContentStream(StaticContent):
                                                   length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
+    @property
+    def chunk_size(self):
+        """
+        The number of bytes read from the stream at a time: the stream's own
+        chunk size (e.g. that of a GridFS file), so that each read maps to
+        one stored chunk.
+        """
+        return getattr(self._stream, 'chunk_size', None) or STREAM_DATA_CHUNK_SIZE
+
     def stream_data(self):
+        chunk_size = self.chunk_size
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
@@ -325,15 +335,16 @@ class StaticContentStream(StaticContent):
         """
         Stream the data between first_byte and last_byte (included)
         """
+        chunk_size = self.chunk_size
         self._stream.seek(first_byte)
         position = first_byte
-        while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
-                chunk = self._stream.read(last_byte - position + 1)
-                yield chunk
+        while position <= last_byte:
+            # Read up to the end of the current chunk, so that reads after the first are chunk-aligned.
+            chunk_end = min(last_byte + 1, (position // chunk_size + 1) * chunk_size)
+            chunk = self._stream.read(chunk_end - position)
+            if len(chunk) == 0:
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            position += len(chunk)
             yield chunk
 
     def close(self):
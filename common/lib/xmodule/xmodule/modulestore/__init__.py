@@ -416,12 +416,46 @@ class BlockData(object):
     Wrap the block data in an object instead of using a straight Python dictionary.
     Allows the storing of meta-information about a structure that doesn't persist along with
     the structure itself.
+
+    Structures can have tens of thousands of blocks, so instances use __slots__.
     """
+    __slots__ = (
+        '_fields', '_children_converter', 'block_type', 'definition', 'defaults', 'asides', 'edit_info',
+        'definition_loaded',
+    )
+
+    # The attributes that are pickled, in the same format as before __slots__ were used.
+    _STATE_ATTRS = ('fields', 'block_type', 'definition', 'defaults', 'asides', 'edit_info', 'definition_loaded')
+
     def __init__(self, **kwargs):
         # Has the definition been loaded?
         self.definition_loaded = False
         self.from_storable(kwargs)
 
+    @property
+    def fields(self):
+        """
+        Contains the Scope.settings and 'children' field values.
+        """
+        converter = self._children_converter
+        if converter is not None:
+            self._fields['children'] = [converter(child) for child in self._fields['children']]
+            self._children_converter = None
+        return self._fields
+
+    @fields.setter
+    def fields(self, value):
+        self._fields = value
+        self._children_converter = None
+
+    def convert_children_lazily(self, converter):
+        """
+        Defer converting each of the stored 'children' field values with
+        `converter` until the fields are first accessed.
+        """
+        if 'children' in self._fields:
+            self._children_converter = converter
+
     def to_storable(self):
         """
         Serialize to a Mongo-storable format.
@@ -459,6 +493,21 @@ class BlockData(object):
         # EditInfo object containing all versioning/editing data.
         self.edit_info = EditInfo(**block_data.get('edit_info', {}))
 
+    def __getstate__(self):
+        """
+        Returns the state to pickle, converting any lazily converted children first.
+        """
+        return {attr: getattr(self, attr) for attr in self._STATE_ATTRS if hasattr(self, attr)}
+
+    def __setstate__(self, state):
+        """
+        Restores the pickled state, including state pickled before __slots__ were used.
+        """
+        self._children_converter = None
+        for attr in self._STATE_ATTRS:
+            if attr in state:
+                setattr(self, attr, state[attr])
+
     def get_asides(self):
         """
         For the situations if block_data has no asides attribute
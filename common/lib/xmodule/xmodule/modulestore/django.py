@@ -28,6 +28,7 @@ from pymongo import ReadPreference
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.draft_and_published import BranchSettingMixin
 from xmodule.modulestore.mixed import MixedModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache, DefinitionCache
 from xmodule.util.django import get_current_request_hostname
 import xblock.reference.plugins
 
@@ -190,6 +191,13 @@ def create_modulestore_instance(
 
     xblock_field_data_wrappers = [load_function(path) for path in settings.XBLOCK_FIELD_DATA_WRAPPERS]
 
+    CourseStructureCache.process_cache.max_size = getattr(
+        settings, 'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE', CourseStructureCache.process_cache.max_size
+    )
+    DefinitionCache.process_cache.max_size = getattr(
+        settings, 'COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE', DefinitionCache.process_cache.max_size
+    )
+
     def fetch_disabled_xblock_types():
         """
         Get the disabled xblock names, using the request_cache if possible to avoid hitting
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Benchmarks converting large, synthetic split modulestore structures between
+their mongo document format and their in-memory format.
+
+Reports the time taken by structure_from_mongo and structure_to_mongo with
+structure validation (i.e. contracts) enabled and disabled, and the time taken
+to access the children of every block after loading, which converts the
+lazily loaded children.
+"""
+
+import copy
+import datetime
+import timeit
+
+import contracts
+from bson.objectid import ObjectId
+
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo, structure_to_mongo
+
+try:
+    import click
+except ImportError:
+    click = None
+
+
+def make_structure_doc(num_blocks, children_per_block=10):
+    """
+    Returns a structure document, as read from mongo, with a tree of about
+    `num_blocks` blocks in which each parent has `children_per_block` children.
+    """
+    edit_info = {
+        'edited_on': datetime.datetime(2016, 1, 1),
+        'edited_by': 1,
+        'previous_version': None,
+        'update_version': ObjectId(),
+        'source_version': None,
+    }
+    blocks = []
+    parents = [['course', 'course']]
+    count = 1
+    while parents:
+        block_type, block_id = parents.pop(0)
+        children = []
+        while count < num_blocks and len(children) < children_per_block:
+            children.append(['vertical', 'block_{}'.format(count)])
+            count += 1
+        parents.extend(children)
+        blocks.append({
+            'block_type': block_type,
+            'block_id': block_id,
+            'definition': ObjectId(),
+            'fields': {'display_name': block_id, 'children': children} if children else {'display_name': block_id},
+            'defaults': {},
+            'asides': {},
+            'edit_info': dict(edit_info),
+        })
+    return {
+        '_id': ObjectId(),
+        'root': ['course', 'course'],
+        'blocks': blocks,
+    }
+
+
+def time_conversions(num_blocks, repeat):
+    """
+    Returns a list of (description, best time in seconds) for the conversions
+    of a structure with `num_blocks` blocks.
+    """
+    doc = make_structure_doc(num_blocks)
+    results = []
+    for validate in (True, False):
+        if validate:
+            contracts.enable_all()
+        else:
+            contracts.disable_all()
+        label = 'validated' if validate else 'not validated'
+
+        def from_mongo():
+            """Load a fresh copy of the document."""
+            return structure_from_mongo(copy.deepcopy(doc))
+
+        def access_children(structure):
+            """Access the children of every block."""
+            for block in structure['blocks'].itervalues():
+                block.fields.get('children')
+
+        copy_time = min(timeit.repeat(lambda: copy.deepcopy(doc), number=1, repeat=repeat))
+        load_time = min(timeit.repeat(from_mongo, number=1, repeat=repeat)) - copy_time
+        results.append(('structure_from_mongo ({})'.format(label), load_time))
+
+        structures = [from_mongo() for __ in xrange(repeat)]
+        results.append((
+            'access all children after load',
+            min(timeit.timeit(lambda s=s: access_children(s), number=1) for s in structures),
+        ))
+
+        structure = from_mongo()
+        results.append((
+            'structure_to_mongo ({})'.format(label),
+            min(timeit.repeat(lambda: structure_to_mongo(structure), number=1, repeat=repeat)),
+        ))
+    return results
+
+
+if click is not None:
+    # pylint: disable=bad-continuation
+    @click.command()
+    @click.option('--num_blocks',
+                  type=click.INT,
+                  default=10000,
+                  help="Number of blocks in the synthetic structure.",
+                  required=False
+                  )
+    @click.option('--repeat',
+                  type=click.INT,
+                  default=5,
+                  help="Number of times to time each conversion; the best time is reported.",
+                  required=False
+                  )
+    def cli(num_blocks, repeat):
+        """
+        Times the conversion of a synthetic structure to and from its mongo format.
+        """
+        for description, seconds in time_conversions(num_blocks, repeat):
+            click.echo('{:<45}{:>10.1f} ms'.format(description, seconds * 1000))
+
+if __name__ == '__main__':
+    if click is not None:
+        cli()  # pylint: disable=no-value-for-parameter
+    else:
+        print "Aborted! Module 'click' is not installed."
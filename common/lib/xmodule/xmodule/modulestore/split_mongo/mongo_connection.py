@@ -23,8 +23,10 @@ except ImportError:
 import dogstats_wrapper as dog_stats_api
 import logging
 
+import contracts
 from contracts import check, new_contract
 from mongodb_proxy import autoretry_read
+from openedx.core.lib.cache_utils import LRUCache
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
@@ -32,6 +34,7 @@ from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
 
 new_contract('BlockData', BlockData)
+new_contract('BlockKey', BlockKey)
 log = logging.getLogger(__name__)
 
 
@@ -163,14 +166,39 @@ class QueryTimer(object):
 TIMER = QueryTimer(__name__, 0.01)
 
 
+def _validate_structure_from_mongo(structure):
+    """
+    Checks that a structure document read from mongo has the expected shape.
+    """
+    check('seq[2]', structure['root'])
+    check('list(dict)', structure['blocks'])
+    for block in structure['blocks']:
+        if 'children' in block['fields']:
+            check('list(list[2])', block['fields']['children'])
+
+
+def _validate_structure_to_mongo(structure):
+    """
+    Checks that a structure has the expected shape before it is written to mongo.
+    """
+    check('BlockKey', structure['root'])
+    check('dict(BlockKey: BlockData)', structure['blocks'])
+    for block in structure['blocks'].itervalues():
+        if 'children' in block.fields:
+            check('list(BlockKey)', block.fields['children'])
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
         {BlockKey: block_data}.
     Converts 'root' from [block_type, block_id] to BlockKey.
-    Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
+    Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey],
+        lazily, when the block's fields are first accessed.
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
 
+    The structure is only validated when contracts are enabled (i.e. in debug mode).
+
     Arguments:
         structure: The document structure to convert
         course_context (CourseKey): For metrics gathering, the CourseKey
@@ -179,18 +207,18 @@ def structure_from_mongo(structure, course_context=None):
     with TIMER.timer('structure_from_mongo', course_context) as tagger:
         tagger.measure('blocks', len(structure['blocks']))
 
-        check('seq[2]', structure['root'])
-        check('list(dict)', structure['blocks'])
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                check('list(list[2])', block['fields']['children'])
+        if not contracts.all_disabled():
+            _validate_structure_from_mongo(structure)
 
-        structure['root'] = BlockKey(*structure['root'])
+        # BlockKey._make skips BlockKey's contract checks, which the
+        # validation above already covers.
+        make_block_key = BlockKey._make  # pylint: disable=protected-access
+        structure['root'] = make_block_key(structure['root'])
         new_blocks = {}
         for block in structure['blocks']:
-            if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
+            block_data = BlockData(**block)
+            block_data.convert_children_lazily(make_block_key)
+            new_blocks[make_block_key((block['block_type'], block['block_id']))] = block_data
         structure['blocks'] = new_blocks
 
         return structure
@@ -203,15 +231,14 @@ def structure_to_mongo(structure, course_context=None):
         and BlockKey.id as 'block_id'.
     Doesn't convert 'root', since namedtuple's can be inserted
         directly into mongo.
+
+    The structure is only validated when contracts are enabled (i.e. in debug mode).
     """
     with TIMER.timer('structure_to_mongo', course_context) as tagger:
         tagger.measure('blocks', len(structure['blocks']))
 
-        check('BlockKey', structure['root'])
-        check('dict(BlockKey: BlockData)', structure['blocks'])
-        for block in structure['blocks'].itervalues():
-            if 'children' in block.fields:
-                check('list(BlockKey)', block.fields['children'])
+        if not contracts.all_disabled():
+            _validate_structure_to_mongo(structure)
 
         new_structure = dict(structure)
         new_structure['blocks'] = []
@@ -230,9 +257,19 @@ class CourseStructureCache(object):
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
+    Since structures are immutable, their uncompressed pickled data is also
+    kept in a process-local LRU cache, keyed by structure id and bounded by
+    the size of that data, which is checked before the django cache.  The
+    structures are kept pickled, so that every caller gets its own copy, as
+    split modifies the structures it reads.  The process-local cache is
+    disabled unless its max_size is configured.
+
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
+    # The process-local tier, shared by all instances of this class.
+    process_cache = LRUCache(max_size=0)
+
     def __init__(self):
         self.cache = None
         if DJANGO_AVAILABLE:
@@ -247,6 +284,11 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            pickled_data = self.process_cache.get(key)
+            tagger.tag(from_process_cache=str(pickled_data is not None).lower())
+            if pickled_data is not None:
+                return pickle.loads(pickled_data)
+
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
@@ -260,6 +302,7 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
+            self._add_to_process_cache(key, pickled_data, tagger)
             return pickle.loads(pickled_data)
 
     def set(self, key, structure, course_context=None):
@@ -277,6 +320,103 @@ class CourseStructureCache(object):
 
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
+            self._add_to_process_cache(key, pickled_data, tagger)
+
+    def _add_to_process_cache(self, key, pickled_data, tagger):
+        """
+        Store the uncompressed pickled structure in the process-local cache,
+        weighted by its size, and report the cache's state.
+        """
+        if not self.process_cache.max_size:
+            return
+        self.process_cache.set(key, pickled_data, size=len(pickled_data))
+        tagger.measure('process_cache_size', self.process_cache.size)
+
+
+class DefinitionCache(object):
+    """
+    Cache of definitions, keyed by definition id.  Definitions are immutable,
+    so they are never invalidated.
+
+    Definitions are kept pickled, so that every caller gets its own copy, in
+    a process-local LRU cache bounded by the size of their pickled data, and
+    in the 'course_definition_cache' django cache, if it is configured.  The
+    process-local cache is disabled unless its max_size is configured.
+    """
+    # The process-local tier, shared by all instances of this class.
+    process_cache = LRUCache(max_size=0)
+
+    def __init__(self):
+        self.cache = None
+        if DJANGO_AVAILABLE:
+            try:
+                self.cache = get_cache('course_definition_cache')
+            except InvalidCacheBackendError:
+                pass
+
+    @property
+    def enabled(self):
+        """Whether any tier of the cache is in use."""
+        return self.cache is not None or bool(self.process_cache.max_size)
+
+    def get_many(self, keys, course_context=None):
+        """
+        Return a dict of the cached definitions whose ids are in `keys`.
+        """
+        if not self.enabled:
+            return {}
+
+        with TIMER.timer("DefinitionCache.get_many", course_context) as tagger:
+            tagger.measure('requested', len(keys))
+            pickled_definitions = {}
+            for key in keys:
+                pickled_data = self.process_cache.get(key)
+                if pickled_data is not None:
+                    pickled_definitions[key] = pickled_data
+            tagger.measure('process_cache_hits', len(pickled_definitions))
+
+            missing = [key for key in keys if key not in pickled_definitions]
+            if missing and self.cache is not None:
+                cached = self.cache.get_many([unicode(key) for key in missing])
+                tagger.measure('cache_hits', len(cached))
+                for key in missing:
+                    pickled_data = cached.get(unicode(key))
+                    if pickled_data is not None:
+                        pickled_definitions[key] = pickled_data
+                        self._add_to_process_cache(key, pickled_data)
+
+            tagger.measure('misses', len(keys) - len(pickled_definitions))
+            return {key: pickle.loads(pickled_data) for key, pickled_data in pickled_definitions.iteritems()}
+
+    def set_many(self, definitions, course_context=None):
+        """
+        Cache the given definitions.
+        """
+        if not self.enabled or not definitions:
+            return
+
+        with TIMER.timer("DefinitionCache.set_many", course_context) as tagger:
+            pickled_definitions = {
+                definition['_id']: pickle.dumps(definition, pickle.HIGHEST_PROTOCOL)
+                for definition in definitions
+            }
+            tagger.measure('definitions', len(pickled_definitions))
+            for key, pickled_data in pickled_definitions.iteritems():
+                self._add_to_process_cache(key, pickled_data)
+            if self.cache is not None:
+                # Definitions are immutable, so we set a timeout of "never"
+                self.cache.set_many(
+                    {unicode(key): pickled_data for key, pickled_data in pickled_definitions.iteritems()},
+                    None
+                )
+            tagger.measure('process_cache_size', self.process_cache.size)
+
+    def _add_to_process_cache(self, key, pickled_data):
+        """
+        Store the pickled definition in the process-local cache, weighted by its size.
+        """
+        if self.process_cache.max_size:
+            self.process_cache.set(key, pickled_data, size=len(pickled_data))
 
 
 class MongoConnection(object):
@@ -523,7 +663,13 @@ class MongoConnection(object):
         Get the definition from the persistence mechanism whose id is the given key
         """
         with TIMER.timer("get_definition", course_context) as tagger:
-            definition = self.definitions.find_one({'_id': key})
+            cache = DefinitionCache()
+            definition = cache.get_many([key], course_context).get(key)
+            tagger.tag(from_cache=str(definition is not None).lower())
+            if definition is None:
+                definition = self.definitions.find_one({'_id': key})
+                if definition is not None:
+                    cache.set_many([definition], course_context)
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
             return definition
@@ -534,8 +680,19 @@ class MongoConnection(object):
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            cache = DefinitionCache()
+            cached = cache.get_many(definitions, course_context)
+            tagger.measure('cached_definitions', len(cached))
+            missing = [key for key in definitions if key not in cached]
+            if not cache.enabled:
+                return self.definitions.find({'_id': {'$in': missing}})
+
+            results = cached.values()
+            if missing:
+                found = list(self.definitions.find({'_id': {'$in': missing}}))
+                cache.set_many(found, course_context)
+                results.extend(found)
+            return results
 
     def insert_definition(self, definition, course_context=None):
         """
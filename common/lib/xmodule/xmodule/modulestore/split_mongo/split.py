@@ -84,11 +84,13 @@ from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.structure_indexes import StructureIndexes
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
 from types import NoneType
 from xmodule.assetstore import AssetMetadata
+from openedx.core.lib.cache_utils import LRUCache
 
 
 log = logging.getLogger(__name__)
@@ -114,6 +116,9 @@ log = logging.getLogger(__name__)
 # When blacklists are this, all children should be excluded
 EXCLUDE_ALL = '*'
 
+# Maximum total number of blocks of the structures whose indexes are cached per process.
+STRUCTURE_INDEXES_MAX_BLOCKS = 500000
+
 
 new_contract('BlockUsageLocator', BlockUsageLocator)
 new_contract('BlockKey', BlockKey)
@@ -342,6 +347,7 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         (no data will be written to the database if a bulk operation is active.)
         """
         self._clear_cache(structure['_id'])
+        self.structure_indexes.delete(structure['_id'])
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
@@ -653,6 +659,9 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     # version) but those functions will have an optional arg for setting these.
     SEARCH_TARGET_DICT = ['wiki_slug']
 
+    # The indexes of saved structures, keyed by structure id and bounded by their total number of blocks.
+    structure_indexes = LRUCache(max_size=STRUCTURE_INDEXES_MAX_BLOCKS)
+
     def __init__(self, contentstore, doc_store_config, fs_root, render_template,
                  default_class=None,
                  error_tracker=null_error_tracker,
@@ -1216,21 +1225,32 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
+        indexes = self._get_structure_indexes(course)
+
         # No need of these caches unless include_orphans is set to False
         path_cache = None
         parents_cache = None
 
-        if not include_orphans:
+        if not include_orphans and indexes is None:
             path_cache = {}
             parents_cache = self.build_block_key_to_parents_mapping(course.structure)
 
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        blocks = course.structure['blocks']
+        if indexes is not None and isinstance(qualifiers.get('block_type'), basestring):
+            # Only look at the blocks of the requested type.
+            block_ids = indexes.keys_of_type(course.structure, qualifiers['block_type'])
+        else:
+            block_ids = blocks.iterkeys()
+
+        for block_id in block_ids:
+            if _block_matches_all(blocks[block_id]):
                 if not include_orphans:
-                    if (  # pylint: disable=bad-continuation
-                        block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
-                    ):
+                    if block_id.type in DETACHED_XBLOCK_TYPES:
+                        items.append(block_id)
+                    elif indexes is not None:
+                        if indexes.has_path_to_root(course.structure, block_id):
+                            items.append(block_id)
+                    elif self.has_path_to_root(block_id, course, path_cache, parents_cache):
                         items.append(block_id)
                 else:
                     items.append(block_id)
@@ -1308,15 +1328,23 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
-
-        # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
-        # to the course root
-        parent_ids = [
-            valid_parent
-            for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
-        ]
+        indexes = self._get_structure_indexes(course)
+        if indexes is None:
+            all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+
+            # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
+            # to the course root
+            parent_ids = [
+                valid_parent
+                for valid_parent in all_parent_ids
+                if self.has_path_to_root(valid_parent, course)
+            ]
+        else:
+            parent_ids = [
+                valid_parent
+                for valid_parent in indexes.parents(course.structure, BlockKey.from_usage_key(locator))
+                if indexes.has_path_to_root(course.structure, valid_parent)
+            ]
 
         if len(parent_ids) == 0:
             return None
@@ -2570,7 +2598,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(usage_locator)
 
         with self.bulk_operations(usage_locator.course_key):
-            original_structure = self._lookup_course(usage_locator.course_key).structure
+            original_course = self._lookup_course(usage_locator.course_key)
+            original_structure = original_course.structure
             block_key = BlockKey.from_usage_key(usage_locator)
             if original_structure['root'] == block_key:
                 raise ValueError("Cannot delete the root of a course")
@@ -2583,7 +2612,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             new_structure = self.version_structure(usage_locator.course_key, original_structure, user_id)
             new_blocks = new_structure['blocks']
             new_id = new_structure['_id']
-            parent_block_keys = self._get_parents_from_structure(block_key, original_structure)
+            original_indexes = self._get_structure_indexes(original_course)
+            if original_indexes is None:
+                parent_block_keys = self._get_parents_from_structure(block_key, original_structure)
+            else:
+                parent_block_keys = original_indexes.parents(original_structure, block_key)
             for parent_block_key in parent_block_keys:
                 parent_block = new_blocks[parent_block_key]
                 parent_block.fields['children'].remove(block_key)
@@ -3114,6 +3147,22 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             'schema_version': self.SCHEMA_VERSION,
         }
 
+    def _get_structure_indexes(self, course):
+        """
+        Returns the StructureIndexes of the structure of the given CourseEnvelope,
+        or None if the structure hasn't been saved yet, as it may still change.
+        """
+        structure = course.structure
+        bulk_write_record = self._get_bulk_ops_record(course.course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            return None
+
+        indexes = self.structure_indexes.get(structure['_id'])
+        if indexes is None:
+            indexes = StructureIndexes()
+            self.structure_indexes.set(structure['_id'], indexes, size=max(len(structure['blocks']), 1))
+        return indexes
+
     @contract(block_key=BlockKey)
     def _get_parents_from_structure(self, block_key, structure):
         """
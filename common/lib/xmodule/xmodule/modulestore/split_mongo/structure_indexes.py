@@ -0,0 +1,88 @@
+"""
+Secondary indexes of the blocks of split modulestore structures.
+
+A structure version never changes once it is saved, so its indexes can be
+built once, the first time each of them is needed, and reused by every
+query on that version: the keys of the blocks of each type, the parents of
+each block, and the set of blocks which have a path to the root.
+"""
+
+from collections import defaultdict
+
+from xmodule.modulestore.split_mongo import BlockKey
+
+# Types of the blocks which are roots when they have no parents.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+class StructureIndexes(object):
+    """
+    Lazily built indexes of the blocks of a structure.
+
+    The structure isn't kept, so it must be passed to each method, and must
+    always be the same, unmodified structure.  Concurrent calls may build
+    the same index twice, which is harmless.
+    """
+    def __init__(self):
+        self._keys_by_type = None
+        self._parents_by_child = None
+        self._keys_with_path_to_root = None
+
+    def keys_of_type(self, structure, block_type):
+        """
+        Returns the keys of the blocks of the given type, in the order in
+        which the structure's blocks are iterated.
+        """
+        if self._keys_by_type is None:
+            keys_by_type = defaultdict(list)
+            for block_key in structure['blocks']:
+                keys_by_type[block_key.type].append(block_key)
+            self._keys_by_type = dict(keys_by_type)
+        return self._keys_by_type.get(block_type, [])
+
+    def parents(self, structure, block_key):
+        """
+        Returns the keys of the blocks which have the given block as a child,
+        in the order in which the structure's blocks are iterated.
+        """
+        return self._get_parents_by_child(structure).get(block_key, [])
+
+    def has_path_to_root(self, structure, block_key):
+        """
+        Returns whether the given block is a root, i.e. a course or library
+        without parents, or is a descendant of one.
+        """
+        if self._keys_with_path_to_root is None:
+            parents_by_child = self._get_parents_by_child(structure)
+            roots = [
+                key for key in structure['blocks']
+                if key.type in ROOT_BLOCK_TYPES and key not in parents_by_child
+            ]
+            reachable = set(roots)
+            stack = list(roots)
+            while stack:
+                block_data = structure['blocks'].get(stack.pop())
+                if block_data is None:
+                    continue
+                for child in block_data.fields.get('children', []):
+                    child_key = BlockKey(*child)
+                    if child_key not in reachable:
+                        reachable.add(child_key)
+                        stack.append(child_key)
+            self._keys_with_path_to_root = frozenset(reachable)
+        return block_key in self._keys_with_path_to_root
+
+    def _get_parents_by_child(self, structure):
+        """
+        Returns a dict of the keys of the parents of each block which has any.
+        """
+        if self._parents_by_child is None:
+            parents_by_child = defaultdict(list)
+            for parent_key, block_data in structure['blocks'].iteritems():
+                for child in block_data.fields.get('children', []):
+                    parents = parents_by_child[BlockKey(*child)]
+                    # A block listed twice as a child of the same parent has that parent once.
+                    if not parents or parents[-1] != parent_key:
+                        parents.append(parent_key)
+            self._parents_by_child = dict(parents_by_child)
+        return self._parents_by_child
@@ -1,7 +1,7 @@
 """
     Test split modulestore w/o using any django stuff.
 """
-from mock import patch
+from mock import Mock, patch
 import datetime
 from importlib import import_module
 from path import Path as path
@@ -29,6 +29,7 @@ from ccx_keys.locator import CCXBlockUsageLocator
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
@@ -978,6 +979,51 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_process_cache(self, mock_get_cache):
+        shared_cache = Mock(wraps=self.cache)
+        mock_get_cache.return_value = shared_cache
+        CourseStructureCache.process_cache.clear()
+        self.addCleanup(CourseStructureCache.process_cache.clear)
+
+        with patch.object(CourseStructureCache.process_cache, 'max_size', 10 * 1024 * 1024):
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            # the structure is now read from the process-local cache,
+            # without going to mongo or the shared cache
+            shared_cache.get.reset_mock()
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+            self.assertFalse(shared_cache.get.called)
+
+        self.assertEqual(cached_structure, not_cached_structure)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_course_structure_process_cache_copies(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        CourseStructureCache.process_cache.clear()
+        self.addCleanup(CourseStructureCache.process_cache.clear)
+
+        with patch.object(CourseStructureCache.process_cache, 'max_size', 10 * 1024 * 1024):
+            structure = self._get_structure(self.new_course)
+            block_key, block = structure['blocks'].items()[0]
+            original_fields = dict(block.fields)
+
+            # changes made by a caller to the structure it was given, such as
+            # loading definitions into its blocks, aren't seen by other callers
+            block.fields['data'] = 'changed by a caller'
+            block.definition_loaded = True
+            structure['blocks'].clear()
+
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+
+        self.assertIsNot(cached_structure, structure)
+        cached_block = cached_structure['blocks'][block_key]
+        self.assertEqual(cached_block.fields, original_fields)
+        self.assertFalse(cached_block.definition_loaded)
+
     def test_dummy_cache(self):
         with check_mongo_calls(1):
             not_cached_structure = self._get_structure(self.new_course)
@@ -1,7 +1,15 @@
 """ Test the behavior of split_mongo/MongoConnection """
+import cPickle as pickle
 import unittest
-from mock import patch
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+
+import ddt
+from bson.objectid import ObjectId
+from mock import MagicMock, Mock, patch
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    DefinitionCache, MongoConnection, structure_from_mongo, structure_to_mongo
+)
 from xmodule.exceptions import HeartbeatFailure
 
 
@@ -17,3 +25,125 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+@ddt.ddt
+class TestStructureConversion(unittest.TestCase):
+    """ Test converting structures to and from their mongo format """
+    def _structure_doc(self):
+        """ Returns a structure document as read from mongo """
+        return {
+            'root': ['course', 'course'],
+            'blocks': [
+                {
+                    'block_type': 'course',
+                    'block_id': 'course',
+                    'fields': {'children': [['chapter', 'chapter1']], 'display_name': 'Course'},
+                    'edit_info': {'edited_by': 1},
+                },
+                {
+                    'block_type': 'chapter',
+                    'block_id': 'chapter1',
+                    'fields': {},
+                    'edit_info': {'edited_by': 1},
+                },
+            ],
+        }
+
+    def test_children_converted_lazily(self):
+        structure = structure_from_mongo(self._structure_doc())
+        self.assertEqual(structure['root'], BlockKey('course', 'course'))
+        course = structure['blocks'][BlockKey('course', 'course')]
+        self.assertEqual(course._fields['children'], [['chapter', 'chapter1']])  # pylint: disable=protected-access
+        self.assertEqual(course.fields['children'], [BlockKey('chapter', 'chapter1')])
+        self.assertIsInstance(course.fields['children'][0], BlockKey)
+
+    def test_round_trip(self):
+        doc = structure_to_mongo(structure_from_mongo(self._structure_doc()))
+        blocks = {(block['block_type'], block['block_id']): block for block in doc['blocks']}
+        self.assertEqual(set(blocks), {('course', 'course'), ('chapter', 'chapter1')})
+        self.assertEqual(blocks[('course', 'course')]['fields']['children'], [BlockKey('chapter', 'chapter1')])
+        self.assertEqual(blocks[('chapter', 'chapter1')]['fields'], {})
+
+    @ddt.data(0, pickle.HIGHEST_PROTOCOL)
+    def test_pickle(self, protocol):
+        structure = structure_from_mongo(self._structure_doc())
+        unpickled = pickle.loads(pickle.dumps(structure, protocol))
+        self.assertEqual(unpickled, structure)
+        course = unpickled['blocks'][BlockKey('course', 'course')]
+        self.assertIsInstance(course.fields['children'][0], BlockKey)
+
+    def test_unpickle_without_slots(self):
+        # BlockData used to be pickled with its __dict__ as its state
+        block = BlockData()
+        block.__setstate__({'fields': {'children': []}, 'block_type': 'course', 'definition_loaded': True})
+        self.assertEqual(block.fields, {'children': []})
+        self.assertTrue(block.definition_loaded)
+        self.assertEqual(block.get_asides(), {})
+
+
+class TestDefinitionCache(unittest.TestCase):
+    """ Test caching definitions per process and in the shared cache """
+    def setUp(self):
+        super(TestDefinitionCache, self).setUp()
+        DefinitionCache.process_cache.clear()
+        self.addCleanup(DefinitionCache.process_cache.clear)
+        self.definitions = [
+            {'_id': ObjectId(), 'block_type': 'html', 'fields': {'data': '<p>{}</p>'.format(index)}}
+            for index in range(3)
+        ]
+
+    def _connection(self):
+        """ Returns a MongoConnection whose definitions collection is a mock """
+        with patch('xmodule.modulestore.split_mongo.mongo_connection.connect_to_mongodb', MagicMock()):
+            connection = MongoConnection('db', 'collection', 'host')
+        connection.definitions = Mock()
+        connection.definitions.find.side_effect = lambda query: [
+            definition for definition in self.definitions if definition['_id'] in query['_id']['$in']
+        ]
+        return connection
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.DJANGO_AVAILABLE', False)
+    def test_process_cache(self):
+        connection = self._connection()
+        ids = [definition['_id'] for definition in self.definitions]
+        with patch.object(DefinitionCache.process_cache, 'max_size', 1024 * 1024):
+            self.assertItemsEqual(connection.get_definitions(ids[:2]), self.definitions[:2])
+            self.assertItemsEqual(connection.get_definitions(ids), self.definitions)
+            connection.definitions.find.assert_called_with({'_id': {'$in': ids[2:]}})
+
+            # Each caller gets its own copy of cached definitions.
+            connection.definitions.find.reset_mock()
+            definitions = connection.get_definitions(ids)
+            self.assertItemsEqual(definitions, self.definitions)
+            self.assertFalse(connection.definitions.find.called)
+            definitions[0]['fields']['data'] = 'changed'
+            self.assertItemsEqual(connection.get_definitions(ids), self.definitions)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.DJANGO_AVAILABLE', False)
+    def test_not_cached_by_default(self):
+        connection = self._connection()
+        ids = [definition['_id'] for definition in self.definitions]
+        self.assertItemsEqual(connection.get_definitions(ids), self.definitions)
+        self.assertItemsEqual(connection.get_definitions(ids), self.definitions)
+        self.assertEqual(connection.definitions.find.call_count, 2)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.DJANGO_AVAILABLE', True)
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_shared_cache(self, mock_get_cache):
+        shared_cache = {}
+        mock_get_cache.return_value = Mock(
+            get_many=lambda keys: {key: shared_cache[key] for key in keys if key in shared_cache},
+            set_many=lambda values, timeout: shared_cache.update(values),
+        )
+        connection = self._connection()
+        ids = [definition['_id'] for definition in self.definitions]
+        self.assertItemsEqual(connection.get_definitions(ids), self.definitions)
+        self.assertEqual(set(shared_cache), {unicode(_id) for _id in ids})
+
+        # Another process finds the definitions in the shared cache.
+        DefinitionCache.process_cache.clear()
+        connection.definitions.find.reset_mock()
+        self.assertItemsEqual(connection.get_definitions(ids), self.definitions)
+        self.assertEqual(connection.get_definition(ids[0]), self.definitions[0])
+        self.assertFalse(connection.definitions.find.called)
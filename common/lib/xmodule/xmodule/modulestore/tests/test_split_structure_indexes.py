@@ -0,0 +1,63 @@
+""" Test the indexes of split modulestore structures """
+import unittest
+
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import structure_from_mongo
+from xmodule.modulestore.split_mongo.structure_indexes import StructureIndexes
+
+
+def _block(block_type, block_id, children=()):
+    """ Returns a block document as read from mongo """
+    return {
+        'block_type': block_type,
+        'block_id': block_id,
+        'fields': {'children': [list(child) for child in children]} if children else {},
+        'edit_info': {'edited_by': 1},
+    }
+
+
+class TestStructureIndexes(unittest.TestCase):
+    """ Test StructureIndexes against a structure with an orphaned subtree """
+    COURSE = BlockKey('course', 'course')
+    CHAPTER = BlockKey('chapter', 'chapter')
+    SEQUENTIAL = BlockKey('sequential', 'sequential')
+    VERTICAL = BlockKey('vertical', 'vertical')
+    ORPHAN = BlockKey('vertical', 'orphan')
+    ORPHAN_CHILD = BlockKey('html', 'orphan_child')
+
+    def setUp(self):
+        super(TestStructureIndexes, self).setUp()
+        self.structure = structure_from_mongo({
+            'root': list(self.COURSE),
+            'blocks': [
+                _block('course', 'course', [self.CHAPTER]),
+                _block('chapter', 'chapter', [self.SEQUENTIAL, self.SEQUENTIAL]),
+                _block('sequential', 'sequential', [self.VERTICAL]),
+                _block('vertical', 'vertical'),
+                _block('vertical', 'orphan', [self.ORPHAN_CHILD, self.VERTICAL]),
+                _block('html', 'orphan_child'),
+            ],
+        })
+        self.indexes = StructureIndexes()
+
+    def test_keys_of_type(self):
+        self.assertEqual(
+            set(self.indexes.keys_of_type(self.structure, 'vertical')),
+            {self.VERTICAL, self.ORPHAN},
+        )
+        self.assertEqual(self.indexes.keys_of_type(self.structure, 'course'), [self.COURSE])
+        self.assertEqual(self.indexes.keys_of_type(self.structure, 'problem'), [])
+
+    def test_parents(self):
+        self.assertEqual(self.indexes.parents(self.structure, self.COURSE), [])
+        self.assertEqual(self.indexes.parents(self.structure, self.SEQUENTIAL), [self.CHAPTER])
+        self.assertEqual(
+            set(self.indexes.parents(self.structure, self.VERTICAL)),
+            {self.SEQUENTIAL, self.ORPHAN},
+        )
+
+    def test_has_path_to_root(self):
+        for block_key in (self.COURSE, self.CHAPTER, self.SEQUENTIAL, self.VERTICAL):
+            self.assertTrue(self.indexes.has_path_to_root(self.structure, block_key))
+        for block_key in (self.ORPHAN, self.ORPHAN_CHILD):
+            self.assertFalse(self.indexes.has_path_to_root(self.structure, block_key))
@@ -21,7 +21,11 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
 import logging
+import time
 from abc import abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -55,10 +59,36 @@ from xmodule.util.misc import escape_invalid_characters
 log = logging.getLogger(__name__)
 
 
+# Files larger than this many bytes are streamed into the contentstore in
+# chunks, rather than read into memory whole.
+STATIC_CONTENT_STREAM_THRESHOLD = 4 * 1024 * 1024
+STATIC_CONTENT_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_in_chunks(content_file, chunk_size=STATIC_CONTENT_CHUNK_SIZE):
+    """
+    Yields the data of an open file in chunks, then closes it.
+    """
+    try:
+        while True:
+            chunk = content_file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        content_file.close()
+
+
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
+        target_id, subpath='static', verbose=False, num_workers=1):
+    """
+    Import the files under course_data_path/subpath into the static_content_store,
+    and return a dict of the asset keys by path relative to that directory.
 
+    When num_workers is more than 1, the files are uploaded by a pool of that
+    many threads, so that at most num_workers files are being read at once.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -77,70 +107,106 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
+    def content_paths():
+        """
+        Yields the paths of the files to import.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            content_path = os.path.join(dirname, filename)
+                content_path = os.path.join(dirname, filename)
 
-            if re.match(ASSET_IGNORE_REGEX, filename):
-                if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
+                    continue
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+                yield content_path
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
+    def import_file(content_path):
+        """
+        Save one file into the static_content_store, and return its path
+        relative to static_dir and its asset key, or None if it was skipped.
+        """
+        filename = os.path.basename(content_path)
+
+        if verbose:
+            log.debug('importing static content %s...', content_path)
+
+        try:
+            content_file = open(content_path, 'rb')
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        if os.fstat(content_file.fileno()).st_size > STATIC_CONTENT_STREAM_THRESHOLD:
+            data = _read_in_chunks(content_file)
+            thumbnail_source_path = content_path
+        else:
+            with content_file:
+                data = content_file.read()
+            thumbnail_source_path = None
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+
+        # During export display name is used to create files, strip away slashes from name
+        displayname = escape_invalid_characters(
+            name=policy_ele.get('displayname', filename),
+            invalid_char_list=['/', '\\']
+        )
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(
+            content, tempfile_path=thumbnail_source_path
+        )
 
-            policy_ele = policy.get(asset_key.path, {})
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
 
-            # During export display name is used to create files, strip away slashes from name
-            displayname = escape_invalid_characters(
-                name=policy_ele.get('displayname', filename),
-                invalid_char_list=['/', '\\']
-            )
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception as err:
+            log.exception(u'Error importing {0}, error={1}'.format(
+                fullname_with_subpath, err
+            ))
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+        return fullname_with_subpath, asset_key
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+    if num_workers > 1:
+        pool = ThreadPool(num_workers)
+        try:
+            imported = list(pool.imap_unordered(import_file, content_paths()))
+        finally:
+            pool.terminate()
+    else:
+        imported = [import_file(content_path) for content_path in content_paths()]
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
-
-            # store the remapping information which will be needed
-            # to subsitute in the module data
+    # store the remapping information which will be needed
+    # to subsitute in the module data
+    for item in imported:
+        if item is not None:
+            fullname_with_subpath, asset_key = item
             remap_dict[fullname_with_subpath] = asset_key
 
     return remap_dict
@@ -177,6 +243,9 @@ class ImportManager(object):
         create_if_not_present: If True, then a new courselike is created if it doesn't already exist.
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
+        static_import_workers: the number of threads which upload static files into
+            static_content_store concurrently.
+
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -187,7 +256,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, static_import_workers=1
     ):
         self.store = store
         self.user_id = user_id
@@ -200,6 +269,9 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_import_workers = static_import_workers
+        # The number of seconds spent in each phase of the import of each courselike, by courselike key.
+        self.phase_timings = OrderedDict()
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -228,7 +300,8 @@ class ImportManager(object):
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose,
+                num_workers=self.static_import_workers,
             )
 
         elif self.verbose and not self.do_import_static:
@@ -251,7 +324,8 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose,
+                num_workers=self.static_import_workers,
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -424,6 +498,36 @@ class ImportManager(object):
                 runtime=courselike.runtime,
             )
 
+    @contextmanager
+    def timed_phase(self, courselike_key, phase):
+        """
+        Record the number of seconds spent in a phase of the import of a courselike.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self._record_phase_timing(courselike_key, phase, start)
+
+    def _record_phase_timing(self, courselike_key, phase, start):
+        """
+        Add the number of seconds since start to the time spent in a phase of the import of a courselike.
+        """
+        timings = self.phase_timings.setdefault(courselike_key, OrderedDict())
+        timings[phase] = timings.get(phase, 0) + time.time() - start
+
+    def log_phase_timings(self, courselike_key):
+        """
+        Log the time spent in each phase of the import of a courselike.
+        """
+        timings = self.phase_timings.get(courselike_key, {})
+        log.info(
+            u'Imported %s in %.2fs: %s',
+            courselike_key,
+            sum(timings.values()),
+            u', '.join(u'{}={:.2f}s'.format(phase, seconds) for phase, seconds in timings.iteritems()),
+        )
+
     def run_imports(self):
         """
         Iterate over the given directories and yield courses.
@@ -438,26 +542,36 @@ class ImportManager(object):
             # This bulk operation wraps all the operations to populate the published branch.
             with self.store.bulk_operations(dest_id):
                 # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
+                with self.timed_phase(courselike_key, 'courselike'):
+                    source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
                 # Import all static pieces.
-                self.import_static(data_path, dest_id)
+                with self.timed_phase(courselike_key, 'static'):
+                    self.import_static(data_path, dest_id)
 
                 # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
+                with self.timed_phase(courselike_key, 'asset_metadata'):
+                    self.import_asset_metadata(data_path, dest_id)
 
                 # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+                with self.timed_phase(courselike_key, 'children'):
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
+
+                # The published items are written to the modulestore in one batch when the bulk operation ends.
+                persist_start = time.time()
+            self._record_phase_timing(courselike_key, 'persist', persist_start)
 
             # This bulk operation wraps all the operations to populate the draft branch with any items
             # from the /drafts subdirectory.
             # Drafts must be imported in a separate bulk operation from published items to import properly,
             # due to the recursive_build() above creating a draft item for each course block
             # and then publishing it.
-            with self.store.bulk_operations(dest_id):
-                # Import all draft items into the courselike.
-                courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+            with self.timed_phase(courselike_key, 'drafts'):
+                with self.store.bulk_operations(dest_id):
+                    # Import all draft items into the courselike.
+                    courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
 
+            self.log_phase_timings(courselike_key)
             yield courselike
 
 
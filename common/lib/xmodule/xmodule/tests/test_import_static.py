@@ -2,7 +2,7 @@
 Tests that check that we ignore the appropriate files when importing courses.
 """
 import unittest
-from mock import Mock
+from mock import Mock, patch
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.tests import DATA_DIR
@@ -39,3 +39,22 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+    def test_import_static_files_in_parallel(self):
+        """
+        Test that files are imported by a pool of threads, and that large files are streamed
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        content_store = Mock()
+        content_store.generate_thumbnail.return_value = (None, None)
+        with patch('xmodule.modulestore.xml_importer.STATIC_CONTENT_STREAM_THRESHOLD', 0):
+            remap_dict = import_static_content(course_dir, content_store, course_id, num_workers=4)
+        saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
+        name_val = {sc.name: ''.join(sc.data) for sc in saved_static_content}
+        self.assertIn("GREEN", name_val["example.txt"])
+        self.assertIn("BLUE", name_val[".example.txt"])
+        self.assertNotIn("._example.txt", name_val)
+        self.assertEqual(set(remap_dict.values()), {sc.location for sc in saved_static_content})
+        for call in content_store.generate_thumbnail.call_args_list:
+            self.assertIsNotNone(call[1]['tempfile_path'])
@@ -2,6 +2,9 @@
 Models for bulk email
 """
 import logging
+import re
+import string
+
 import markupsafe
 
 from django.contrib.auth.models import User
@@ -10,7 +13,7 @@ from django.db import models
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_by_name
 from openedx.core.lib.html_to_text import html_to_text
-from openedx.core.lib.mail_utils import wrap_message
+from openedx.core.lib.mail_utils import wrap_message, wrap_message_prefix
 
 from config_models.models import ConfigurationModel
 from student.roles import CourseStaffRole, CourseInstructorRole
@@ -293,21 +296,7 @@ class CourseEmailTemplate(models.Model):
         Such encoding is left to the email code, which will use the value
         of settings.DEFAULT_CHARSET to encode the message.
         """
-
-        # Substitute all %%-encoded keywords in the message body
-        if 'user_id' in context and 'course_id' in context:
-            message_body = substitute_keywords_with_data(message_body, context)
-
-        result = format_string.format(**context)
-
-        # Note that the body tag in the template will now have been
-        # "formatted", so we need to do the same to the tag being
-        # searched for.
-        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
-        result = result.replace(message_body_tag, message_body, 1)
-
-        # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
-        return wrap_message(result)
+        return CompiledEmailTemplate(format_string, message_body, context).render({})
 
     def render_plaintext(self, plaintext, context):
         """
@@ -325,11 +314,126 @@ class CourseEmailTemplate(models.Model):
         Convert HTML text body (`htmltext`) into HTML email message using the
         stored HTML template and the provided `context` dict.
         """
-        # HTML-escape string values in the context (used for keyword substitution).
-        for key, value in context.iteritems():
-            if isinstance(value, basestring):
-                context[key] = markupsafe.escape(value)
-        return CourseEmailTemplate._render(self.html_template, htmltext, context)
+        return self.compile_htmltext(htmltext, context).render({})
+
+    def compile_plaintext(self, plaintext, global_context):
+        """
+        Returns a CompiledEmailTemplate that renders the plaintext email message
+        for each recipient, given the context common to all recipients.
+        """
+        return CompiledEmailTemplate(self.plain_template, plaintext, global_context)
+
+    def compile_htmltext(self, htmltext, global_context):
+        """
+        Returns a CompiledEmailTemplate that renders the HTML email message
+        for each recipient, given the context common to all recipients.
+
+        String values in the context, used for keyword substitution, are HTML-escaped.
+        """
+        return CompiledEmailTemplate(self.html_template, htmltext, global_context, escape_values=True)
+
+
+# Keys of the email context whose values differ for each recipient.
+RECIPIENT_CONTEXT_KEYS = ('name', 'email', 'user_id', 'course_id')
+
+
+class CompiledEmailTemplate(object):
+    """
+    An email template and message body, compiled with the context that is
+    common to all recipients of an email.
+
+    The template is formatted and wrapped once, up to its first field that
+    refers to RECIPIENT_CONTEXT_KEYS or the message body, if %%KEYWORD%%s have
+    to be substituted in it.  Rendering the message for each recipient then
+    only formats and wraps the rest of the template.
+    """
+    def __init__(self, format_string, message_body, global_context, escape_values=False):
+        self.message_body = message_body
+        self.escape_values = escape_values
+        self.global_context = self._escape_context(global_context)
+
+        # The template, as a list of (text, is_recipient_field) pairs.  Recipient
+        # fields are format strings that are formatted for each recipient.
+        segments = []
+        literal_text = []
+        for text, field_name, format_spec, conversion in string.Formatter().parse(format_string):
+            # The text has been unescaped by parse(), so it mustn't be formatted again.
+            literal_text.append(text)
+            if field_name is None:
+                continue
+            field = u'{%s%s%s}' % (
+                field_name,
+                u'!' + conversion if conversion else u'',
+                u':' + format_spec if format_spec else u'',
+            )
+            if re.match(r'[^.[]*', field_name).group() in RECIPIENT_CONTEXT_KEYS:
+                segments.append((u''.join(literal_text), False))
+                segments.append((field, True))
+                literal_text = []
+            else:
+                literal_text.append(field.format(**self.global_context))
+        segments.append((u''.join(literal_text), False))
+
+        # Note that the body tag in the template will now have been
+        # "formatted", so we need to do the same to the tag being
+        # searched for.
+        message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+        prefix = segments[0][0]
+        self.body_in_prefix = message_body_tag in prefix
+        if self.body_in_prefix:
+            before_body, after_body = prefix.split(message_body_tag, 1)
+            if '%%' in message_body:
+                segments[0:1] = [(before_body, False), (None, False), (after_body, False)]
+            else:
+                segments[0] = (before_body + message_body + after_body, False)
+
+        self.wrapped_prefix, prefix_rest = wrap_message_prefix(segments[0][0])
+        self.segments = [(prefix_rest, False)] + segments[1:]
+
+    def _escape_context(self, context):
+        """
+        Returns a copy of `context`, in which string values are HTML-escaped if required.
+        """
+        if not self.escape_values:
+            return dict(context)
+        return {
+            key: markupsafe.escape(value) if isinstance(value, basestring) else value
+            for key, value in context.iteritems()
+        }
+
+    def _render_message_body(self, context):
+        """
+        Returns the message body, with all %%-encoded keywords substituted.
+        """
+        if 'user_id' in context and 'course_id' in context:
+            return substitute_keywords_with_data(self.message_body, context)
+        return self.message_body
+
+    def render(self, recipient_context):
+        """
+        Returns the email message for the recipient described by `recipient_context`,
+        as a unicode string, see CourseEmailTemplate._render.
+        """
+        context = self.global_context
+        if recipient_context:
+            context = dict(context)
+            context.update(self._escape_context(recipient_context))
+
+        parts = []
+        for text, is_recipient_field in self.segments:
+            if text is None:
+                parts.append(self._render_message_body(context))
+            elif is_recipient_field:
+                parts.append(text.format(**context))
+            else:
+                parts.append(text)
+        result = u''.join(parts)
+        if not self.body_in_prefix:
+            message_body_tag = COURSE_EMAIL_MESSAGE_BODY_TAG.format()
+            result = result.replace(message_body_tag, self._render_message_body(context), 1)
+
+        # finally, return the result, after wrapping long lines and without converting to an encoded byte array.
+        return self.wrapped_prefix + wrap_message(result)
 
 
 class CourseAuthorization(models.Model):
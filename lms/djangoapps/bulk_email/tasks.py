@@ -8,6 +8,10 @@ import json
 import logging
 import random
 import re
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+from Queue import Queue
 from time import sleep
 
 import dogstats_wrapper as dog_stats_api
@@ -414,6 +418,106 @@ def _get_source_address(course_id, course_title, truncate=True):
     return from_addr
 
 
+class SendRateLimiter(object):
+    """
+    Spaces out the emails sent by all of the tasks and threads of a process,
+    so that no more than a given number of emails are sent per second.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_send_time = 0
+
+    def wait(self, max_sends_per_second):
+        """
+        Blocks until the next email can be sent, and returns the number of
+        seconds waited.  A `max_sends_per_second` of 0 means no limit.
+        """
+        if not max_sends_per_second:
+            return 0
+        with self._lock:
+            now = time.time()
+            send_time = max(now, self._next_send_time)
+            self._next_send_time = send_time + 1.0 / max_sends_per_second
+        delay = send_time - now
+        if delay > 0:
+            sleep(delay)
+        return delay
+
+
+SEND_RATE_LIMITER = SendRateLimiter()
+
+
+class _EmailSender(object):
+    """
+    Sends emails over a bounded pool of SMTP connections, in parallel.
+
+    Each connection is used by one thread at a time, and the rate at which
+    emails are sent is limited by BULK_EMAIL_MAX_SENDS_PER_SECOND.
+    """
+    def __init__(self, num_connections, tags):
+        self.num_connections = max(num_connections, 1)
+        self.tags = tags
+        self._connections = []
+        self._idle_connections = Queue()
+        self._pool = None
+
+    def open(self):
+        """
+        Opens the connections, raising any error that occurs doing so.
+        """
+        for __ in xrange(self.num_connections):
+            connection = get_connection()
+            self._connections.append(connection)
+            connection.open()
+            self._idle_connections.put(connection)
+        if self.num_connections > 1:
+            self._pool = ThreadPool(self.num_connections)
+
+    def send(self, email_msgs):
+        """
+        Sends each of `email_msgs`, which are sent in parallel if there is
+        more than one connection.
+
+        Returns, for each message in order, the exception raised sending it,
+        or None if it was sent.
+        """
+        if self._pool is None or len(email_msgs) == 1:
+            return [self._send_one(email_msg) for email_msg in email_msgs]
+        return self._pool.map(self._send_one, email_msgs, chunksize=1)
+
+    def _send_one(self, email_msg):
+        """
+        Sends `email_msg` over an idle connection, and returns the exception
+        raised doing so, if any.
+        """
+        waited = SEND_RATE_LIMITER.wait(settings.BULK_EMAIL_MAX_SENDS_PER_SECOND)
+        if waited > 0:
+            dog_stats_api.increment('course_email.rate_limited', tags=self.tags)
+            dog_stats_api.histogram('course_email.rate_limited.time', waited, tags=self.tags)
+
+        connection = self._idle_connections.get()
+        try:
+            with dog_stats_api.timer('course_email.single_send.time.overall', tags=self.tags):
+                connection.send_messages([email_msg])
+        except Exception as exc:  # pylint: disable=broad-except
+            return exc
+        finally:
+            self._idle_connections.put(connection)
+        return None
+
+    def close(self):
+        """
+        Stops the threads, and closes the connections.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+
+
 def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):
     """
     Performs the email sending task.
@@ -488,51 +592,63 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
 
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
-    try:
-        connection = get_connection()
-        connection.open()
 
-        # Define context values to use in all course emails:
+    # Throttle if we have gotten the rate limiter.  This is not very high-tech,
+    # but if a task has been retried for rate-limiting reasons, then we send
+    # over a single connection and sleep for a period of time between all emails
+    # within this task.  Choice of the value depends on the number of workers
+    # that might be sending email in parallel, and what the SES throttle rate is.
+    throttled = subtask_status.retried_nomax > 0
+    sender = _EmailSender(1 if throttled else settings.BULK_EMAIL_SEND_CONNECTIONS, [_statsd_tag(course_title)])
+    send_start_time = time.time()
+    try:
+        # Compile the templates once, with the context values to use in all course emails:
         email_context = {'name': '', 'email': ''}
         email_context.update(global_email_context)
+        plaintext_template = course_email_template.compile_plaintext(course_email.text_message, email_context)
+        html_template = course_email_template.compile_htmltext(course_email.html_message, email_context)
+
+        sender.open()
 
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
+            # Send to a batch of users from the end of the list, one per connection.
+            # At the end of processing each user, they will be removed from the to_list.
             # That way, the to_list will always contain the recipients remaining to be emailed.
             # This is convenient for retries, which will need to send to those who haven't
             # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
-
-            # Throttle if we have gotten the rate limiter.  This is not very high-tech,
-            # but if a task has been retried for rate-limiting reasons, then we sleep
-            # for a period of time between all emails within this task.  Choice of
-            # the value depends on the number of workers that might be sending email in
-            # parallel, and what the SES throttle rate is.
-            if subtask_status.retried_nomax > 0:
+            batch = to_list[:-sender.num_connections - 1:-1]
+            email_msgs = []
+            for current_recipient in batch:
+                # Construct message content using the templates and user-specific values:
+                email = current_recipient['email']
+                recipient_context = {
+                    'email': email,
+                    'name': current_recipient['profile__name'],
+                    'user_id': current_recipient['pk'],
+                    'course_id': course_email.course_id,
+                }
+                plaintext_msg = plaintext_template.render(recipient_context)
+                html_msg = html_template.render(recipient_context)
+
+                # Create email:
+                email_msg = EmailMultiAlternatives(
+                    course_email.subject,
+                    plaintext_msg,
+                    from_addr,
+                    [email]
+                )
+                email_msg.attach_alternative(html_msg, 'text/html')
+                email_msgs.append(email_msg)
+
+            if throttled:
                 sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
 
-            try:
+            # Users to retry, and the first exception that requires the task to be retried.
+            unsent_recipients = []
+            retry_exception = None
+            for current_recipient, exc in zip(batch, sender.send(email_msgs)):
+                recipient_num += 1
+                email = current_recipient['email']
                 log.info(
                     "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
                     Recipient name: %s, Email address: %s",
@@ -544,83 +660,101 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
                     current_recipient['profile__name'],
                     email
                 )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
+
+                if isinstance(exc, SMTPDataError):
+                    # According to SMTP spec, we'll retry error codes in the 4xx range.
+                    # 5xx range indicates hard failure.
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    if exc.smtp_code >= 400 and exc.smtp_code < 500:
+                        # This will cause the outer handler to catch the exception and retry the entire task.
+                        retry_exception = retry_exception or exc
+                        unsent_recipients.append(current_recipient)
+                        continue
+                    else:
+                        # This will fall through and not retry the message.
+                        log.warning(
+                            'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                            Email not delivered to %s due to error %s',
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            recipient_num,
+                            total_recipients,
+                            email,
+                            exc.smtp_error
+                        )
+                        dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                        subtask_status.increment(failed=1)
+
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
                     # This will fall through and not retry the message.
-                    log.warning(
-                        'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                        EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
                         parent_task_id,
                         task_id,
                         email_id,
                         recipient_num,
                         total_recipients,
                         email,
-                        exc.smtp_error
+                        exc
                     )
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
+                elif exc is not None:
+                    # This will cause the outer handlers to catch the exception, and retry or fail the task.
+                    retry_exception = retry_exception or exc
+                    unsent_recipients.append(current_recipient)
+                    continue
 
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
                 else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                    total_recipients_successful += 1
+                    log.info(
+                        "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s,",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+
+                recipients_info[email] += 1
 
-            # Pop the user that was emailed off the end of the list only once they have
+            # Remove the users that were emailed from the end of the list only once they have
             # successfully been processed.  (That way, if there were a failure that
             # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
-
+            del to_list[-len(batch):]
+            to_list.extend(reversed(unsent_recipients))
+            if retry_exception is not None:
+                raise retry_exception
+
+        send_time = time.time() - send_start_time
+        if total_recipients_successful and send_time > 0:
+            dog_stats_api.histogram(
+                'course_email.send_rate',
+                total_recipients_successful / send_time,
+                tags=[_statsd_tag(course_title)]
+            )
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
             Failed Recipients: %s/%s",
@@ -700,7 +834,7 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        sender.close()
 
 
 def _get_current_task():
@@ -189,6 +189,36 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def test_compiled_templates(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._add_xss_fields(self._get_sample_html_context())
+        recipient_context = {key: context.pop(key) for key in ('name', 'email', 'user_id', 'course_id')}
+        body = "Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%."
+        html_template = template.compile_htmltext(body, context)
+        plain_template = template.compile_plaintext(body, context)
+
+        full_context = dict(context, **recipient_context)
+        self.assertEqual(
+            html_template.render(recipient_context),
+            template.render_htmltext(body, dict(full_context))
+        )
+        self.assertEqual(
+            plain_template.render(recipient_context),
+            template.render_plaintext(body, dict(full_context))
+        )
+        # Escaping the context for the HTML message doesn't affect the plaintext message.
+        self.assertIn(context['course_title'], plain_template.render(recipient_context))
+
+    def test_compiled_template_per_recipient(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._get_sample_plain_context()
+        del context['email']
+        compiled = template.compile_plaintext("Dear %%USER_FULLNAME%%.", context)
+        for name, email in (("First Learner", "first@test.com"), ("Second Learner", "second@test.com")):
+            message = compiled.render({'name': name, 'email': email, 'user_id': 1, 'course_id': 'course-v1:a+b+c'})
+            self.assertIn("Dear {}.".format(name), message)
+            self.assertIn("at address {} because".format(email), message)
+
 
 @attr(shard=1)
 class CourseAuthorizationTest(TestCase):
@@ -29,6 +29,7 @@ from celery.states import SUCCESS, FAILURE  # pylint: disable=no-name-in-module,
 
 from django.conf import settings
 from django.core.management import call_command
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.factories import CourseFactory
 
@@ -200,6 +201,46 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
             get_conn.return_value.send_messages.side_effect = cycle([None])
             self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
 
+    @override_settings(BULK_EMAIL_SEND_CONNECTIONS=4)
+    def test_successful_over_several_connections(self):
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        self.assertEqual(get_conn.call_count, 4)
+        self.assertEqual(len(get_conn.return_value.send_messages.call_args_list), num_emails)
+        self.assertEqual(get_conn.return_value.close.call_count, 4)
+
+    @override_settings(BULK_EMAIL_SEND_CONNECTIONS=4)
+    def test_retry_over_several_connections(self):
+        num_emails = 8
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            # Every other email fails due to disconnection, and only those are sent again.
+            exception = SMTPServerDisconnected(425, "Disconnecting")
+            get_conn.return_value.send_messages.side_effect = cycle([exception, None])
+            self._test_run_with_task(
+                send_bulk_course_email, 'emailed', num_emails, num_emails, retried_withmax=5
+            )
+        # Half of each batch of four emails fails, and is retried in the next batch.
+        self.assertEqual(len(get_conn.return_value.send_messages.call_args_list), num_emails + 8)
+
+    @override_settings(BULK_EMAIL_MAX_SENDS_PER_SECOND=1)
+    def test_send_rate_limit(self):
+        num_emails = 2
+        # We also send email to the instructor:
+        self._create_students(num_emails - 1)
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            with patch('bulk_email.tasks.sleep') as mock_sleep:
+                self._test_run_with_task(send_bulk_course_email, 'emailed', num_emails, num_emails)
+        # The second email waited for its turn.
+        self.assertEqual(mock_sleep.call_count, 1)
+        self.assertLessEqual(mock_sleep.call_args[0][0], 1)
+
     def test_successful_twice(self):
         # Select number of emails to fit into a single subtask.
         num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
@@ -12,10 +12,14 @@ Note: The access control logic in this file does NOT check for enrollment in
 """
 from datetime import datetime
 import logging
+import time
 import pytz
 
+import crum
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.timezone import UTC
 
 from opaque_keys.edx.keys import CourseKey, UsageKey
@@ -29,6 +33,7 @@ from xmodule.course_module import (
     CATALOG_VISIBILITY_ABOUT,
 )
 from xmodule.error_module import ErrorDescriptor
+from xmodule.modulestore.django import SignalHandler
 from xmodule.x_module import XModule
 from xmodule.split_test_module import get_split_user_partitions
 from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPartitionGroupError
@@ -36,8 +41,11 @@ from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPa
 from openedx.core.djangoapps.external_auth.models import ExternalAuthMap
 from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.course_groups.models import CohortMembership
+import newrelic_custom_metrics
+import request_cache
 from student import auth
-from student.models import CourseEnrollmentAllowed
+from student.models import CourseAccessRole, CourseEnrollment, CourseEnrollmentAllowed
 from student.roles import (
     CourseBetaTesterRole,
     CourseCcxCoachRole,
@@ -66,10 +74,13 @@ from courseware.access_utils import (
 )
 
 from lms.djangoapps.ccx.custom_exception import CCXLocatorValidationException
-from lms.djangoapps.ccx.models import CustomCourseForEdX
+from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
 
+# Name of the request cache in which has_access memoizes its responses.
+ACCESS_CACHE_NAME = 'courseware.access.has_access'
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -129,11 +140,36 @@ def has_access(user, action, obj, course_key=None):
 
     Returns an AccessResponse object.  It is up to the caller to actually
     deny access in a way that makes sense in context.
+
+    Within a request, responses are memoized by user, action and the key of
+    obj, see `clear_access_cache`.
     """
     # Just in case user is passed in as None, make them anonymous
     if not user:
         user = AnonymousUser()
 
+    cache_key = _access_cache_key(user, action, obj, course_key)
+    if cache_key is None:
+        return _has_access(user, action, obj, course_key)
+
+    access_cache = request_cache.get_cache(ACCESS_CACHE_NAME)
+    if cache_key in access_cache:
+        response, elapsed = access_cache[cache_key]
+        newrelic_custom_metrics.increment('courseware.has_access.cache_hits')
+        newrelic_custom_metrics.accumulate('courseware.has_access.time_saved', elapsed)
+        return response
+
+    start_time = time.time()
+    response = _has_access(user, action, obj, course_key)
+    access_cache[cache_key] = (response, time.time() - start_time)
+    newrelic_custom_metrics.increment('courseware.has_access.cache_misses')
+    return response
+
+
+def _has_access(user, action, obj, course_key):
+    """
+    Check whether a user has the access to do action on obj, see has_access.
+    """
     if in_preview_mode():
         if not bool(has_staff_access_to_preview_mode(user=user, obj=obj, course_key=course_key)):
             return ACCESS_DENIED
@@ -171,6 +207,74 @@ def has_access(user, action, obj, course_key=None):
                     .format(type(obj)))
 
 
+# ================ Memoization ===========================================
+
+# The models whose changes can change what has_access responds: roles,
+# invitations, enrollments and cohorts, which can be used by group access,
+# and CCXs, their coaches and their schedules.
+ACCESS_MODELS = (
+    CourseAccessRole,
+    CourseEnrollment,
+    CourseEnrollmentAllowed,
+    CohortMembership,
+    CustomCourseForEdX,
+    CcxFieldOverride,
+)
+
+
+def clear_access_cache():
+    """
+    Forgets the responses memoized by has_access during the current request.
+
+    It's called whenever one of the ACCESS_MODELS is saved or deleted, and
+    whenever a course is published, as its dates and visibility may have
+    changed.
+    """
+    request_cache.get_cache(ACCESS_CACHE_NAME).clear()
+
+
+@receiver([post_save, post_delete])
+def _clear_access_cache_on_change(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the memoized responses when the data they depend on changes.
+    """
+    if sender in ACCESS_MODELS:
+        clear_access_cache()
+
+
+@receiver(SignalHandler.course_published)
+def _clear_access_cache_on_course_published(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Forgets the memoized responses when a course is published.
+    """
+    clear_access_cache()
+
+
+def _access_cache_key(user, action, obj, course_key):
+    """
+    Returns the key of the memoized response of has_access, or None if the
+    response shouldn't be memoized.
+
+    Responses are only memoized during requests, as the request cache is
+    cleared after each request, and not for users who are masquerading, as
+    they can change their masquerade settings in the middle of a request.
+    """
+    if not getattr(settings, 'COURSEWARE_ACCESS_REQUEST_CACHE', False):
+        return None
+    if getattr(user, 'masquerade_settings', None) or crum.get_current_request() is None:
+        return None
+
+    if isinstance(obj, (CourseDescriptor, CourseOverview)):
+        obj_key = obj.id
+    elif isinstance(obj, (XModule, XBlock)):
+        obj_key = obj.location
+    elif isinstance(obj, (CourseKey, UsageKey, basestring)):
+        obj_key = obj
+    else:
+        return None
+    return (user.id, action, type(obj), obj_key, course_key)
+
+
 # ================ Implementation helpers ================================
 
 def has_staff_access_to_preview_mode(user, obj, course_key=None):
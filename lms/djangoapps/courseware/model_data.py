@@ -37,6 +37,7 @@ from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from contracts import contract, new_contract
 
 from django.db import DatabaseError
+from django.db.models import Q
 
 from xblock.runtime import KeyValueStore
 from xblock.exceptions import KeyValueMultiSaveError, InvalidScopeError
@@ -989,6 +990,78 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients, keyed by user id, with pre-fetched data for
+        the given users and locations, using a single query.
+        """
+        clients = {}
+        for user_id in user_ids:
+            client = cls(course_id, user_id)
+            client._has_fetched = True  # pylint: disable=protected-access
+            clients[user_id] = client
+
+        for user_id, scores in iter_scores_for_users(course_id, clients.keys(), scorable_locations):
+            clients[user_id]._locations_to_scores = scores  # pylint: disable=protected-access
+        return clients
+
+
+def iter_scores_for_users(course_key, user_ids, block_keys, page_size=1000):
+    """
+    Reads the StudentModule scores of the given users for the given blocks
+    in a course, `page_size` rows at a time, and yields a
+    (user_id, {usage_key: score}) tuple per user, ordered by user id.
+
+    Scores are ScoresClient.Score tuples.  Users without any StudentModule
+    for the given blocks are not yielded.
+
+    Rows are paginated on (student_id, id) rather than with offsets, so that
+    each page is read with the same index seek, however many users are read.
+    """
+    user_ids = list(user_ids)
+    block_keys = set(block_keys)
+    if not user_ids or not block_keys:
+        return
+
+    fields = ['id', 'student_id', 'module_state_key', 'grade', 'max_grade']
+    modules_qset = StudentModule.objects.filter(
+        course_id=course_key,
+        student_id__in=user_ids,
+        module_state_key__in=block_keys,
+    ).order_by('student_id', 'id')
+
+    # Locations in StudentModule don't necessarily have course key info
+    # attached to them (since old mongo identifiers don't include runs), so
+    # they are mapped into the course, once per distinct location.
+    usage_keys = {}
+    current_user_id, scores = None, {}
+    last_row = None
+    while True:
+        page_qset = modules_qset
+        if last_row is not None:
+            last_id, last_user_id = last_row[:2]
+            page_qset = page_qset.filter(Q(student_id__gt=last_user_id) | Q(student_id=last_user_id, id__gt=last_id))
+        rows = list(page_qset.values_list(*fields)[:page_size])
+
+        for row in rows:
+            user_id, location, correct, total = row[1:5]
+            if user_id != current_user_id:
+                if scores:
+                    yield current_user_id, scores
+                current_user_id, scores = user_id, {}
+            usage_key = usage_keys.get(location)
+            if usage_key is None:
+                usage_key = usage_keys[location] = UsageKey.from_string(location).map_into_course(course_key)
+            scores[usage_key] = ScoresClient.Score(correct, total)
+
+        if len(rows) < page_size:
+            break
+        last_row = rows[-1]
+
+    if scores:
+        yield current_user_id, scores
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
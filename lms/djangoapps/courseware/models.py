@@ -199,6 +199,37 @@ class BaseStudentModuleHistory(models.Model):
 
         return history_entries
 
+    @staticmethod
+    def save_history_in_bulk(student_modules):
+        """
+        Creates the history entries that saving each of the given StudentModules
+        creates, with one insert per history table.  StudentModules that are
+        written in bulk don't send the post_save signal that creates them.
+        """
+        history_modules = [
+            student_module for student_module in student_modules
+            if student_module.module_type in BaseStudentModuleHistory.HISTORY_SAVING_TYPES
+        ]
+        if not history_modules:
+            return
+
+        if settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
+            history_class = coursewarehistoryextended.models.StudentModuleHistoryExtended
+        else:
+            history_class = StudentModuleHistory
+
+        history_class.objects.bulk_create([
+            history_class(
+                student_module=student_module,
+                version=None,
+                created=student_module.modified,
+                state=student_module.state,
+                grade=student_module.grade,
+                max_grade=student_module.max_grade,
+            )
+            for student_module in history_modules
+        ])
+
 
 class StudentModuleHistory(BaseStudentModuleHistory):
     """Keeps a complete history of state changes for a given XModule for a given
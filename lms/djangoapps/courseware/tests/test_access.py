@@ -7,11 +7,13 @@ import ddt
 import itertools
 import pytz
 
+import crum
 from django.contrib.auth.models import User
 from ccx_keys.locator import CCXLocator
 from django.test.client import RequestFactory
 from django.core.urlresolvers import reverse
 from django.test import TestCase
+from django.test.utils import override_settings
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
@@ -44,6 +46,7 @@ from xmodule.course_module import (
     CATALOG_VISIBILITY_NONE,
 )
 from xmodule.error_module import ErrorDescriptor
+from xmodule.modulestore.django import SignalHandler
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import (
     ModuleStoreTestCase,
@@ -60,6 +63,8 @@ from util.milestones_helpers import (
 from milestones.tests.utils import MilestonesTestCaseMixin
 
 from lms.djangoapps.ccx.models import CustomCourseForEdX
+from newrelic_custom_metrics.middleware import NewRelicCustomMetrics
+from openedx.core.djangolib.testing.utils import get_mock_request
 
 # pylint: disable=protected-access
 
@@ -800,3 +805,71 @@ class CourseOverviewAccessTestCase(ModuleStoreTestCase):
         course_overview = CourseOverview.get_from_id(course.id)
         with self.assertNumQueries(num_queries):
             bool(access.has_access(user, action, course_overview, course_key=course.id))
+
+
+@attr(shard=3)
+@patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+class AccessCacheTestCase(ModuleStoreTestCase):
+    """
+    Tests the memoization of has_access responses during a request.
+    """
+    TOMORROW = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
+    YESTERDAY = datetime.datetime.now(pytz.utc) - datetime.timedelta(days=1)
+
+    def setUp(self):
+        super(AccessCacheTestCase, self).setUp()
+        self.course = CourseFactory.create(start=self.TOMORROW)
+        self.student = UserFactory()
+        get_mock_request(self.student)
+        self.addCleanup(crum.set_current_request, None)
+
+    def test_memoized_during_request(self):
+        self.assertFalse(access.has_access(self.student, 'load', self.course))
+        self.course.start = self.YESTERDAY
+
+        self.assertFalse(access.has_access(self.student, 'load', self.course))
+
+        access.clear_access_cache()
+        self.assertTrue(access.has_access(self.student, 'load', self.course))
+
+        metrics = NewRelicCustomMetrics._get_metrics_cache()
+        self.assertEqual(metrics['courseware.has_access.cache_hits'], 1)
+        self.assertEqual(metrics['courseware.has_access.cache_misses'], 2)
+        self.assertIn('courseware.has_access.time_saved', metrics)
+
+    @override_settings(COURSEWARE_ACCESS_REQUEST_CACHE=False)
+    def test_not_memoized_when_disabled(self):
+        self.assertFalse(access.has_access(self.student, 'load', self.course))
+        self.course.start = self.YESTERDAY
+        self.assertTrue(access.has_access(self.student, 'load', self.course))
+
+    def test_not_memoized_outside_request(self):
+        crum.set_current_request(None)
+        self.assertFalse(access.has_access(self.student, 'load', self.course))
+        self.course.start = self.YESTERDAY
+        self.assertTrue(access.has_access(self.student, 'load', self.course))
+
+    def test_cleared_when_roles_change(self):
+        self.assertFalse(access.has_access(self.student, 'staff', self.course))
+        CourseStaffRole(self.course.id).add_users(self.student)
+        self.assertTrue(access.has_access(self.student, 'staff', self.course))
+        CourseStaffRole(self.course.id).remove_users(self.student)
+        self.assertFalse(access.has_access(self.student, 'staff', self.course))
+
+    def test_cleared_when_invited(self):
+        course = CourseFactory.create(enrollment_start=self.TOMORROW, enrollment_end=self.TOMORROW)
+        self.assertFalse(access.has_access(self.student, 'enroll', course))
+        CourseEnrollmentAllowedFactory(email=self.student.email, course_id=course.id)
+        self.assertTrue(access.has_access(self.student, 'enroll', course))
+
+    def test_cleared_when_course_published(self):
+        self.assertFalse(access.has_access(self.student, 'load', self.course))
+        self.course.start = self.YESTERDAY
+        SignalHandler.course_published.send(sender=None, course_key=self.course.id)
+        self.assertTrue(access.has_access(self.student, 'load', self.course))
+
+    def test_not_memoized_when_masquerading(self):
+        self.assertFalse(access.has_access(self.student, 'load', self.course))
+        self.student.masquerade_settings = {self.course.id: CourseMasquerade(self.course.id)}
+        self.course.start = self.YESTERDAY
+        self.assertTrue(access.has_access(self.student, 'load', self.course))
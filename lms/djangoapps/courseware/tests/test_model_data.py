@@ -6,7 +6,9 @@ from mock import Mock, patch
 from nose.plugins.attrib import attr
 from functools import partial
 
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from courseware.model_data import (
+    DjangoKeyValueStore, FieldDataCache, InvalidScopeError, ScoresClient, iter_scores_for_users
+)
 from courseware.models import StudentModule, XModuleUserStateSummaryField
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
@@ -426,3 +428,60 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+@attr(shard=1)
+class TestIterScoresForUsers(TestCase):
+    """Tests for iter_scores_for_users"""
+    def setUp(self):
+        super(TestIterScoresForUsers, self).setUp()
+        self.users = [UserFactory.create() for __ in range(3)]
+        self.blocks = [location('problem_{}'.format(index)) for index in range(3)]
+        for user_index, user in enumerate(self.users[:2]):
+            for block_index, block in enumerate(self.blocks):
+                StudentModuleFactory.create(
+                    student=user,
+                    module_state_key=block,
+                    grade=user_index + block_index,
+                    max_grade=5,
+                )
+
+    def expected_scores(self, user_index, blocks):
+        """Returns the scores created in setUp for the given user and blocks."""
+        return {
+            block: ScoresClient.Score(user_index + self.blocks.index(block), 5)
+            for block in blocks
+        }
+
+    def test_scores(self):
+        user_ids = [user.id for user in self.users]
+        with self.assertNumQueries(1):
+            results = list(iter_scores_for_users(course_id, user_ids, self.blocks))
+        self.assertEqual(results, [
+            (self.users[0].id, self.expected_scores(0, self.blocks)),
+            (self.users[1].id, self.expected_scores(1, self.blocks)),
+        ])
+
+    def test_pagination(self):
+        user_ids = [user.id for user in self.users]
+        with self.assertNumQueries(4):
+            results = list(iter_scores_for_users(course_id, user_ids, self.blocks, page_size=2))
+        self.assertEqual(results, [
+            (self.users[0].id, self.expected_scores(0, self.blocks)),
+            (self.users[1].id, self.expected_scores(1, self.blocks)),
+        ])
+
+    def test_filters_users_and_blocks(self):
+        results = list(iter_scores_for_users(course_id, [self.users[1].id], self.blocks[1:]))
+        self.assertEqual(results, [(self.users[1].id, self.expected_scores(1, self.blocks[1:]))])
+
+    def test_no_users(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(list(iter_scores_for_users(course_id, [], self.blocks)), [])
+
+    def test_create_for_users(self):
+        user_ids = [user.id for user in self.users]
+        with self.assertNumQueries(1):
+            clients = ScoresClient.create_for_users(course_id, user_ids, self.blocks)
+        self.assertEqual(clients[self.users[1].id].get(self.blocks[2]), ScoresClient.Score(3, 5))
+        self.assertIsNone(clients[self.users[2].id].get(self.blocks[0]))
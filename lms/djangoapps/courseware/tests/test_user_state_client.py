@@ -6,9 +6,13 @@ defined in edx_user_state_client.
 from collections import defaultdict
 from unittest import skip
 
+from django.db.utils import IntegrityError
 from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
 
 from edx_user_state_client.tests import UserStateClientTestBase
+from courseware.models import StudentModule
 from courseware.user_state_client import DjangoXBlockUserStateClient
 from courseware.tests.factories import UserFactory
 
@@ -67,3 +71,52 @@ class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
     @skip("Not supported by DjangoXBlockUserStateClient")
     def test_iter_course_many_users(self):
         pass
+
+
+class TestDjangoUserStateClientBulkWrites(TestCase):
+    """
+    Tests of the bulk write path of DjangoXBlockUserStateClient.set_many.
+    """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestDjangoUserStateClientBulkWrites, self).setUp()
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        course_key = CourseLocator('org', 'course', 'run')
+        self.block_keys = [course_key.make_usage_key('problem', 'problem_{}'.format(idx)) for idx in range(3)]
+
+    def _get_state(self, block_key):
+        """
+        Returns the stored state of the given block.
+        """
+        return self.client.get(self.user.username, block_key).state
+
+    def test_set_many(self):
+        self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+        with patch.object(StudentModule.objects, 'get_or_create') as mock_get_or_create:
+            self.client.set_many(self.user.username, {
+                self.block_keys[0]: {'b': 2},
+                self.block_keys[1]: {'a': 3},
+                self.block_keys[2]: {'a': 4},
+            })
+        self.assertFalse(mock_get_or_create.called)
+
+        self.assertEqual(self._get_state(self.block_keys[0]), {'a': 1, 'b': 2})
+        self.assertEqual(self._get_state(self.block_keys[1]), {'a': 3})
+        self.assertEqual(self._get_state(self.block_keys[2]), {'a': 4})
+
+        # history entries are created for the updated and the new rows.
+        self.assertEqual(len(list(self.client.get_history(self.user.username, self.block_keys[0]))), 2)
+        self.assertEqual(len(list(self.client.get_history(self.user.username, self.block_keys[1]))), 1)
+
+    def test_set_many_integrity_error(self):
+        with patch.object(DjangoXBlockUserStateClient, '_bulk_set_many', side_effect=IntegrityError):
+            self.client.set_many(self.user.username, {
+                self.block_keys[0]: {'a': 1},
+                self.block_keys[1]: {'a': 2},
+            })
+
+        self.assertEqual(self._get_state(self.block_keys[0]), {'a': 1})
+        self.assertEqual(self._get_state(self.block_keys[1]), {'a': 2})
@@ -16,9 +16,11 @@ import newrelic_custom_metrics
 import dogstats_wrapper as dog_stats_api
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Case, TextField, Value, When
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from xblock.fields import Scope
-from courseware.models import StudentModule, BaseStudentModuleHistory
+from courseware.models import StudentModule, BaseStudentModuleHistory, chunks
 from edx_user_state_client.interface import XBlockUserStateClient, XBlockUserState
 
 log = logging.getLogger(__name__)
@@ -251,7 +253,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         # count how many times this function gets called
         self._nr_stat_increment('set_many', 'calls')
 
-        # We do a find_or_create for every block (rather than re-using field objects
+        # We re-read the stored state of every block (rather than re-using field objects
         # that were queried in get_many) so that if the score has
         # been changed by some other piece of the code, we don't overwrite
         # that score.
@@ -267,46 +269,28 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
-        for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
-
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
-                else:
-                    current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
-                current_state.update(state)
-                num_fields_after = len(current_state)
-                student_module.state = json.dumps(current_state)
-                try:
-                    with transaction.atomic():
-                        # Updating the object - force_update guarantees no INSERT will occur.
-                        student_module.save(force_update=True)
-                except IntegrityError:
-                    # The UPDATE above failed. Log information - but ignore the error.
-                    # See https://openedx.atlassian.net/browse/TNL-5365
-                    log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
-                        user, repr(unicode(usage_key.course_key)), usage_key
-                    ))
-                    log.warning("set_many: All {} block keys: {}".format(
-                        len(block_keys_to_state), block_keys_to_state.keys()
-                    ))
-
+        block_results = None
+        if len(block_keys_to_state) > 1:
+            try:
+                with transaction.atomic():
+                    block_results = self._bulk_set_many(user, username, block_keys_to_state)
+            except IntegrityError:
+                # Some of the rows were created by another process in the meantime, so
+                # fall back to writing the rows one at a time.
+                self._ddog_increment(evt_time, 'set_many.bulk_fallback')
+                log.info("set_many: IntegrityError in bulk write for student %s; writing rows one at a time", user)
+
+        if block_results is None:
+            block_results = [
+                self._set_one(user, usage_key, state, block_keys_to_state)
+                for usage_key, state in block_keys_to_state.items()
+            ]
+
+        for usage_key, state, state_length, created, num_fields_before, num_fields_after in block_results:
             # DataDog and New Relic reporting
 
             # record the size of state modifications
-            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
+            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', state_length)
 
             # Record whether a state row has been created or updated.
             if created:
@@ -334,6 +318,123 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'set_many.response_time', duration)
         self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def _set_one(self, user, usage_key, state, block_keys_to_state):
+        """
+        Overlays the given state over the stored state of a single block, creating
+        its row if needed.
+
+        Returns a tuple of (usage_key, state, length of the stored state, whether
+        the row was created, number of fields before, number of fields after).
+        """
+        student_module, created = StudentModule.objects.get_or_create(
+            student=user,
+            course_id=usage_key.course_key,
+            module_state_key=usage_key,
+            defaults={
+                'state': json.dumps(state),
+                'module_type': usage_key.block_type,
+            },
+        )
+
+        num_fields_before = num_fields_after = len(state)
+        if not created:
+            if student_module.state is None:
+                current_state = {}
+            else:
+                current_state = json.loads(student_module.state)
+            num_fields_before = len(current_state)
+            current_state.update(state)
+            num_fields_after = len(current_state)
+            student_module.state = json.dumps(current_state)
+            try:
+                with transaction.atomic():
+                    # Updating the object - force_update guarantees no INSERT will occur.
+                    student_module.save(force_update=True)
+            except IntegrityError:
+                # The UPDATE above failed. Log information - but ignore the error.
+                # See https://openedx.atlassian.net/browse/TNL-5365
+                log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
+                    user, repr(unicode(usage_key.course_key)), usage_key
+                ))
+                log.warning("set_many: All {} block keys: {}".format(
+                    len(block_keys_to_state), block_keys_to_state.keys()
+                ))
+
+        return usage_key, state, len(student_module.state), created, num_fields_before, num_fields_after
+
+    def _bulk_set_many(self, user, username, block_keys_to_state):
+        """
+        Overlays the given states over the stored states of many blocks, reading
+        the existing rows in one query, inserting the new rows in one query,
+        updating the existing rows in batches, and inserting their history
+        entries in bulk (bulk writes don't send post_save signals).
+
+        Must be called in a transaction; raises IntegrityError if some of the rows
+        were created concurrently.
+
+        Returns a list of tuples, as returned by :meth:`_set_one`.
+        """
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(username, block_keys_to_state.keys())
+        }
+        now = timezone.now()
+        new_modules = []
+        updated_modules = []
+        block_results = []
+
+        for usage_key, state in block_keys_to_state.iteritems():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                student_module = StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                )
+                new_modules.append(student_module)
+                created = True
+                num_fields_before = num_fields_after = len(state)
+            else:
+                if student_module.state is None:
+                    current_state = {}
+                else:
+                    current_state = json.loads(student_module.state)
+                num_fields_before = len(current_state)
+                current_state.update(state)
+                num_fields_after = len(current_state)
+                student_module.state = json.dumps(current_state)
+                student_module.modified = now
+                updated_modules.append(student_module)
+                created = False
+
+            block_results.append(
+                (usage_key, state, len(student_module.state), created, num_fields_before, num_fields_after)
+            )
+
+        if new_modules:
+            StudentModule.objects.bulk_create(new_modules)
+            # bulk_create doesn't set the ids of the new rows, which their history entries need.
+            new_modules = [
+                student_module
+                for student_module, __ in self._get_student_modules(
+                    username, [student_module.module_state_key for student_module in new_modules]
+                )
+            ]
+
+        for batch in chunks(updated_modules, 500):
+            StudentModule.objects.filter(id__in=[student_module.id for student_module in batch]).update(
+                state=Case(
+                    *[When(id=student_module.id, then=Value(student_module.state)) for student_module in batch],
+                    output_field=TextField()
+                ),
+                modified=now,
+            )
+
+        BaseStudentModuleHistory.save_history_in_bulk(new_modules + updated_modules)
+        return block_results
+
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Delete the stored XBlock state for a many xblock usages.
@@ -46,7 +46,8 @@ from django_comment_client.utils import get_accessible_discussion_xblocks, is_co
 from lms.djangoapps.discussion_api.pagination import DiscussionAPIPagination
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
-from lms.lib.comment_client.utils import CommentClientRequestError
+from lms.lib.comment_client.user import User as CommentClientUser
+from lms.lib.comment_client.utils import CommentClientRequestError, fan_out
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id
 from openedx.core.lib.exceptions import CourseNotFoundError, PageNotFoundError, DiscussionNotFoundError
 
@@ -100,10 +101,14 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
             retrieve_kwargs["with_responses"] = False
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
-        cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        # The requester doesn't depend on the thread, so they are retrieved concurrently.
+        cc_thread, cc_requester = fan_out(
+            lambda: Thread(id=thread_id).retrieve(**retrieve_kwargs),
+            lambda: CommentClientUser.from_django_user(request.user).retrieve(),
+        )
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester=cc_requester)
         if (
                 not context["is_requester_privileged"] and
                 cc_thread["group_id"] and
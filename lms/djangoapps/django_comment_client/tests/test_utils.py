@@ -1,22 +1,32 @@
 # -*- coding: utf-8 -*-
 import datetime
 import json
+import threading
 import ddt
 import mock
 from mock import patch, Mock
+from requests.packages.urllib3.exceptions import ConnectTimeoutError, ReadTimeoutError
 from nose.plugins.attrib import attr
 from pytz import UTC
 from django.utils.timezone import UTC as django_utc
 
 from django.core.urlresolvers import reverse
 from django.test import TestCase, RequestFactory
+from django.test.utils import override_settings
 from edxmako import add_lookup
 
 from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 import django_comment_client.utils as utils
-from lms.lib.comment_client.utils import perform_request, CommentClientMaintenanceError
+from lms.lib.comment_client.utils import (
+    perform_request,
+    CommentClientMaintenanceError,
+    CommentClientRequestError,
+    fan_out,
+    get_forums_config,
+    get_session,
+)
 from django_comment_common.models import ForumsConfig
 
 from courseware.tests.factories import InstructorFactory
@@ -1456,3 +1466,71 @@ class ClientConfigurationTestCase(TestCase):
 
         result = perform_request('GET', 'http://www.google.com')
         self.assertEqual(result, {})
+
+
+class PooledSessionTestCase(TestCase):
+    """Tests of the pooled session and the concurrent requests to the comment service."""
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL={'ENABLED': True})
+    @patch('lms.lib.comment_client.utils.get_session')
+    def test_pooled_request(self, mock_get_session):
+        """Ensures that requests are made with the pooled session when it is enabled."""
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {'id': 1}
+        mock_get_session.return_value.request.return_value = response
+
+        self.assertEqual(perform_request('get', 'http://www.google.com'), {'id': 1})
+        self.assertEqual(mock_get_session.return_value.request.call_args[0], ('get', 'http://www.google.com'))
+
+    def test_session_is_shared(self):
+        """Ensures that the session, and so its connections, are reused."""
+        self.assertIs(get_session(), get_session())
+
+    def test_post_not_retried_after_read_error(self):
+        """Ensures that a request which may have been processed by the comments service isn't sent again."""
+        retries = get_session().get_adapter('http://localhost:4567').max_retries
+        url = '/api/v1/threads/1/comments'
+
+        # A failure to connect is retried, as the request was never sent.
+        self.assertIsNotNone(retries.increment(method='POST', url=url, error=ConnectTimeoutError()))
+
+        with self.assertRaises(ReadTimeoutError):
+            retries.increment(method='POST', url=url, error=ReadTimeoutError(None, url, 'Read timed out.'))
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL={'FAN_OUT_WORKERS': 2})
+    def test_fan_out(self):
+        """Ensures that the functions are called in other threads, with the caller's ForumsConfig."""
+        forums_config = get_forums_config()
+        calls = []
+
+        def function(value):
+            """Record the thread and ForumsConfig of the call."""
+            calls.append((threading.current_thread(), get_forums_config()))
+            return value
+
+        self.assertEqual(fan_out(lambda: function(1), lambda: function(2)), [1, 2])
+        self.assertEqual(len(calls), 2)
+        for thread, config in calls:
+            self.assertIsNot(thread, threading.current_thread())
+            self.assertEqual(config, forums_config)
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL={'FAN_OUT_WORKERS': 2})
+    def test_fan_out_error(self):
+        """Ensures that an exception raised by any of the functions is raised by fan_out."""
+        def function():
+            """Fail like a request for a missing thread."""
+            raise CommentClientRequestError('Not found', 404)
+
+        with self.assertRaises(CommentClientRequestError):
+            fan_out(lambda: 1, function)
+
+    @override_settings(COMMENTS_SERVICE_CONNECTION_POOL={'FAN_OUT_WORKERS': 0})
+    def test_fan_out_disabled(self):
+        """Ensures that the functions are called in order in the calling thread without fan-out workers."""
+        calls = []
+        self.assertEqual(
+            fan_out(lambda: calls.append(threading.current_thread()), lambda: calls.append(threading.current_thread())),
+            [None, None]
+        )
+        self.assertEqual(calls, [threading.current_thread()] * 2)
@@ -3,19 +3,26 @@ CourseGrade Class
 """
 
 from collections import defaultdict, namedtuple, OrderedDict
+from functools import partial
 from logging import getLogger
 
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
 import dogstats_wrapper as dog_stats_api
 from lazy import lazy
+from submissions.models import ScoreSummary
 
+from courseware.model_data import ScoresClient
+from courseware.models import chunks
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
 from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
+from student.models import anonymous_id_for_user
 from xmodule import block_metadata_utils
 
-from ..models import PersistentCourseGrade
+from ..models import PersistentCourseGrade, PersistentSubsectionGrade
+from ..scores import possibly_scored
 from .subsection_grade import SubsectionGradeFactory
 from ..transformer import GradesTransformer
 
@@ -27,7 +34,7 @@ class CourseGrade(object):
     """
     Course Grade class
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, bulk_grades_data=None):
         self.student = student
         self.course = course
         self.course_version = getattr(course, 'course_version', None)
@@ -35,7 +42,9 @@ class CourseGrade(object):
         self.course_structure = course_structure
         self._percent = None
         self._letter_grade = None
-        self._subsection_grade_factory = SubsectionGradeFactory(self.student, self.course, self.course_structure)
+        self._subsection_grade_factory = SubsectionGradeFactory(
+            self.student, self.course, self.course_structure, bulk_grades_data,
+        )
 
     @lazy
     def graded_subsections_by_format(self):
@@ -215,7 +224,7 @@ class CourseGrade(object):
         )
 
     @classmethod
-    def load_persisted_grade(cls, user, course, course_structure):
+    def load_persisted_grade(cls, user, course, course_structure, bulk_grades_data=None):
         """
         Initializes a CourseGrade object, filling its members with persisted values from the database.
 
@@ -223,11 +232,16 @@ class CourseGrade(object):
 
         If no persisted values are found, returns None.
         """
-        try:
-            persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
-        except PersistentCourseGrade.DoesNotExist:
-            return None
-        course_grade = CourseGrade(user, course, course_structure)
+        if bulk_grades_data is not None:
+            persistent_grade = bulk_grades_data.get_course_grade(user)
+            if persistent_grade is None:
+                return None
+        else:
+            try:
+                persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
+            except PersistentCourseGrade.DoesNotExist:
+                return None
+        course_grade = CourseGrade(user, course, course_structure, bulk_grades_data)
 
         current_grading_policy_hash = course_grade.get_grading_policy_hash(course.location, course_structure)
         if current_grading_policy_hash != persistent_grade.grading_policy_hash:
@@ -319,6 +333,88 @@ class CourseGrade(object):
         ))
 
 
+class BulkCourseGradeData(object):
+    """
+    The data needed to grade a batch of students in a course, fetched
+    with a single query per data source rather than one per student.
+    """
+    def __init__(self, course, students, collected_block_structure):
+        self.course = course
+        user_ids = [student.id for student in students]
+
+        scorable_locations = [
+            block_key for block_key in collected_block_structure if possibly_scored(block_key)
+        ]
+        self._csm_scores = ScoresClient.create_for_users(course.id, user_ids, scorable_locations)
+        self._submissions_scores = self._bulk_read_submissions_scores(course.id, students)
+
+        self._subsection_grades = None
+        self._course_grades = None
+        if PersistentGradesEnabledFlag.feature_enabled(course.id):
+            self._subsection_grades = {user_id: {} for user_id in user_ids}
+            for record in PersistentSubsectionGrade.bulk_read_grades_for_users(user_ids, course.id):
+                self._subsection_grades[record.user_id][record.full_usage_key] = record
+            self._course_grades = {
+                grade.user_id: grade
+                for grade in PersistentCourseGrade.bulk_read_course_grades(user_ids, course.id)
+            }
+
+    def get_csm_scores(self, student):
+        """
+        Returns the ScoresClient for the given student.
+        """
+        return self._csm_scores[student.id]
+
+    def get_submissions_scores(self, student):
+        """
+        Returns the scores stored by the Submissions API for the given
+        student, as returned by submissions.api.get_scores.
+        """
+        return self._submissions_scores[student.id]
+
+    def get_subsection_grades(self, student):
+        """
+        Returns the given student's persisted subsection grades keyed by
+        usage key, or None if grades are not persisted for the course.
+        """
+        if self._subsection_grades is None:
+            return None
+        return self._subsection_grades[student.id]
+
+    def get_course_grade(self, student):
+        """
+        Returns the given student's persisted course grade, or None if
+        not found.
+        """
+        if self._course_grades is None:
+            return None
+        return self._course_grades.get(student.id)
+
+    @staticmethod
+    def _bulk_read_submissions_scores(course_key, students):
+        """
+        Returns a dict of each student's id to their scores stored by the
+        Submissions API, in the format returned by
+        submissions.api.get_scores, using a single query.
+        """
+        anonymous_ids = {
+            anonymous_id_for_user(student, course_key, save=False): student.id for student in students
+        }
+        submissions_scores = {student.id: {} for student in students}
+        score_summaries = ScoreSummary.objects.filter(
+            student_item__course_id=unicode(course_key),
+            student_item__student_id__in=anonymous_ids.keys(),
+        ).select_related('latest', 'student_item')
+        for summary in score_summaries:
+            if not summary.latest.is_hidden():
+                user_id = anonymous_ids[summary.student_item.student_id]
+                submissions_scores[user_id][summary.student_item.item_id] = (
+                    summary.latest.points_earned,
+                    summary.latest.points_possible,
+                )
+        return submissions_scores
+
+
 class CourseGradeFactory(object):
     """
     Factory class to create Course Grade objects
@@ -330,18 +426,11 @@ class CourseGradeFactory(object):
         If read_only is True, doesn't save any updates to the grades.
         Raises a PermissionDenied if the user does not have course access.
         """
-        course_structure = get_course_blocks(student, course.location)
-        # if user does not have access to this course, throw an exception
-        if not self._user_has_access_to_course(course_structure):
-            raise PermissionDenied("User does not have access to this course")
-        return (
-            self._get_saved_grade(student, course, course_structure) or
-            self._compute_and_update_grade(student, course, course_structure, read_only)
-        )
+        return self._create(student, course, read_only)
 
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'err_msg'])
 
-    def iter(self, course, students):
+    def iter(self, course, students, batch_size=None):
         """
         Given a course and an iterable of students (User), yield a GradeResult
         for every student enrolled in the course.  GradeResult is a named tuple of:
@@ -350,12 +439,21 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        If batch_size is given, students are graded in batches of that size,
+        sharing the course's collected block structure and fetching each batch's
+        scores and persisted grades in bulk, rather than student by student.
         """
-        for student in students:
+        if batch_size:
+            grade_students = self._iter_batched(course, students, batch_size)
+        else:
+            grade_students = ((student, CourseGradeFactory().create) for student in students)
+
+        for student, create_course_grade in grade_students:
             with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=[u'action:{}'.format(course.id)]):
 
                 try:
-                    course_grade = CourseGradeFactory().create(student, course)
+                    course_grade = create_course_grade(student, course)
                     yield self.GradeResult(student, course_grade, "")
 
                 except Exception as exc:  # pylint: disable=broad-except
@@ -370,6 +468,42 @@ class CourseGradeFactory(object):
                     )
                     yield self.GradeResult(student, None, exc.message)
 
+    def _iter_batched(self, course, students, batch_size):
+        """
+        Yields a (student, create_course_grade) pair for each of the given
+        students, where create_course_grade creates the student's CourseGrade
+        using data fetched in bulk for the student's batch.
+
+        If the data of a batch can't be fetched in bulk, its students are
+        graded one at a time instead, so that a failed bulk query doesn't
+        abort the grading of every other student.
+        """
+        try:
+            collected_block_structure = get_course_in_cache(course.id)
+        except Exception:  # pylint: disable=broad-except
+            log.exception('Cannot collect the block structure of course %s, grading students one at a time', course.id)
+            collected_block_structure = None
+
+        for batch in chunks(students, batch_size):
+            create_course_grade = self.create
+            if collected_block_structure is not None:
+                try:
+                    bulk_grades_data = BulkCourseGradeData(course, batch, collected_block_structure)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(
+                        'Cannot fetch the grading data of %d students in course %s in bulk, grading them one at a time',
+                        len(batch),
+                        course.id,
+                    )
+                else:
+                    create_course_grade = partial(
+                        self._create,
+                        collected_block_structure=collected_block_structure,
+                        bulk_grades_data=bulk_grades_data,
+                    )
+            for student in batch:
+                yield student, create_course_grade
+
     def update(self, student, course, course_structure):
         """
         Updates the CourseGrade for this Factory's student.
@@ -386,7 +520,29 @@ class CourseGradeFactory(object):
 
         return CourseGrade.get_persisted_grade(student, course)
 
-    def _get_saved_grade(self, student, course, course_structure):
+    def _create(self, student, course, read_only=True, collected_block_structure=None, bulk_grades_data=None):
+        """
+        Returns the CourseGrade object for the given student and course,
+        optionally using an already collected block structure of the
+        course and data fetched in bulk for a batch of students.
+
+        If read_only is True, doesn't save any updates to the grades.
+        Raises a PermissionDenied if the user does not have course access.
+        """
+        course_structure = get_course_blocks(
+            student,
+            course.location,
+            collected_block_structure=collected_block_structure,
+        )
+        # if user does not have access to this course, throw an exception
+        if not self._user_has_access_to_course(course_structure):
+            raise PermissionDenied("User does not have access to this course")
+        return (
+            self._get_saved_grade(student, course, course_structure, bulk_grades_data) or
+            self._compute_and_update_grade(student, course, course_structure, read_only, bulk_grades_data)
+        )
+
+    def _get_saved_grade(self, student, course, course_structure, bulk_grades_data=None):
         """
         Returns the saved grade for the given course and student.
         """
@@ -396,16 +552,17 @@ class CourseGradeFactory(object):
         return CourseGrade.load_persisted_grade(
             student,
             course,
-            course_structure
+            course_structure,
+            bulk_grades_data,
         )
 
-    def _compute_and_update_grade(self, student, course, course_structure, read_only=False):
+    def _compute_and_update_grade(self, student, course, course_structure, read_only=False, bulk_grades_data=None):
         """
         Freshly computes and updates the grade for the student and course.
 
         If read_only is True, doesn't save any updates to the grades.
         """
-        course_grade = CourseGrade(student, course, course_structure)
+        course_grade = CourseGrade(student, course, course_structure, bulk_grades_data)
         course_grade.compute_and_update(read_only)
         return course_grade
 
@@ -203,7 +203,7 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, bulk_grades_data=None):
         self.student = student
         self.course = course
         self.course_structure = course_structure
@@ -211,6 +211,13 @@ class SubsectionGradeFactory(object):
         self._cached_subsection_grades = None
         self._unsaved_subsection_grades = []
 
+        if bulk_grades_data is not None:
+            # Use the data already fetched for a batch of students,
+            # rather than querying for this student's data.
+            self._csm_scores = bulk_grades_data.get_csm_scores(student)
+            self._submissions_scores = bulk_grades_data.get_submissions_scores(student)
+            self._cached_subsection_grades = bulk_grades_data.get_subsection_grades(student)
+
     def create(self, subsection, read_only=False):
         """
         Returns the SubsectionGrade object for the student and subsection.
@@ -74,6 +74,35 @@ class TestGradeIteration(SharedModuleStoreTestCase):
             self.assertIsNone(course_grade.letter_grade)
             self.assertEqual(course_grade.percent, 0.0)
 
+    def test_batched_iteration(self):
+        """
+        Grading students in batches yields the same results as grading
+        them one at a time.
+        """
+        expected_grades = {
+            student: course_grade.summary
+            for student, course_grade, _ in CourseGradeFactory().iter(self.course, self.students)
+        }
+        grade_results = list(CourseGradeFactory().iter(self.course, self.students, batch_size=2))
+        self.assertEqual([student for student, _, _ in grade_results], self.students)
+        for student, course_grade, err_msg in grade_results:
+            self.assertEqual(err_msg, "")
+            self.assertEqual(course_grade.summary, expected_grades[student])
+
+    @patch('lms.djangoapps.grades.new.course_grade.BulkCourseGradeData')
+    def test_batched_iteration_bulk_data_failure(self, mock_bulk_grades_data):
+        """
+        When the data of a batch can't be fetched in bulk, its students are
+        still graded, one at a time.
+        """
+        mock_bulk_grades_data.side_effect = Exception("Bulk query failed.")
+        grade_results = list(CourseGradeFactory().iter(self.course, self.students, batch_size=2))
+        self.assertEqual(mock_bulk_grades_data.call_count, 3)
+        self.assertEqual([student for student, _, _ in grade_results], self.students)
+        for _, course_grade, err_msg in grade_results:
+            self.assertEqual(err_msg, "")
+            self.assertIsNotNone(course_grade)
+
     @patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.create')
     def test_grading_exception(self, mock_course_grade):
         """Test that we correctly capture exception messages that bubble up from
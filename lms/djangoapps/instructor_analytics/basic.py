@@ -212,6 +212,14 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features):
+    """
+    Generator version of `enrolled_students_features`, which builds the
+    dictionary of each student only as it is consumed.
+    """
     include_cohort_column = 'cohort' in features
     include_team_column = 'team' in features
     include_enrollment_mode = 'enrollment_mode' in features
@@ -228,6 +236,11 @@ def enrolled_students_features(course_key, features):
     if include_team_column:
         students = students.prefetch_related('teams')
 
+    if not (include_cohort_column or include_team_column):
+        # Prefetching requires the whole queryset to be loaded at once, but
+        # otherwise there's no need to cache every student.
+        students = students.iterator()
+
     def extract_attr(student, feature):
         """Evaluate a student attribute that is ready for JSON serialization"""
         attr = getattr(student, feature)
@@ -292,7 +305,8 @@ def enrolled_students_features(course_key, features):
 
         return student_dict
 
-    return [extract_student(student, features) for student in students]
+    for student in students:
+        yield extract_student(student, features)
 
 
 def list_may_enroll(course_key, features):
@@ -309,6 +323,14 @@ def list_may_enroll(course_key, features):
     Note that result does not include students who may enroll and have
     already done so.
     """
+    return list(iter_may_enroll(course_key, features))
+
+
+def iter_may_enroll(course_key, features):
+    """
+    Generator version of `list_may_enroll`, which builds the dictionary of
+    each student only as it is consumed.
+    """
     may_enroll_and_unenrolled = CourseEnrollmentAllowed.may_enroll_and_unenrolled(course_key)
 
     def extract_student(student, features):
@@ -317,7 +339,8 @@ def list_may_enroll(course_key, features):
         """
         return dict((feature, getattr(student, feature)) for feature in features)
 
-    return [extract_student(student, features) for student in may_enroll_and_unenrolled]
+    for student in may_enroll_and_unenrolled.iterator():
+        yield extract_student(student, features)
 
 
 def get_proctored_exam_results(course_key, features):
@@ -408,24 +431,30 @@ def list_problem_responses(course_key, problem_location):
     where `state` represents a student's response to the problem
     identified by `problem_location`.
     """
+    return list(iter_problem_responses(course_key, problem_location))
+
+
+def iter_problem_responses(course_key, problem_location):
+    """
+    Generator version of `list_problem_responses`, which fetches the
+    responses from the database only as they are consumed.
+    """
     problem_key = UsageKey.from_string(problem_location)
     # Are we dealing with an "old-style" problem location?
     run = problem_key.run
     if not run:
         problem_key = course_key.make_usage_key_from_deprecated_string(problem_location)
     if problem_key.course_key != course_key:
-        return []
+        return
 
     smdat = StudentModule.objects.filter(
         course_id=course_key,
         module_state_key=problem_key
     )
-    smdat = smdat.order_by('student')
+    smdat = smdat.order_by('student').select_related('student')
 
-    return [
-        {'username': response.student.username, 'state': response.state}
-        for response in smdat
-    ]
+    for response in smdat.iterator():
+        yield {'username': response.student.username, 'state': response.state}
 
 
 def course_registration_features(features, registration_codes, csv_type):
@@ -69,20 +69,32 @@ def format_dictlist(dictlist, features):
                 ['value-2,1', 'value-2,4']]
     }
     """
+    header = features
+    datarows = [_dict_to_entry(dct, features) for dct in dictlist]
+
+    return header, datarows
 
-    def dict_to_entry(dct):
-        """ Convert dictionary to a list for a csv row """
-        relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
-        ordered = sorted(relevant_items, key=lambda (k, v): header.index(k))
-        vals = [v for (_, v) in ordered]
-        return vals
 
+def iter_dictlist(dictlist, features):
+    """
+    Like `format_dictlist`, but return the datarows as an iterator that
+    converts each dictionary only when it is consumed, so `dictlist` can
+    be a generator and is never held in memory all at once.
+    """
     header = features
-    datarows = map(dict_to_entry, dictlist)
+    datarows = (_dict_to_entry(dct, features) for dct in dictlist)
 
     return header, datarows
 
 
+def _dict_to_entry(dct, features):
+    """ Convert dictionary to a list for a csv row """
+    relevant_items = [(k, v) for (k, v) in dct.items() if k in features]
+    ordered = sorted(relevant_items, key=lambda (k, v): features.index(k))
+    vals = [v for (_, v) in ordered]
+    return vals
+
+
 def format_instances(instances, features):
     """
     Convert a list of instances into a header list and datarows list.
@@ -12,6 +12,7 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
+from tempfile import SpooledTemporaryFile
 from uuid import uuid4
 import csv
 import json
@@ -20,7 +21,7 @@ import os.path
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 
 from openedx.core.storage import get_storage
@@ -233,6 +234,9 @@ class DjangoStorageReportStore(ReportStore):
     """
     ReportStore implementation that delegates to django's storage api.
     """
+    # Size in bytes up to which CSVs are built in memory before being spooled to disk.
+    SPOOL_MAX_SIZE = 5 * 1024 * 1024
+
     def __init__(self, storage_class=None, storage_kwargs=None):
         if storage_kwargs is None:
             storage_kwargs = {}
@@ -271,12 +275,37 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        `rows` may be a generator: rows are consumed one at a time and written
+        to a temporary file, which only spills to disk once it grows beyond
+        `SPOOL_MAX_SIZE`, so the full report is never held in memory.
+        """
+        with SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE) as output_buffer:
+            csvwriter = csv.writer(output_buffer)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_buffer.seek(0)
+            self.store(course_id, filename, File(output_buffer, name=filename))
+
+    def read_rows(self, course_id, filename):
+        """
+        Return the rows of a csv file previously written with `store_rows`,
+        each row being a list of unicode strings.
+        """
+        with self.storage.open(self.path_to(course_id, filename)) as csv_file:
+            rows = list(csv.reader(csv_file))
+        return [[item.decode('utf-8') for item in row] for row in rows]
+
+    def exists(self, course_id, filename):
+        """
+        Return whether the file `filename` exists for the given `course_id`.
+        """
+        return self.storage.exists(self.path_to(course_id, filename))
+
+    def delete(self, course_id, filename):
+        """
+        Delete the file `filename` stored for the given `course_id`.
         """
-        output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        self.storage.delete(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -37,6 +37,7 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     upload_problem_responses_csv,
     upload_grades_csv,
     upload_problem_grade_report,
+    run_grade_report_shard,
     upload_students_csv,
     cohort_students_and_upload,
     upload_enrollment_report,
@@ -172,7 +173,7 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(upload_grades_csv, xmodule_instance_args)
+    task_fn = partial(upload_grades_csv, xmodule_instance_args, shard_task=generate_grade_report_shard)
     return run_main_task(entry_id, task_fn, action_name)
 
 
@@ -189,10 +190,41 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(upload_problem_grade_report, xmodule_instance_args)
+    task_fn = partial(upload_problem_grade_report, xmodule_instance_args, shard_task=generate_grade_report_shard)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def generate_grade_report_shard(
+    entry_id,  # pylint: disable=bad-continuation
+    report_name,
+    action_name,
+    shard_index,
+    user_ids,
+    start_time,
+    merge_subtask_id,
+    subtask_status_dict,
+):
+    """
+    Grade one enrollment range of a large course's grade report, and store
+    the rows as a partial CSV to be merged into the final report.
+
+    These subtasks are queued by `calculate_grades_csv` and
+    `calculate_problem_grade_report` when the course has more than
+    settings.GRADE_REPORT_STUDENTS_PER_TASK enrolled students.
+    """
+    return run_grade_report_shard(
+        entry_id,
+        report_name,
+        action_name,
+        shard_index,
+        user_ids,
+        start_time,
+        merge_subtask_id,
+        subtask_status_dict,
+    )
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
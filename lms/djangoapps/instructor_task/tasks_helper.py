@@ -8,8 +8,9 @@ import logging
 from StringIO import StringIO
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain
+from itertools import chain, count, islice
 from time import time
+from uuid import uuid4
 
 import dogstats_wrapper as dog_stats_api
 import re
@@ -47,18 +48,25 @@ from courseware.models import StudentModule
 from courseware.module_render import get_module_for_descriptor_internal
 from edxmako.shortcuts import render_to_string
 from instructor_analytics.basic import (
-    enrolled_students_features,
     get_proctored_exam_results,
-    list_may_enroll,
-    list_problem_responses
+    iter_enrolled_students_features,
+    iter_may_enroll,
+    iter_problem_responses
 )
-from instructor_analytics.csvs import format_dictlist
+from instructor_analytics.csvs import iter_dictlist
 from shoppingcart.models import (
     PaidCourseRegistration, CourseRegCodeItem, InvoiceTransaction,
     Invoice, CouponRedemption, RegistrationCodeRedemption, CourseRegistrationCode
 )
 from openassessment.data import OraAggregateData
-from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS, QUEUING
+from lms.djangoapps.instructor_task.subtasks import (
+    DuplicateTaskException,
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
@@ -654,6 +662,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            This may be any iterable of rows, including a generator, in which
+            case the rows are written to the report store as they are produced.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
     """
@@ -696,7 +706,7 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name, shard_task=None):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
@@ -705,15 +715,24 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
+    If `shard_task` is given and the course has more enrollments than
+    settings.GRADE_REPORT_STUDENTS_PER_TASK, the report is instead generated
+    by enrollment-range subtasks (see `queue_grade_report_shards`).
+
     As we start to add more CSV downloads, it will probably be worthwhile to
     make a more general CSVDoc class instead of building out the rows like we
     do here.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
     total_enrolled_students = enrolled_students.count()
+
+    if shard_task is not None and _use_grade_report_shards(total_enrolled_students):
+        return queue_grade_report_shards(
+            shard_task, 'grade_report', _entry_id, enrolled_students, total_enrolled_students, action_name
+        )
+
     task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
 
     fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Input: {task_input}'
@@ -725,6 +744,38 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
+    # Rows are graded as they are written to the report store, while any
+    # errors are collected in err_rows.
+    err_rows = []
+    rows = _grades_csv_rows(course_id, enrolled_students, task_progress, err_rows, task_info_string, action_name)
+    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+    # If there are any error rows (don't count the header), write them out as well
+    if len(err_rows) > 1:
+        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _grades_csv_rows(  # pylint: disable=too-many-statements
+        course_id, students, task_progress, err_rows, task_info_string, action_name
+):
+    """
+    Generator that grades `students` in the course, yielding the header row
+    of the grade report and then one row per successfully graded student.
+
+    Students that can't be graded are appended to `err_rows`, after its
+    header row, and `task_progress` is updated as each student is graded.
+    """
+    status_interval = 100
+    total_students = task_progress.total
+
     course = get_course_by_id(course_id)
     course_is_cohorted = is_course_cohorted(course.id)
     teams_enabled = course.teams_enabled
@@ -738,9 +789,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
     whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
+    err_rows.append(["id", "username", "error_msg"])
     current_step = {'step': 'Calculating Grades'}
 
     student_counter = 0
@@ -749,7 +798,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         task_info_string,
         action_name,
         current_step,
-        total_enrolled_students,
+        total_students,
     )
 
     graded_assignments = _graded_assignments(course_id)
@@ -759,7 +808,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             grade_header.extend(assignment_info['subsection_headers'].itervalues())
         grade_header.append(assignment_info['average_header'])
 
-    rows.append(
+    yield (
         ["Student ID", "Email", "Username", "Grade"] +
         grade_header +
         cohorts_header +
@@ -769,7 +818,8 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         certificate_info_header
     )
 
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
+    grades = CourseGradeFactory().iter(course, students, batch_size=settings.GRADE_REPORT_BATCH_SIZE)
+    for student, course_grade, err_msg in grades:
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -784,7 +834,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             action_name,
             current_step,
             student_counter,
-            total_enrolled_students
+            total_students
         )
 
         if not course_grade:
@@ -847,7 +897,7 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
         grade_results = list(chain.from_iterable(grade_results))
 
-        rows.append(
+        yield (
             [student.id, student.email, student.username, course_grade.percent] +
             grade_results + cohorts_group_name + group_configs_group_names + team_name +
             [enrollment_mode] + [verification_status] + certificate_info
@@ -859,25 +909,9 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         action_name,
         current_step,
         student_counter,
-        total_enrolled_students
+        total_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
-
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
-
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
-
 
 def _graded_assignments(course_key):
     """
@@ -936,6 +970,30 @@ def _graded_scorable_blocks_to_header(course_key):
     return scorable_blocks_map
 
 
+def _counted_rows(rows, task_progress):
+    """
+    Generator yielding `rows`, counting each row as attempted and succeeded
+    in `task_progress` as it is consumed.
+    """
+    for row in rows:
+        task_progress.attempted += 1
+        task_progress.succeeded += 1
+        yield row
+
+
+def _rows_if_not_empty(rows):
+    """
+    Returns an iterator over `rows` if there are any rows beyond the header
+    row, or None otherwise.  Only the first two rows are consumed to find
+    out, so `rows` can be a generator.
+    """
+    rows = iter(rows)
+    first_rows = list(islice(rows, 2))
+    if len(first_rows) < 2:
+        return None
+    return chain(first_rows, rows)
+
+
 def upload_problem_responses_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing
@@ -948,16 +1006,12 @@ def upload_problem_responses_csv(_xmodule_instance_args, _entry_id, course_id, t
     current_step = {'step': 'Calculating students answers to problem'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # Compute result table and format it
+    # Compute result table and format it; rows are computed as they are uploaded
     problem_location = task_input.get('problem_location')
-    student_data = list_problem_responses(course_id, problem_location)
+    student_data = iter_problem_responses(course_id, problem_location)
     features = ['username', 'state']
-    header, rows = format_dictlist(student_data, features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    header, rows = iter_dictlist(student_data, features)
+    rows = chain([header], _counted_rows(rows, task_progress))
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
@@ -967,19 +1021,57 @@ def upload_problem_responses_csv(_xmodule_instance_args, _entry_id, course_id, t
     csv_name = 'student_state_from_{}'.format(problem_location)
     upload_csv_to_report_store(rows, csv_name, course_id, start_date)
 
+    task_progress.skipped = task_progress.total - task_progress.attempted
     return task_progress.update_task_state(extra_meta=current_step)
 
 
-def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+def upload_problem_grade_report(
+        _xmodule_instance_args, _entry_id, course_id, _task_input, action_name, shard_task=None
+):
     """
     Generate a CSV containing all students' problem grades within a given
     `course_id`.
+
+    If `shard_task` is given, large courses are graded by enrollment-range
+    subtasks, as in `upload_grades_csv`.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    total_enrolled_students = enrolled_students.count()
+
+    if shard_task is not None and _use_grade_report_shards(total_enrolled_students):
+        return queue_grade_report_shards(
+            shard_task, 'problem_grade_report', _entry_id, enrolled_students, total_enrolled_students, action_name
+        )
+
+    task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
+    error_rows = []
+    rows = _problem_grade_report_rows(course_id, enrolled_students, task_progress, error_rows)
+
+    # Perform the upload if any students have been successfully graded
+    rows = _rows_if_not_empty(rows)
+    if rows is not None:
+        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
+    # If there are any error rows, write them out as well
+    if len(error_rows) > 1:
+        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+
+    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+
+def _problem_grade_report_rows(
+        course_id, students, task_progress, error_rows, _task_info_string=None, _action_name=None
+):
+    """
+    Generator that grades `students` in the course, yielding the header row
+    of the problem grade report and then one row per successfully graded
+    student.
+
+    Students that can't be graded are appended to `error_rows`, after its
+    header row, and `task_progress` is updated as each student is graded.
+    """
+    status_interval = 100
 
     # This struct encapsulates both the display names of each static item in the
     # header row as values as well as the django User field names of those items
@@ -989,12 +1081,13 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     graded_scorable_blocks = _graded_scorable_blocks_to_header(course_id)
 
     # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))]
-    error_rows = [list(header_row.values()) + ['error_msg']]
+    error_rows.append(list(header_row.values()) + ['error_msg'])
+    yield list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))
     current_step = {'step': 'Calculating Grades'}
 
     course = get_course_by_id(course_id)
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
+    grades = CourseGradeFactory().iter(course, students, batch_size=settings.GRADE_REPORT_BATCH_SIZE)
+    for student, course_grade, err_msg in grades:
         student_fields = [getattr(student, field_name) for field_name in header_row]
         task_progress.attempted += 1
 
@@ -1018,20 +1111,251 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
                 else:
                     earned_possible_values.append([u'Not Attempted', problem_score.possible])
 
-        rows.append(student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values)))
-
         task_progress.succeeded += 1
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-    # If there are any error rows, write them out as well
-    if len(error_rows) > 1:
-        upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+        yield student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values))
+
+
+# Maps the name of each grade report that can be generated in shards to the
+# function that grades a set of students and returns the report's rows.
+_GRADE_REPORT_ROW_GENERATORS = {
+    'grade_report': _grades_csv_rows,
+    'problem_grade_report': _problem_grade_report_rows,
+}
+
+
+def _use_grade_report_shards(total_num_students):
+    """
+    Returns whether a grade report over `total_num_students` students should
+    be split into enrollment-range subtasks.
+    """
+    students_per_task = settings.GRADE_REPORT_STUDENTS_PER_TASK
+    return bool(students_per_task) and total_num_students > students_per_task
 
-    return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+def _grade_report_shard_filename(task_id, csv_name, shard_index):
+    """
+    Returns the report store filename of a partial CSV written by one shard
+    of a grade report.  Parts live in a subdirectory, so they are never
+    listed as downloadable reports.
+    """
+    return u'shards/{task_id}/{csv_name}_{shard_index:05d}.csv'.format(
+        task_id=task_id,
+        csv_name=csv_name,
+        shard_index=shard_index,
+    )
+
+
+def queue_grade_report_shards(shard_task, report_name, entry_id, students, total_num_students, action_name):
+    """
+    Splits the grade report named `report_name` into subtasks that each grade
+    at most settings.GRADE_REPORT_STUDENTS_PER_TASK of `students`, in order of
+    user id.
+
+    `shard_task` is the celery task run for each shard; it is expected to call
+    `run_grade_report_shard`.  Each shard writes a partial CSV to the report
+    store, and the last shard to complete runs an additional merge subtask that
+    stitches the parts together in order.  Counts from all shards are
+    aggregated into the InstructorTask's progress as each shard completes.
+
+    Returns the task progress as stored in the InstructorTask object.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # If this task is being rerun after its shards were defined (e.g. after a
+    # loss of connection to the broker), don't queue a second set of shards.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u"Task %s has already been sharded!  InstructorTask = %s", entry.task_id, entry)
+        return json.loads(entry.task_output)
+
+    start_time = time()
+    merge_subtask_id = str(uuid4())
+    shard_indexes = count()
+
+    def _create_shard_subtask(student_items, initial_subtask_status):
+        """Creates a subtask to grade a given range of students."""
+        return shard_task.subtask(
+            (
+                entry_id,
+                report_name,
+                action_name,
+                next(shard_indexes),
+                [item['pk'] for item in student_items],
+                start_time,
+                merge_subtask_id,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_shard_subtask,
+        [students.order_by('id')],
+        [],
+        settings.GRADE_REPORT_STUDENTS_PER_TASK,
+        total_num_students,
+        final_subtask_id=merge_subtask_id,
+    )
+
+
+def run_grade_report_shard(
+    entry_id,  # pylint: disable=bad-continuation
+    report_name,
+    action_name,
+    shard_index,
+    user_ids,
+    start_time,
+    merge_subtask_id,
+    subtask_status_dict,
+):
+    """
+    Grades the students in `user_ids` for one shard of the grade report named
+    `report_name`, and stores the resulting rows as partial CSVs.
+
+    Once all shards have completed, the merge subtask identified by
+    `merge_subtask_id` combines the parts into the final report, which is
+    timestamped with the `start_time` of the sharded task.
+
+    Returns the subtask's final status as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+
+    # Make sure that this shard is known to the InstructorTask, and that no
+    # other worker is already grading it.
+    try:
+        check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+    except DuplicateTaskException:
+        # The shard was delivered again, after it completed or while another
+        # worker is grading it, which leaves its status to that worker.
+        TASK_LOG.info(
+            u'Task: %s, InstructorTask ID: %s, Shard: %s, Not grading a duplicate shard',
+            current_task_id,
+            entry_id,
+            shard_index,
+        )
+        return subtask_status_dict
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    fmt = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Shard: {shard_index}'
+    task_info_string = fmt.format(
+        task_id=current_task_id,
+        entry_id=entry_id,
+        course_id=course_id,
+        shard_index=shard_index,
+    )
+    TASK_LOG.info(u'%s, Task type: %s, Grading %s students', task_info_string, action_name, len(user_ids))
+
+    students = User.objects.filter(id__in=user_ids).order_by('id')
+    task_progress = TaskProgress(action_name, len(user_ids), time())
+    generate_rows = _GRADE_REPORT_ROW_GENERATORS[report_name]
+    try:
+        err_rows = []
+        rows = generate_rows(course_id, students, task_progress, err_rows, task_info_string, action_name)
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        # err_rows is complete once the report rows have all been written.
+        for csv_name, csv_rows in ((report_name, rows), (report_name + '_err', err_rows)):
+            filename = _grade_report_shard_filename(entry.task_id, csv_name, shard_index)
+            report_store.store_rows(course_id, filename, csv_rows)
+    except Exception:
+        TASK_LOG.exception(u'%s, Task type: %s, Shard failed unexpectedly', task_info_string, action_name)
+        # We don't know which rows made it into the report, so count all of
+        # the shard's students as having failed.
+        subtask_status.increment(failed=len(user_ids), state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        _merge_grade_report_shards_if_done(entry_id, report_name, start_time, merge_subtask_id)
+        raise
+
+    subtask_status.increment(
+        succeeded=task_progress.succeeded,
+        failed=task_progress.failed,
+        skipped=task_progress.skipped,
+        state=SUCCESS,
+    )
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+    _merge_grade_report_shards_if_done(entry_id, report_name, start_time, merge_subtask_id)
+
+    TASK_LOG.info(u'%s, Task type: %s, Shard finished with status %s', task_info_string, action_name, subtask_status)
+    return subtask_status.to_dict()
+
+
+def _merge_grade_report_shards_if_done(entry_id, report_name, start_time, merge_subtask_id):
+    """
+    Runs the merge subtask of a sharded grade report if all of the report's
+    shards have completed.  Does nothing if some shards are still running, or
+    if the merge has already been started by another shard.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    subtask_dict = json.loads(entry.subtasks)
+    num_shards = subtask_dict['total'] - 1
+    if subtask_dict['succeeded'] + subtask_dict['failed'] < num_shards:
+        return
+
+    merge_status = SubtaskStatus.from_dict(subtask_dict['status'][merge_subtask_id])
+    if merge_status.state != QUEUING:
+        return
+    try:
+        check_subtask_is_valid(entry_id, merge_subtask_id, merge_status)
+    except DuplicateTaskException:
+        # Another shard finished at the same time, and is doing the merge.
+        return
+
+    try:
+        _merge_grade_report_shards(entry, report_name, num_shards, start_time)
+    except Exception:
+        TASK_LOG.exception(u'Task %s: failed to merge shards of %s', entry.task_id, report_name)
+        merge_status.increment(state=FAILURE)
+        update_subtask_status(entry_id, merge_subtask_id, merge_status)
+        raise
+    merge_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, merge_subtask_id, merge_status)
+
+
+def _concatenated_csv_parts(report_store, course_id, filenames):
+    """
+    Generator yielding the rows of each of the CSVs `filenames` in order,
+    keeping only the header row of the first.  Only one part is held in
+    memory at a time.
+    """
+    for index, filename in enumerate(filenames):
+        part_rows = report_store.read_rows(course_id, filename)
+        for row in (part_rows if index == 0 else part_rows[1:]):
+            yield row
+
+
+def _merge_grade_report_shards(entry, report_name, num_shards, start_time):
+    """
+    Stitches the partial CSVs written by the shards of a grade report into
+    the final report (and error report), keeping the rows in shard order and
+    only the first header row.  The partial CSVs are deleted afterwards.
+    """
+    course_id = entry.course_id
+    start_date = datetime.fromtimestamp(start_time, UTC)
+    report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    for csv_name in (report_name, report_name + '_err'):
+        filenames = [
+            filename for filename in (
+                _grade_report_shard_filename(entry.task_id, csv_name, shard_index)
+                for shard_index in xrange(num_shards)
+            )
+            if report_store.exists(course_id, filename)
+        ]
+
+        # As when generating the report in a single task, only upload files
+        # that contain rows beyond the header.
+        rows = _rows_if_not_empty(_concatenated_csv_parts(report_store, course_id, filenames))
+        if rows is not None:
+            upload_csv_to_report_store(rows, csv_name, course_id, start_date)
+
+        for filename in filenames:
+            report_store.delete(course_id, filename)
 
 
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -1048,15 +1372,11 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     current_step = {'step': 'Calculating Profile Info'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # compute the student features table and format it
+    # compute the student features table and format it; rows are computed as they are uploaded
     query_features = task_input
-    student_data = enrolled_students_features(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    student_data = iter_enrolled_students_features(course_id, query_features)
+    header, rows = iter_dictlist(student_data, query_features)
+    rows = chain([header], _counted_rows(rows, task_progress))
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
@@ -1064,6 +1384,7 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     # Perform the upload
     upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
 
+    task_progress.skipped = task_progress.total - task_progress.attempted
     return task_progress.update_task_state(extra_meta=current_step)
 
 
@@ -1075,7 +1396,6 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     students_in_course = CourseEnrollment.objects.enrolled_and_dropped_out_users(course_id)
     task_progress = TaskProgress(action_name, students_in_course.count(), start_time)
 
@@ -1088,12 +1408,30 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
+    # Rows are gathered as they are written to the report store.
+    rows = _enrollment_report_rows(course_id, students_in_course, task_progress, task_info_string, action_name)
+    upload_csv_to_report_store(rows, 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS')
+
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
+
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing detailed enrollment task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+def _enrollment_report_rows(course_id, students, task_progress, task_info_string, action_name):
+    """
+    Generator yielding the header row of the detailed enrollment report,
+    followed by one row per student in `students`.  `task_progress` is
+    updated as each student's profile is gathered.
+    """
+    status_interval = 100
     header = None
     current_step = {'step': 'Gathering Profile Information'}
     enrollment_report_provider = PaidCourseEnrollmentReportProvider()
-    total_students = students_in_course.count()
+    total_students = task_progress.total
     student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, generating detailed enrollment report for total students: %s',
@@ -1103,7 +1441,7 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
         total_students
     )
 
-    for student in students_in_course:
+    for student in students.iterator():
         # Periodically update task status (this is a cache write)
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
@@ -1161,10 +1499,10 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
             for header_element in header:
                 # translate header into a localizable display string
                 display_headers.append(enrollment_report_headers.get(header_element, header_element))
-            rows.append(display_headers)
+            yield display_headers
 
-        rows.append(user_data.values() + course_enrollment_data.values() + payment_data.values())
         task_progress.succeeded += 1
+        yield user_data.values() + course_enrollment_data.values() + payment_data.values()
 
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Detailed enrollment report generated for students: %s/%s',
@@ -1175,18 +1513,6 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
         total_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
-
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS')
-
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing detailed enrollment task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
-
 
 def upload_may_enroll_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
@@ -1201,15 +1527,11 @@ def upload_may_enroll_csv(_xmodule_instance_args, _entry_id, course_id, task_inp
     current_step = {'step': 'Calculating info about students who may enroll'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # Compute result table and format it
+    # Compute result table and format it; rows are computed as they are uploaded
     query_features = task_input.get('features')
-    student_data = list_may_enroll(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    student_data = iter_may_enroll(course_id, query_features)
+    header, rows = iter_dictlist(student_data, query_features)
+    rows = chain([header], _counted_rows(rows, task_progress))
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
@@ -1217,6 +1539,7 @@ def upload_may_enroll_csv(_xmodule_instance_args, _entry_id, course_id, task_inp
     # Perform the upload
     upload_csv_to_report_store(rows, 'may_enroll_info', course_id, start_date)
 
+    task_progress.skipped = task_progress.total - task_progress.attempted
     return task_progress.update_task_state(extra_meta=current_step)
 
 
@@ -1399,21 +1722,19 @@ def upload_course_survey_report(_xmodule_instance_args, _entry_id, course_id, _t
 
     header = ["User ID", "User Name", "Email"]
     header.extend(survey_fields)
-    csv_rows = []
-
-    for user_id in user_survey_answers.keys():
-        row = []
-        row.append(user_id)
-        row.append(user_survey_answers[user_id].get('username', ''))
-        row.append(user_survey_answers[user_id].get('email', ''))
-        for survey_field in survey_fields:
-            row.append(user_survey_answers[user_id].get(survey_field, ''))
-        csv_rows.append(row)
-
-    task_progress.attempted = task_progress.succeeded = len(csv_rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
 
-    csv_rows.insert(0, header)
+    def _survey_rows():
+        """Yields the survey answers of each user as a row of the CSV."""
+        for user_id, answers in user_survey_answers.iteritems():
+            row = []
+            row.append(user_id)
+            row.append(answers.get('username', ''))
+            row.append(answers.get('email', ''))
+            for survey_field in survey_fields:
+                row.append(answers.get(survey_field, ''))
+            yield row
+
+    csv_rows = chain([header], _counted_rows(_survey_rows(), task_progress))
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
@@ -1421,6 +1742,7 @@ def upload_course_survey_report(_xmodule_instance_args, _entry_id, course_id, _t
     # Perform the upload
     upload_csv_to_report_store(csv_rows, 'course_survey_results', course_id, start_date)
 
+    task_progress.skipped = task_progress.total - task_progress.attempted
     return task_progress.update_task_state(extra_meta=current_step)
 
 
@@ -1436,15 +1758,11 @@ def upload_proctored_exam_results_report(_xmodule_instance_args, _entry_id, cour
     current_step = {'step': 'Calculating info about proctored exam results in a course'}
     task_progress.update_task_state(extra_meta=current_step)
 
-    # Compute result table and format it
+    # Compute result table and format it; rows are formatted as they are uploaded
     query_features = _task_input.get('features')
     student_data = get_proctored_exam_results(course_id, query_features)
-    header, rows = format_dictlist(student_data, query_features)
-
-    task_progress.attempted = task_progress.succeeded = len(rows)
-    task_progress.skipped = task_progress.total - task_progress.attempted
-
-    rows.insert(0, header)
+    header, rows = iter_dictlist(student_data, query_features)
+    rows = chain([header], _counted_rows(rows, task_progress))
 
     current_step = {'step': 'Uploading CSV'}
     task_progress.update_task_state(extra_meta=current_step)
@@ -1452,6 +1770,7 @@ def upload_proctored_exam_results_report(_xmodule_instance_args, _entry_id, cour
     # Perform the upload
     upload_csv_to_report_store(rows, 'proctored_exam_results_report', course_id, start_date)
 
+    task_progress.skipped = task_progress.total - task_progress.attempted
     return task_progress.update_task_state(extra_meta=current_step)
 
 
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 """
 Tests for instructor_task/models.py.
 """
@@ -49,6 +50,21 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    @patch('lms.djangoapps.instructor_task.models.DjangoStorageReportStore.SPOOL_MAX_SIZE', 16)
+    def test_store_rows_from_generator(self):
+        """
+        Test that rows can be streamed from a generator into a report that is
+        larger than the in-memory spool, and read back intact.
+        """
+        report_store = self.create_report_store()
+        rows = [[u'id', u'username']] + [[index, u'üser_{}'.format(index)] for index in range(100)]
+        report_store.store_rows(self.course_id, 'report.csv', (row for row in rows))
+
+        self.assertEqual(
+            report_store.read_rows(self.course_id, 'report.csv'),
+            [[unicode(item) for item in row] for row in rows]
+        )
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -8,10 +8,12 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 from datetime import datetime
 import urllib
+from uuid import uuid4
 
 import ddt
 from freezegun import freeze_time
@@ -19,6 +21,7 @@ from mock import Mock, patch, MagicMock
 from nose.plugins.attrib import attr
 import tempfile
 import unicodecsv
+from celery.states import SUCCESS
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
 
@@ -26,6 +29,7 @@ from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
 from certificates.models import CertificateStatuses, GeneratedCertificate
 from certificates.tests.factories import GeneratedCertificateFactory, CertificateWhitelistFactory
 from course_modes.models import CourseMode
+from courseware.model_data import iter_scores_for_users
 from courseware.tests.factories import InstructorFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
@@ -48,7 +52,9 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from lms.djangoapps.instructor_task.models import ReportStore
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.tasks import generate_grade_report_shard
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from survey.models import SurveyForm, SurveyAnswer
 from lms.djangoapps.instructor_task.tasks_helper import (
     cohort_students_and_upload,
@@ -61,6 +67,7 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     upload_exec_summary_report,
     upload_course_survey_report,
     generate_students_certificates,
+    run_grade_report_shard,
     upload_ora2_data,
     UPDATE_STATUS_FAILED,
     UPDATE_STATUS_SUCCEEDED,
@@ -361,7 +368,7 @@ class TestProblemResponsesReport(TestReportMixin, InstructorTaskCourseTestCase):
     def test_success(self):
         task_input = {'problem_location': ''}
         with patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task'):
-            with patch('lms.djangoapps.instructor_task.tasks_helper.list_problem_responses') as patched_data_source:
+            with patch('lms.djangoapps.instructor_task.tasks_helper.iter_problem_responses') as patched_data_source:
                 patched_data_source.return_value = [
                     {'username': 'user0', 'state': u'state0'},
                     {'username': 'user1', 'state': u'state1'},
@@ -647,6 +654,21 @@ class TestProblemGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
             ))
         ])
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    @override_settings(GRADE_REPORT_BATCH_SIZE=2)
+    def test_scores_read_in_batches(self, _get_current_task):
+        """
+        Verify that the StudentModule scores of a batch of students are read
+        all at once, rather than once per student.
+        """
+        self.define_option_problem(u'Problem1', parent=self.problem_section)
+        self.submit_student_answer(self.student_1.username, u'Problem1', ['Option 1'])
+        with patch('courseware.model_data.iter_scores_for_users', wraps=iter_scores_for_users) as mock_iter_scores:
+            result = upload_problem_grade_report(None, None, self.course.id, None, 'graded')
+        self.assertDictContainsSubset({'action_name': 'graded', 'attempted': 2, 'succeeded': 2, 'failed': 0}, result)
+        self.assertEqual(mock_iter_scores.call_count, 1)
+        self.assertItemsEqual(mock_iter_scores.call_args[0][1], [self.student_1.id, self.student_2.id])
+
     @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
     @patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.iter')
     @ddt.data(u'Cannot grade student', '')
@@ -674,6 +696,129 @@ class TestProblemGradeReport(TestReportMixin, InstructorTaskModuleTestCase):
         ])
 
 
+class TestGradeReportShards(TestReportMixin, InstructorTaskModuleTestCase):
+    """
+    Test that grade reports for large courses are generated in shards.
+    """
+    def setUp(self):
+        super(TestGradeReportShards, self).setUp()
+        self.initialize_course()
+        self.students = [self.create_student(u'üser_{}'.format(index)) for index in range(5)]
+        self.entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            requester=UserFactory.create(),
+            task_input='{}',
+            task_key='dummy value',
+            task_id=str(uuid4()),
+        )
+
+    def _run_sharded_report(self, upload_fcn):
+        """
+        Generate a report with `upload_fcn` in shards of two students.
+        """
+        with override_settings(GRADE_REPORT_STUDENTS_PER_TASK=2):
+            with patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task'):
+                upload_fcn(None, self.entry.id, self.course.id, None, 'graded', shard_task=generate_grade_report_shard)
+
+    def _assert_task_complete(self):
+        """
+        Verify that the progress of all shards was aggregated, and that the
+        task was completed by the merge subtask.
+        """
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset(
+            {'action_name': 'graded', 'attempted': 5, 'succeeded': 5, 'failed': 0, 'total': 5},
+            json.loads(entry.task_output),
+        )
+        subtasks = json.loads(entry.subtasks)
+        # Three shards, plus the merge subtask.
+        self.assertEqual(subtasks['total'], 4)
+        self.assertEqual(subtasks['succeeded'], 4)
+
+    def test_grade_report(self):
+        self._run_sharded_report(upload_grades_csv)
+        self._assert_task_complete()
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(len(report_store.links_for(self.course.id)), 1)
+        self.verify_rows_in_csv(
+            [
+                {u'Student ID': unicode(student.id), u'Username': student.username, u'Grade': u'0.0'}
+                for student in self.students
+            ],
+            ignore_other_columns=True,
+        )
+
+    def test_problem_grade_report(self):
+        self._run_sharded_report(upload_problem_grade_report)
+        self._assert_task_complete()
+        self.verify_rows_in_csv([
+            {
+                u'Student ID': unicode(student.id),
+                u'Email': student.email,
+                u'Username': student.username,
+                u'Grade': u'0.0',
+            }
+            for student in self.students
+        ])
+
+    def test_failed_shard(self):
+        failing_student = self.students[2]
+
+        def _grades_csv_rows(_course_id, students, task_progress, err_rows, _task_info_string, _action_name):
+            """Fails to grade the shard containing `failing_student`."""
+            students = list(students)
+            if failing_student in students:
+                raise Exception('Failed to grade')
+            err_rows.append([u'id'])
+            task_progress.attempted += len(students)
+            task_progress.succeeded += len(students)
+            return [[u'Student ID']] + [[student.id] for student in students]
+
+        with patch.dict(
+            'lms.djangoapps.instructor_task.tasks_helper._GRADE_REPORT_ROW_GENERATORS',
+            {'grade_report': _grades_csv_rows},
+        ):
+            self._run_sharded_report(upload_grades_csv)
+
+        # The shard's students are counted as failed, and the remaining shards
+        # are still merged into the report.
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 3, 'failed': 2},
+            json.loads(entry.task_output),
+        )
+        # Shards hold students two at a time, so the failed shard is the second.
+        self.verify_rows_in_csv([
+            {u'Student ID': unicode(student.id)} for student in self.students[:2] + self.students[4:]
+        ])
+
+    def test_duplicate_shard(self):
+        self._run_sharded_report(upload_grades_csv)
+        entry = InstructorTask.objects.get(pk=self.entry.id)
+        # All of the report's subtasks have completed, and any of them is
+        # rejected as a duplicate.
+        subtask_status_dict = json.loads(entry.subtasks)['status'].values()[0]
+
+        # A shard that is delivered again once it has completed isn't graded again.
+        with patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.iter') as mock_grades_iter:
+            result = run_grade_report_shard(
+                entry.id,
+                'grade_report',
+                'graded',
+                0,
+                [student.id for student in self.students[:2]],
+                datetime.now(UTC),
+                str(uuid4()),
+                subtask_status_dict,
+            )
+        self.assertEqual(result, shard_status_dict)
+        self.assertFalse(mock_grades_iter.called)
+        self.assertEqual(InstructorTask.objects.get(pk=self.entry.id).subtasks, entry.subtasks)
+
+
 @attr(shard=3)
 class TestProblemReportSplitTestContent(TestReportMixin, TestConditionalContent, InstructorTaskModuleTestCase):
     """
@@ -248,6 +248,8 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get(
     'BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS',
     BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
 )
+BULK_EMAIL_SEND_CONNECTIONS = ENV_TOKENS.get('BULK_EMAIL_SEND_CONNECTIONS', BULK_EMAIL_SEND_CONNECTIONS)
+BULK_EMAIL_MAX_SENDS_PER_SECOND = ENV_TOKENS.get('BULK_EMAIL_MAX_SENDS_PER_SECOND', BULK_EMAIL_MAX_SENDS_PER_SECOND)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -329,6 +331,7 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_CONNECTION_POOL.update(ENV_TOKENS.get('COMMENTS_SERVICE_CONNECTION_POOL', {}))
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get('ZENDESK_URL', ZENDESK_URL)
 FEEDBACK_SUBMISSION_EMAIL = ENV_TOKENS.get("FEEDBACK_SUBMISSION_EMAIL")
@@ -353,6 +356,7 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
         CODE_JAIL[name] = value
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
+SAFE_EXEC_PROCESS_CACHE_MAX_SIZE = ENV_TOKENS.get('SAFE_EXEC_PROCESS_CACHE_MAX_SIZE', SAFE_EXEC_PROCESS_CACHE_MAX_SIZE)
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
@@ -547,6 +551,14 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 # Get the MODULESTORE from auth.json, but if it doesn't exist,
 # use the one from common.py
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE', COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE
+)
+COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE', COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE
+)
+CONTENTSERVER_LOCAL_CACHE.update(ENV_TOKENS.get('CONTENTSERVER_LOCAL_CACHE', {}))
+COURSEWARE_ACCESS_REQUEST_CACHE = ENV_TOKENS.get('COURSEWARE_ACCESS_REQUEST_CACHE', COURSEWARE_ACCESS_REQUEST_CACHE)
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
@@ -624,6 +636,8 @@ VERIFY_STUDENT = AUTH_TOKENS.get("VERIFY_STUDENT", VERIFY_STUDENT)
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADE_REPORT_STUDENTS_PER_TASK = ENV_TOKENS.get('GRADE_REPORT_STUDENTS_PER_TASK', GRADE_REPORT_STUDENTS_PER_TASK)
+GRADE_REPORT_BATCH_SIZE = ENV_TOKENS.get('GRADE_REPORT_BATCH_SIZE', GRADE_REPORT_BATCH_SIZE)
 
 # financial reports
 FINANCIAL_REPORTS = ENV_TOKENS.get("FINANCIAL_REPORTS", FINANCIAL_REPORTS)
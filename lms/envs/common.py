@@ -770,6 +770,46 @@ MODULESTORE = {
     }
 }
 
+# Maximum size, in bytes of uncompressed pickled data, of the per-process
+# cache of split modulestore course structures that sits in front of the
+# 'course_structure_cache'.  Set to 0 to disable it.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 50 * 1024 * 1024
+
+# Maximum size, in bytes of pickled data, of the per-process cache of split
+# modulestore definitions that sits in front of the 'course_definition_cache',
+# if there is one.  Set to 0 to disable it.
+COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE = 20 * 1024 * 1024
+
+# Process-local cache of small course assets, in front of the 'course_assets' cache.
+CONTENTSERVER_LOCAL_CACHE = {
+    # Maximum total size, in bytes, of the cached assets.  Set to 0 to disable the cache.
+    'MAX_SIZE': 32 * 1024 * 1024,
+    # Maximum size, in bytes, of each cached asset.
+    'MAX_ITEM_SIZE': 256 * 1024,
+    # Number of seconds for which an asset is served from the cache.
+    'TTL': 60,
+    # Minimum number of seconds between checks for assets invalidated by other processes.
+    'INVALIDATION_CHECK_INTERVAL': 5,
+}
+
+# Whether courseware.access.has_access memoizes its responses for the duration of each request.
+COURSEWARE_ACCESS_REQUEST_CACHE = True
+
+# Connections to the comments service, which are shared by the threads of each process.
+COMMENTS_SERVICE_CONNECTION_POOL = {
+    # Whether requests reuse pooled, keep-alive connections.
+    'ENABLED': True,
+    # Number of hosts for which connections are pooled.
+    'POOL_CONNECTIONS': 10,
+    # Maximum number of connections kept open to each host.
+    'POOL_MAXSIZE': 10,
+    # Number of times a request is retried when it fails to connect.
+    'MAX_RETRIES': 1,
+    # Number of threads which make concurrent requests for lms.lib.comment_client.utils.fan_out.
+    # Set to 0 to make them one after the other.
+    'FAN_OUT_WORKERS': 4,
+}
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -783,8 +823,20 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Pool of warm sandboxed Pythons used by capa's safe_exec, see capa/safe_exec/README.rst.
+    'worker_pool': {
+        # How many warm sandboxed Pythons per process?  Zero disables the pool.
+        'size': 0,
+        # How many executions before a warm sandboxed Python is replaced?
+        'max_executions': 100,
+    },
 }
 
+# Maximum total size, in bytes, of the safe_exec results cached in each process,
+# in front of the shared cache.  Set to 0 to disable the process cache.
+SAFE_EXEC_PROCESS_CACHE_MAX_SIZE = 16 * 1024 * 1024
+
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
 # of them must match the course id for that course to run unsafe code.
 #
@@ -1831,6 +1883,17 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Maximum number of retries per task.
     BLOCK_STRUCTURES_TASK_MAX_RETRIES=5,
+
+    # Maximum size, in bytes of uncompressed pickled data, of the
+    # per-process cache that sits in front of the shared block
+    # structures cache.
+    BLOCK_STRUCTURES_PROCESS_CACHE_MAX_SIZE=50 * 1024 * 1024,
+
+    # Whether to cache block structure relations in a compact,
+    # array-backed representation, which is smaller to store and
+    # cheaper to hold in memory for large courses.  Only enable once
+    # all processes sharing the cache run code that supports it.
+    BLOCK_STRUCTURES_COMPACT_RELATIONS=False,
 )
 
 ################################ Bulk Email ###################################
@@ -1877,6 +1940,23 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of SMTP connections over which each bulk email task sends its
+# emails in parallel.  Tasks that were retried for rate-related reasons
+# send over a single connection.  More than one connection multiplies the
+# rate at which each worker sends email, so only raise it along with
+# BULK_EMAIL_MAX_SENDS_PER_SECOND.
+BULK_EMAIL_SEND_CONNECTIONS = 1
+
+# Maximum number of emails each worker process sends per second, across all
+# of its tasks and connections, or 0 for no limit.  The limit is enforced
+# separately by every process, so to stay within the SES sending rate, set it
+# to at most the SES maximum send rate divided by the number of worker
+# processes that might be sending bulk email at the same time (the number of
+# celery workers consuming the bulk email queues, times their concurrency).
+# For example, with a SES rate of 50 emails per second and 2 workers with a
+# concurrency of 4, use at most 6.
+BULK_EMAIL_MAX_SENDS_PER_SECOND = 0
+
 ############################# Persistent Grades ####################################
 
 # Queue to use for updating persistent grades
@@ -2434,6 +2514,14 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# Grade reports for courses with more enrolled students than this are generated
+# by subtasks that each grade at most this many students, and whose partial
+# CSVs are merged into the final report.  Set to None to always use one task.
+GRADE_REPORT_STUDENTS_PER_TASK = 2000
+
+# Number of students whose scores and grades grade reports read at once.
+GRADE_REPORT_BATCH_SIZE = 100
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-financial-reports',
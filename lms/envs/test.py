@@ -230,6 +230,20 @@ CACHES = {
     },
 }
 
+# Don't cache course structures, definitions, assets or safe_exec results per process, so that they don't leak
+# between tests.
+COURSE_STRUCTURE_PROCESS_CACHE_MAX_SIZE = 0
+COURSE_DEFINITION_PROCESS_CACHE_MAX_SIZE = 0
+CONTENTSERVER_LOCAL_CACHE = dict(CONTENTSERVER_LOCAL_CACHE, MAX_SIZE=0)
+SAFE_EXEC_PROCESS_CACHE_MAX_SIZE = 0
+
+# Don't cache enrollment counts, as tests that enable the cache create enrollments directly.
+ENROLLMENT_COUNTS_CACHE_TIMEOUT = 0
+
+# Make comments service requests with requests.request, one after the other, so that tests can mock them and
+# check their order.
+COMMENTS_SERVICE_CONNECTION_POOL = dict(COMMENTS_SERVICE_CONNECTION_POOL, ENABLED=False, FAN_OUT_WORKERS=0)
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
@@ -2,14 +2,36 @@
 from contextlib import contextmanager
 import dogstats_wrapper as dog_stats_api
 import logging
+import os
+import sys
+import threading
+from multiprocessing.pool import ThreadPool
+
+import crum
 import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 from django.conf import settings
 from time import time
 from uuid import uuid4
+from django.utils import translation
 from django.utils.translation import get_language
 
+import request_cache
+
 log = logging.getLogger(__name__)
 
+# Defaults of the COMMENTS_SERVICE_CONNECTION_POOL setting, which isn't set outside of the LMS.
+DEFAULT_CONNECTION_POOL = {
+    'ENABLED': True,
+    'POOL_CONNECTIONS': 10,
+    'POOL_MAXSIZE': 10,
+    'MAX_RETRIES': 1,
+    'FAN_OUT_WORKERS': 4,
+}
+
+FORUMS_CONFIG_CACHE_NAME = 'comment_client.forums_config'
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -33,9 +55,9 @@ def merge_dict(dic1, dic2):
 
 
 @contextmanager
-def request_timer(request_id, method, url, tags=None):
+def request_timer(request_id, method, url, tags=None, metric_name='comment_client.request.time'):
     start = time()
-    with dog_stats_api.timer('comment_client.request.time', tags=tags):
+    with dog_stats_api.timer(metric_name, tags=tags):
         yield
     end = time()
     duration = end - start
@@ -51,11 +73,143 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
-def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+def _connection_pool_setting(name):
+    """
+    Returns a setting of the pool of connections to the comments service.
+    """
+    return getattr(settings, 'COMMENTS_SERVICE_CONNECTION_POOL', {}).get(name, DEFAULT_CONNECTION_POOL[name])
+
+
+class _FanOutState(threading.local):
+    """
+    The state of the fan-out in the current thread.
+    """
+    def __init__(self):
+        super(_FanOutState, self).__init__()
+        # The ForumsConfig of the request that fanned out, in fan-out threads.
+        self.forums_config = None
+
+
+_local = _FanOutState()
+_lock = threading.Lock()
+_session = None
+_fan_out_pool = None
+_pid = None
+
+
+def _ensure_process_state():
+    """
+    Forget the session and threads inherited from the process that forked this one.
+    """
+    global _session, _fan_out_pool, _pid  # pylint: disable=global-statement
+    if _pid != os.getpid():
+        with _lock:
+            if _pid != os.getpid():
+                _session = None
+                _fan_out_pool = None
+                _pid = os.getpid()
+
+
+def get_session():
+    """
+    Returns the requests session, shared by the threads of the process,
+    whose pooled connections are reused by requests to the comments service.
+    """
+    global _session  # pylint: disable=global-statement
+    _ensure_process_state()
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                # Only failures to connect are retried: a request that fails once it has been sent, such as on a
+                # read timeout or a reset keep-alive connection, may have been processed, and isn't sent again.
+                adapter = HTTPAdapter(
+                    pool_connections=_connection_pool_setting('POOL_CONNECTIONS'),
+                    pool_maxsize=_connection_pool_setting('POOL_MAXSIZE'),
+                    max_retries=Retry(total=_connection_pool_setting('MAX_RETRIES'), read=False),
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def _get_fan_out_pool():
+    """
+    Returns the threads which make the concurrent requests of fan_out.
+    """
+    global _fan_out_pool  # pylint: disable=global-statement
+    _ensure_process_state()
+    if _fan_out_pool is None:
+        with _lock:
+            if _fan_out_pool is None:
+                _fan_out_pool = ThreadPool(_connection_pool_setting('FAN_OUT_WORKERS'))
+    return _fan_out_pool
+
+
+def get_forums_config():
+    """
+    Returns the current ForumsConfig, which is memoized for the duration of
+    the current request, and passed on to fan-out threads.
+    """
+    if _local.forums_config is not None:
+        return _local.forums_config
+
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    if crum.get_current_request() is None:
+        return ForumsConfig.current()
+    cache = request_cache.get_cache(FORUMS_CONFIG_CACHE_NAME)
+    if 'config' not in cache:
+        cache['config'] = ForumsConfig.current()
+    return cache['config']
+
+
+def fan_out(*functions):
+    """
+    Calls the functions, which take no arguments and make requests to the
+    comments service, concurrently, and returns the list of their results.
+
+    If any of the functions raises an exception, the exception of the first
+    of them is raised once they have all returned.  The functions are called
+    one after the other when FAN_OUT_WORKERS is 0, or by a function that is
+    itself being called by fan_out.
+    """
+    workers = _connection_pool_setting('FAN_OUT_WORKERS')
+    if workers < 1 or len(functions) < 2 or _local.forums_config is not None:
+        return [function() for function in functions]
+
+    forums_config = get_forums_config()
+    language = get_language()
+
+    def call(function):
+        """
+        Calls one of the functions, in a fan-out thread, with the caller's
+        ForumsConfig and language.
+        """
+        _local.forums_config = forums_config
+        try:
+            with translation.override(language):
+                return True, function()
+        except Exception:  # pylint: disable=broad-except
+            return False, sys.exc_info()
+        finally:
+            _local.forums_config = None
+
+    # The latency of the whole fan-out, next to that of each of its requests.
+    with request_timer(
+            uuid4(), 'fan_out', u'{} requests'.format(len(functions)), metric_name='comment_client.fan_out.time'
+    ):
+        results = _get_fan_out_pool().map(call, functions)
+    for succeeded, result in results:
+        if not succeeded:
+            raise result[0], result[1], result[2]
+    return [result for __, result in results]
+
+
+def perform_request(method, url, data_or_params=None, raw=False,
+                    metric_action=None, metric_tags=None, paged_results=False):
+    config = get_forums_config()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -63,9 +217,12 @@ def perform_request(method, url, data_or_params=None, raw=False,
     if metric_tags is None:
         metric_tags = []
 
+    pooled = _connection_pool_setting('ENABLED')
+
     metric_tags.append(u'method:{}'.format(method))
     if metric_action:
         metric_tags.append(u'action:{}'.format(metric_action))
+    metric_tags.append(u'pooled:{}'.format(pooled))
 
     if data_or_params is None:
         data_or_params = {}
@@ -83,7 +240,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = (get_session() if pooled else requests).request(
             method,
             url,
             data=data,
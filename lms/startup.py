@@ -19,6 +19,7 @@ from openedx.core.djangoapps.monkey_patch import (
 
 import xmodule.x_module
 import lms_xblock.runtime
+from capa.safe_exec import worker_pool, SafeExecCache
 
 from startup_configurations.validate_config import validate_lms_config
 from openedx.core.djangoapps.theming.core import enable_theming
@@ -56,6 +57,8 @@ def run():
 
     add_mimetypes()
 
+    configure_safe_exec()
+
     # Mako requires the directories to be added after the django setup.
     microsite.enable_microsites(log)
 
@@ -87,6 +90,20 @@ def run():
     validate_lms_config(settings)
 
 
+def configure_safe_exec():
+    """
+    Configure the per-process cache of capa's safe_exec results, and its pool
+    of warm sandboxed Pythons, whose workers are only started as they are needed.
+    """
+    SafeExecCache.process_cache.max_size = settings.SAFE_EXEC_PROCESS_CACHE_MAX_SIZE
+
+    pool_settings = settings.CODE_JAIL.get('worker_pool', {})
+    worker_pool.configure(
+        pool_settings.get('size', 0),
+        pool_settings.get('max_executions', worker_pool.DEFAULT_MAX_EXECUTIONS),
+    )
+
+
 def add_mimetypes():
     """
     Add extra mimetypes. Used in xblock_resource.
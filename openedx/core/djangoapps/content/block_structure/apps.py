@@ -3,6 +3,7 @@ Configuration for block_structure djangoapp
 """
 
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlockStructureConfig(AppConfig):
@@ -17,7 +18,18 @@ class BlockStructureConfig(AppConfig):
 
         * Connect signal handlers
         * Register celery tasks
+        * Configure the block structure cache
 
-        These happen at import time.  Hence the unused imports
+        The first two happen at import time.  Hence the unused imports
         """
         from . import signals, tasks  # pylint: disable=unused-variable
+        from openedx.core.lib.block_structure.cache import BlockStructureCache
+
+        BlockStructureCache.process_cache.max_size = settings.BLOCK_STRUCTURES_SETTINGS.get(
+            'BLOCK_STRUCTURES_PROCESS_CACHE_MAX_SIZE',
+            BlockStructureCache.process_cache.max_size,
+        )
+        BlockStructureCache.compact_block_relations = settings.BLOCK_STRUCTURES_SETTINGS.get(
+            'BLOCK_STRUCTURES_COMPACT_RELATIONS',
+            BlockStructureCache.compact_block_relations,
+        )
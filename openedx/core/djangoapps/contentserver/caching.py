@@ -1,11 +1,22 @@
 """
 Helper functions for caching course assets.
+
+Small assets are also kept in a process-local LRU cache, in front of the
+"course_assets" cache, so that hot assets (course logos, JS, CSS) are served
+without a round trip to the shared cache.  Local entries expire after a TTL,
+and all of them are dropped when any process invalidates an asset, which is
+broadcast through a generation counter in the shared cache.
 """
+import time
+
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 from xmodule.contentstore.content import STATIC_CONTENT_VERSION
 
+from openedx.core.lib.cache_utils import LRUCache
+
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
 try:
@@ -13,19 +24,46 @@ try:
 except InvalidCacheBackendError:
     pass
 
+LOCAL_CACHE_SETTINGS = getattr(settings, 'CONTENTSERVER_LOCAL_CACHE', {})
+
+# The process-local tier, bounded by the total length of the cached assets.
+LOCAL_CONTENT_CACHE = LRUCache(max_size=LOCAL_CACHE_SETTINGS.get('MAX_SIZE', 0))
+
+# Key, in the shared cache, of the counter that is incremented each time content is invalidated.
+INVALIDATION_GENERATION_KEY = 'contentserver.invalidation_generation'
+
+# The last invalidation generation seen by this process, and when it was last checked.
+_local_cache_state = {'generation': None, 'checked_at': 0}
+
 
 def set_cached_content(content):
     """
     Stores the given piece of content in the cache, using its location as the key.
     """
-    CONTENT_CACHE.set(unicode(content.location).encode("utf-8"), content, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.set(_location_str(content.location), content, version=STATIC_CONTENT_VERSION)
+    _set_local_content(content)
 
 
-def get_cached_content(location):
+def get_cached_content(location, digest=None):
     """
     Retrieves the given piece of content by its location if cached.
+
+    If a digest is given, a locally cached copy with a different digest is
+    considered stale and the content is retrieved from the shared cache.
     """
-    return CONTENT_CACHE.get(unicode(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
+    key = _location_str(location)
+    if _check_local_cache():
+        expires_at, content = LOCAL_CONTENT_CACHE.get(key, (0, None))
+        if content is not None:
+            is_stale = digest is not None and getattr(content, 'content_digest', None) != digest
+            if time.time() < expires_at and not is_stale:
+                return content
+            LOCAL_CONTENT_CACHE.delete(key)
+
+    content = CONTENT_CACHE.get(key, version=STATIC_CONTENT_VERSION)
+    if content is not None:
+        _set_local_content(content)
+    return content
 
 
 def del_cached_content(location):
@@ -34,16 +72,69 @@ def del_cached_content(location):
 
     It's possible that the content could have been cached without knowing the course_key,
     and so without having the run.
-    """
-    def location_str(loc):
-        """Force the location to a Unicode string."""
-        return unicode(loc).encode("utf-8")
 
-    locations = [location_str(location)]
+    Other processes are told to drop their locally cached content.
+    """
+    locations = [_location_str(location)]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(_location_str(location.replace(run=None)))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    for key in locations:
+        LOCAL_CONTENT_CACHE.delete(key)
+    _broadcast_invalidation()
+
+
+def _location_str(location):
+    """Force the location to a Unicode string."""
+    return unicode(location).encode("utf-8")
+
+
+def _set_local_content(content):
+    """
+    Stores the given content in the process-local cache, if it is small enough.
+    """
+    if not LOCAL_CONTENT_CACHE.max_size:
+        return
+    length = getattr(content, 'length', None)
+    if length is None or length > LOCAL_CACHE_SETTINGS.get('MAX_ITEM_SIZE', 0):
+        return
+    if not _check_local_cache():
+        return
+    expires_at = time.time() + LOCAL_CACHE_SETTINGS.get('TTL', 0)
+    LOCAL_CONTENT_CACHE.set(_location_str(content.location), (expires_at, content), size=max(length, 1))
+
+
+def _check_local_cache():
+    """
+    Returns whether the process-local cache is enabled.  Drops all of its
+    entries if content was invalidated since it was last checked, which is
+    at most every INVALIDATION_CHECK_INTERVAL seconds.
+    """
+    if not LOCAL_CONTENT_CACHE.max_size:
+        return False
+
+    now = time.time()
+    if now - _local_cache_state['checked_at'] >= LOCAL_CACHE_SETTINGS.get('INVALIDATION_CHECK_INTERVAL', 0):
+        generation = CONTENT_CACHE.get(INVALIDATION_GENERATION_KEY, 0)
+        if generation != _local_cache_state['generation']:
+            LOCAL_CONTENT_CACHE.clear()
+            _local_cache_state['generation'] = generation
+        _local_cache_state['checked_at'] = now
+    return True
+
+
+def _broadcast_invalidation():
+    """
+    Increments the invalidation generation in the shared cache, so that
+    all processes drop their locally cached content.
+    """
+    CONTENT_CACHE.add(INVALIDATION_GENERATION_KEY, 0, None)
+    try:
+        CONTENT_CACHE.incr(INVALIDATION_GENERATION_KEY)
+    except ValueError:
+        # The counter was evicted in the meantime; any new value will do.
+        CONTENT_CACHE.set(INVALIDATION_GENERATION_KEY, int(time.time()), None)
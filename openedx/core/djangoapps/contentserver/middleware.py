@@ -4,14 +4,17 @@ Middleware to serve assets.
 
 import logging
 import datetime
+from uuid import uuid4
+
 import newrelic.agent
 from django.http import (
     HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect,
+    StreamingHttpResponse)
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
@@ -68,7 +71,7 @@ class StaticContentServer(object):
             # if we're able to load it.
             actual_digest = None
             try:
-                content = self.load_asset_from_location(loc)
+                content = self.load_asset_from_location(loc, requested_digest)
                 actual_digest = getattr(content, "content_digest", None)
             except (ItemNotFoundError, NotFoundError):
                 return HttpResponseNotFound()
@@ -103,18 +106,27 @@ class StaticContentServer(object):
                 return HttpResponseForbidden('Unauthorized')
 
             # Figure out if the client sent us a conditional request, and let them know
-            # if this asset has changed since then.
+            # if this asset has changed since then.  If-None-Match takes precedence over
+            # If-Modified-Since, and is checked against the asset's digest, so that a
+            # CDN can revalidate an asset without pulling its body.
+            etag = get_etag(content)
             last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            if etag is not None and 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag):
+                    response = HttpResponseNotModified()
+                    self.set_caching_headers(content, response)
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
 
-            # *** File streaming within a byte range ***
+            # *** File streaming within byte ranges ***
             # If a Range is provided, parse Range attribute of the request
             # Add Content-Range in the response if Range is structurally correct
-            # Request -> Range attribute structure: "Range: bytes=first-[last]"
+            # Request -> Range attribute structure: "Range: bytes=first-[last][, first-[last]]*"
             # Response -> Content-Range attribute structure: "Content-Range: bytes first-last/totalLength"
+            # Multiple ranges are sent as a multipart/byteranges message.
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
@@ -134,43 +146,44 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, unicode(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                        )
                     else:
-                        first, last = ranges[0]
+                        ranges = coalesce_ranges(
+                            [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                        )
+                        if not ranges:
+                            log.warning(
+                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
+                            )
+                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
+                        if len(ranges) == 1:
+                            first, last = ranges[0]
+                            response = StreamingHttpResponse(content.stream_data_in_range(first, last))
                             response['Content-Range'] = 'bytes {first}-{last}/{length}'.format(
                                 first=first, last=last, length=content.length
                             )
                             response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+                            response['Content-Type'] = content.content_type
                         else:
-                            log.warning(
-                                u"Cannot satisfy ranges in Range header: %s for content: %s", header_value, unicode(loc)
-                            )
-                            return HttpResponse(status=416)  # Requested Range Not Satisfiable
+                            response = multipart_byteranges_response(content, ranges)
+                        response.status_code = 206  # Partial Content
+
+                        newrelic.agent.add_custom_parameter('contentserver.ranged', True)
 
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
+                if isinstance(content, StaticContentStream):
+                    response = StreamingHttpResponse(content.stream_data())
+                else:
+                    response = HttpResponse(content.data)
                 response['Content-Length'] = content.length
+                response['Content-Type'] = content.content_type
 
             newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
             newrelic.agent.add_custom_parameter('contentserver.content_type', content.content_type)
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
             # middleware we have in place, there's no easy way to use the built-in Django
@@ -205,6 +218,10 @@ class StaticContentServer(object):
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
 
+        etag = get_etag(content)
+        if etag is not None:
+            response['ETag'] = etag
+
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
         # caches a version of the response without CORS headers, in turn breaking XHR requests.
@@ -257,14 +274,15 @@ class StaticContentServer(object):
 
         return True
 
-    def load_asset_from_location(self, location):
+    def load_asset_from_location(self, location, digest=None):
         """
         Loads an asset based on its location, either retrieving it from a cache
-        or loading it directly from the contentstore.
+        or loading it directly from the contentstore.  If the digest of a versioned
+        asset is given, it is used to check that a locally cached copy is current.
         """
 
         # See if we can load this item from cache.
-        content = get_cached_content(location)
+        content = get_cached_content(location, digest)
         if content is None:
             # Not in cache, so just try and load it from the asset manager.
             try:
@@ -323,3 +341,85 @@ def parse_range_header(header_value, content_length):
         raise ValueError('Invalid syntax')
 
     return unit, ranges
+
+
+def get_etag(content):
+    """
+    Returns the (quoted) entity tag of the given content, based on its digest,
+    or None if it has no digest.
+    """
+    digest = getattr(content, 'content_digest', None)
+    if not digest:
+        return None
+    return '"{}"'.format(digest)
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Returns whether the value of an If-None-Match header matches the given etag,
+    using the weak comparison function.
+
+    See spec for details: https://tools.ietf.org/html/rfc7232#section-3.2
+    """
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag in ('*', etag):
+            return True
+    return False
+
+
+def coalesce_ranges(ranges):
+    """
+    Returns the given list of (first, last) byte ranges, sorted, with
+    overlapping and adjacent ranges merged.
+    """
+    coalesced = []
+    for first, last in sorted(ranges):
+        if coalesced and first <= coalesced[-1][1] + 1:
+            coalesced[-1] = (coalesced[-1][0], max(last, coalesced[-1][1]))
+        else:
+            coalesced.append((first, last))
+    return coalesced
+
+
+def multipart_byteranges_response(content, ranges):
+    """
+    Returns a streaming multipart/byteranges response containing the given
+    (first, last) byte ranges of the given content stream.
+
+    See spec for details: https://tools.ietf.org/html/rfc7233#appendix-A
+    """
+    boundary = uuid4().hex
+    part_headers = [
+        (
+            '--{boundary}\r\n'
+            'Content-Type: {content_type}\r\n'
+            'Content-Range: bytes {first}-{last}/{length}\r\n'
+            '\r\n'
+        ).format(
+            boundary=boundary, content_type=content.content_type, first=first, last=last, length=content.length,
+        ).encode('utf-8')
+        for first, last in ranges
+    ]
+    closing = '--{boundary}--\r\n'.format(boundary=boundary)
+
+    def stream_parts():
+        """
+        Yields each part's headers and data, then the closing boundary.
+        """
+        for part_header, (first, last) in zip(part_headers, ranges):
+            yield part_header
+            for chunk in content.stream_data_in_range(first, last):
+                yield chunk
+            yield '\r\n'
+        yield closing
+
+    response = StreamingHttpResponse(stream_parts())
+    response['Content-Length'] = str(
+        sum(len(part_header) + (last - first + 1) + 2 for part_header, (first, last) in zip(part_headers, ranges)) +
+        len(closing)
+    )
+    response['Content-Type'] = 'multipart/byteranges; boundary={}'.format(boundary)
+    return response
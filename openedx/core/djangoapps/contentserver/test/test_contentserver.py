@@ -66,6 +66,15 @@ def get_old_style_versioned_asset_url(asset_path):
     return asset_path
 
 
+def get_response_body(response):
+    """
+    Returns the body of the given, possibly streaming, response.
+    """
+    if response.streaming:
+        return ''.join(response.streaming_content)
+    return response.content
+
+
 @ddt.ddt
 @override_settings(CONTENTSTORE=TEST_DATA_CONTENTSTORE)
 class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
@@ -242,16 +251,95 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges message
+        containing each range.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        self.assertTrue(resp['Content-Type'].startswith('multipart/byteranges; boundary='))
+        boundary = resp['Content-Type'].split('boundary=')[1]
+
+        content = self.contentstore.find(self.unlocked_asset)
+        data = content.data
+        body = get_response_body(resp)
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+        self.assertEqual(
+            body,
+            (
+                '--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {first}-{last}/{length}\r\n\r\n'
+                '{first_part}\r\n'
+                '--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {tail}-{end}/{length}\r\n\r\n'
+                '{second_part}\r\n'
+                '--{boundary}--\r\n'
+            ).format(
+                boundary=boundary, content_type=content.content_type, length=self.length_unlocked,
+                first=first_byte, last=last_byte,
+                tail=self.length_unlocked - 100, end=self.length_unlocked - 1,
+                first_part=data[first_byte:last_byte + 1], second_part=data[-100:],
+            )
+        )
+
+    def test_range_request_overlapping_ranges(self):
+        """
+        Test that overlapping ranges are coalesced into a single range.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=10-20, 0-15')
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], 'bytes 0-20/{length}'.format(length=self.length_unlocked))
+        self.assertEqual(get_response_body(resp), self.contentstore.find(self.unlocked_asset).data[:21])
+
+    def test_full_file_is_streamed(self):
+        """
+        Test that assets that aren't cached in memory are streamed.
+        """
+        with patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None):
+            with patch('openedx.core.djangoapps.contentserver.middleware.set_cached_content'):
+                resp = self.client.get(self.url_unlocked)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(get_response_body(resp), self.contentstore.find(self.unlocked_asset).data)
+
+    def test_etag_header_sent(self):
+        """
+        Test that the asset's digest is sent as its ETag.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], '"{}"'.format(self.contentstore.find(self.unlocked_asset).content_digest))
+
+    @ddt.data(
+        ('"{digest}"', 304),
+        ('W/"{digest}"', 304),
+        ('"other", "{digest}"', 304),
+        ('*', 304),
+        ('"{digest}ff"', 200),
+    )
+    @ddt.unpack
+    def test_if_none_match(self, header_value, status_code):
+        """
+        Test that conditional requests are answered based on the asset's digest.
+        """
+        digest = self.contentstore.find(self.unlocked_asset).content_digest
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=header_value.format(digest=digest))
+        self.assertEqual(resp.status_code, status_code)
+        self.assertEqual(resp['ETag'], '"{}"'.format(digest))
+
+    def test_if_none_match_takes_precedence(self):
+        """
+        Test that If-Modified-Since is ignored when If-None-Match is sent.
+        """
+        resp = self.client.get(self.url_unlocked)
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_NONE_MATCH='"other"', HTTP_IF_MODIFIED_SINCE=resp['Last-Modified'],
+        )
+        self.assertEqual(resp.status_code, 200)
 
     @ddt.data(
         'bytes 0-',
@@ -164,8 +164,13 @@ class NoseDatabaseIsolation(Plugin):
 
 def get_mock_request(user=None):
     """
-    Create a request object for the user, if specified.
+    Create a request object for the user, if specified, and make it the
+    current request.
+
+    As with a real request, the request cache starts out empty, so that the
+    data cached during a previous mock request isn't used.
     """
+    RequestCache.clear_request_cache()
     request = RequestFactory().get('/')
     if user is not None:
         request.user = user
@@ -6,10 +6,17 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
+    _CompactBlockRelations - Array-backed map of all blocks' relations.
     _BlockData - Data structure for a single block's data.
+
+Copies of a BlockStructureBlockData are copy-on-write: a copy shares the
+per-block relations and data of the structure it was copied from, and
+copies them only when they are first updated through the block
+structure's methods.
 """
-from copy import deepcopy
+from array import array
 from functools import partial
+from itertools import chain
 from logging import getLogger
 
 from openedx.core.lib.graph_traversals import traverse_topologically, traverse_post_order
@@ -39,6 +46,211 @@ class _BlockRelations(object):
         # list [UsageKey]
         self.children = []
 
+    def copy(self):
+        """
+        Returns a new instance of _BlockRelations with copies of this
+        instance's lists.
+        """
+        block_relations = _BlockRelations()
+        block_relations.parents = list(self.parents)
+        block_relations.children = list(self.children)
+        return block_relations
+
+
+class _CompactBlockRelations(object):
+    """
+    A compact, array-backed alternative to the {UsageKey: _BlockRelations}
+    map of a block structure's relations.
+
+    Each usage key is interned to an integer index, and the parent and
+    child edges of all the blocks are stored in CSR-style (compressed
+    sparse row) arrays of those indices: the children of the block at
+    index i are child_indices[child_offsets[i]:child_offsets[i + 1]], and
+    likewise for parents.  This is considerably smaller to pickle, and
+    cheaper to hold in memory, than an object and two lists per block.
+
+    The arrays are never modified, so instances can share them.  Updates
+    are recorded in a (typically small) overlay of _BlockRelations and a
+    set of removed usage keys.  Since a _BlockRelations read from the
+    arrays is created anew each time, block structures must copy entries
+    on write (see BlockStructure._get_block_relations_for_update) when
+    using this map.
+    """
+    # Array type code for the interned indices and offsets.
+    TYPE_CODE = 'i'
+
+    def __init__(self, usage_keys, child_offsets, child_indices, parent_offsets, parent_indices):
+        # Interned usage keys, by index.
+        # tuple (UsageKey)
+        self._usage_keys = usage_keys
+
+        # Map of a usage key to its interned index.
+        # dict {UsageKey: int}
+        self._indices = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+
+        # CSR-style arrays of the blocks' children and parents.
+        # array(int)
+        self._child_offsets = child_offsets
+        self._child_indices = child_indices
+        self._parent_offsets = parent_offsets
+        self._parent_indices = parent_indices
+
+        # Map of usage keys to their updated or added relations.
+        # dict {UsageKey: _BlockRelations}
+        self._overlay = {}
+
+        # Set of interned usage keys that have been removed.
+        # set(UsageKey)
+        self._removed = set()
+
+    @classmethod
+    def from_relations(cls, block_relations):
+        """
+        Returns a new _CompactBlockRelations with the contents of the
+        given map of block relations.
+
+        Arguments:
+            block_relations (dict({UsageKey: _BlockRelations})) - Map
+                of a block's usage key to its parents/children relations.
+        """
+        usage_keys = tuple(block_relations.iterkeys())
+        indices = {usage_key: index for index, usage_key in enumerate(usage_keys)}
+
+        def _to_csr(relatives_of):
+            """
+            Returns the CSR-style offsets and indices arrays for the
+            given function of a block's relations to its relatives.
+            """
+            offsets = array(cls.TYPE_CODE, [0])
+            relative_indices = array(cls.TYPE_CODE)
+            for usage_key in usage_keys:
+                relative_indices.extend(indices[relative] for relative in relatives_of(block_relations[usage_key]))
+                offsets.append(len(relative_indices))
+            return offsets, relative_indices
+
+        child_offsets, child_indices = _to_csr(lambda relations: relations.children)
+        parent_offsets, parent_indices = _to_csr(lambda relations: relations.parents)
+        return cls(usage_keys, child_offsets, child_indices, parent_offsets, parent_indices)
+
+    def __getstate__(self):
+        compact = self
+        if self._overlay or self._removed:
+            compact = _CompactBlockRelations.from_relations(dict(self.iteritems()))
+        return (
+            compact._usage_keys,
+            compact._child_offsets.tostring(),
+            compact._child_indices.tostring(),
+            compact._parent_offsets.tostring(),
+            compact._parent_indices.tostring(),
+        )
+
+    def __setstate__(self, state):
+        usage_keys, buffers = state[0], state[1:]
+        arrays = []
+        for buf in buffers:
+            arr = array(self.TYPE_CODE)
+            arr.fromstring(buf)
+            arrays.append(arr)
+        self.__init__(usage_keys, *arrays)
+
+    def copy(self):
+        """
+        Returns a new _CompactBlockRelations that shares this instance's
+        arrays, with copies of its updates.
+        """
+        block_relations = _CompactBlockRelations.__new__(_CompactBlockRelations)
+        block_relations.__dict__.update(self.__dict__)
+        block_relations._overlay = dict(self._overlay)
+        block_relations._removed = set(self._removed)
+        return block_relations
+
+    def get_children(self, usage_key):
+        """
+        Returns a list of the usage keys of the children of the given
+        block.  Raises KeyError if the block is not found.
+        """
+        return self._get_relatives(usage_key, self._child_offsets, self._child_indices, 'children')
+
+    def get_parents(self, usage_key):
+        """
+        Returns a list of the usage keys of the parents of the given
+        block.  Raises KeyError if the block is not found.
+        """
+        return self._get_relatives(usage_key, self._parent_offsets, self._parent_indices, 'parents')
+
+    def _get_relatives(self, usage_key, offsets, relative_indices, relation_name):
+        """
+        Returns the requested relatives of the given block from the
+        overlay, if updated, or else from the given arrays.
+        """
+        block_relations = self._overlay.get(usage_key)
+        if block_relations is not None:
+            return getattr(block_relations, relation_name)
+        if usage_key in self._removed:
+            raise KeyError(usage_key)
+        index = self._indices[usage_key]
+        usage_keys = self._usage_keys
+        return [usage_keys[i] for i in relative_indices[offsets[index]:offsets[index + 1]]]
+
+    def __getitem__(self, usage_key):
+        block_relations = self._overlay.get(usage_key)
+        if block_relations is None:
+            block_relations = _BlockRelations()
+            block_relations.children = self.get_children(usage_key)
+            block_relations.parents = self.get_parents(usage_key)
+        return block_relations
+
+    def __setitem__(self, usage_key, block_relations):
+        self._overlay[usage_key] = block_relations
+        self._removed.discard(usage_key)
+
+    def __contains__(self, usage_key):
+        if usage_key in self._overlay:
+            return True
+        return usage_key in self._indices and usage_key not in self._removed
+
+    def __len__(self):
+        num_added = sum(1 for usage_key in self._overlay if usage_key not in self._indices)
+        return len(self._usage_keys) - len(self._removed) + num_added
+
+    def __iter__(self):
+        return self.iterkeys()
+
+    def get(self, usage_key, default=None):
+        """
+        Returns the block relations for the given usage key; returns
+        default if not found.
+        """
+        return self[usage_key] if usage_key in self else default
+
+    def pop(self, usage_key, default=None):
+        """
+        Removes the given usage key and returns its block relations;
+        returns default if not found.
+        """
+        if usage_key not in self:
+            return default
+        block_relations = self[usage_key]
+        self._overlay.pop(usage_key, None)
+        if usage_key in self._indices:
+            self._removed.add(usage_key)
+        return block_relations
+
+    def iterkeys(self):
+        """
+        Returns an iterator of the usage keys in the map.
+        """
+        return chain(
+            (usage_key for usage_key in self._usage_keys if usage_key not in self._removed),
+            (usage_key for usage_key in self._overlay if usage_key not in self._indices),
+        )
+
+    def iteritems(self):
+        """
+        Returns an iterator of (UsageKey, _BlockRelations) pairs in the map.
+        """
+        return ((usage_key, self[usage_key]) for usage_key in self.iterkeys())
+
 
 class BlockStructure(object):
     """
@@ -59,9 +271,17 @@ class BlockStructure(object):
         # Map of a block's usage key to its block relations. The
         # existence of a block in the structure is determined by its
         # presence in this map.
-        # dict {UsageKey: _BlockRelations}
+        # dict {UsageKey: _BlockRelations} or _CompactBlockRelations
         self._block_relations = {}
 
+        # Set of usage keys whose block relations are owned by this
+        # block structure, when its relations are shared with other
+        # block structures.  The relations of any other block must be
+        # copied before being updated.  None if all block relations are
+        # owned by this block structure.
+        # set(UsageKey) or None
+        self._owned_block_relations = None
+
         # Add the root block.
         self._add_block(self._block_relations, root_block_usage_key)
 
@@ -91,7 +311,11 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        if usage_key not in self:
+            return []
+        if self._has_compact_block_relations():
+            return self._block_relations.get_parents(usage_key)
+        return self._block_relations[usage_key].parents
 
     def get_children(self, usage_key):
         """
@@ -105,7 +329,11 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        if usage_key not in self:
+            return []
+        if self._has_compact_block_relations():
+            return self._block_relations.get_children(usage_key)
+        return self._block_relations[usage_key].children
 
     def set_root_block(self, usage_key):
         """
@@ -120,7 +348,7 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._get_block_relations_for_update(usage_key).parents = []
 
     def __contains__(self, usage_key):
         """
@@ -209,25 +437,26 @@ class BlockStructure(object):
         # Create a new block relations map to store only those blocks
         # that are still linked
         pruned_block_relations = {}
-        old_block_relations = self._block_relations
 
         # Build the structure from the leaves up by doing a post-order
         # traversal of the old structure, thereby encountering only
         # reachable blocks.
         for block_key in self.post_order_traversal():
             # If the block is in the old structure,
-            if block_key in old_block_relations:
+            if block_key in self:
                 # Add it to the new pruned structure
                 self._add_block(pruned_block_relations, block_key)
 
                 # Add a relationship to only those old children that
                 # were also added to the new pruned structure.
-                for child in old_block_relations[block_key].children:
+                for child in self.get_children(block_key):
                     if child in pruned_block_relations:
                         self._add_to_relations(pruned_block_relations, block_key, child)
 
-        # Replace this structure's relations with the newly pruned one.
+        # Replace this structure's relations with the newly pruned one,
+        # all of which are owned by this structure.
         self._block_relations = pruned_block_relations
+        self._owned_block_relations = None
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -237,7 +466,54 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
-        self._add_to_relations(self._block_relations, parent_key, child_key)
+        self._add_block(self._block_relations, parent_key)
+        self._add_block(self._block_relations, child_key)
+
+        self._get_block_relations_for_update(child_key).parents.append(parent_key)
+        self._get_block_relations_for_update(parent_key).children.append(child_key)
+
+    def _get_block_relations_for_update(self, usage_key):
+        """
+        Returns the block relations for the given usage_key, copying
+        them first if they are shared with another block structure.
+
+        Arguments:
+            usage_key (UsageKey) - Usage key of the block whose
+                relations are to be updated.
+        """
+        block_relations = self._block_relations[usage_key]
+        if self._owned_block_relations is not None and usage_key not in self._owned_block_relations:
+            block_relations = block_relations.copy()
+            self._block_relations[usage_key] = block_relations
+            self._owned_block_relations.add(usage_key)
+        return block_relations
+
+    def _share_block_relations(self):
+        """
+        Returns a shallow copy of this structure's block relations map
+        to be shared with a new block structure.  From then on, any
+        block relations in the map are copied before being updated by
+        either block structure.
+        """
+        self._owned_block_relations = set()
+        return self._block_relations.copy()
+
+    def _compact_block_relations(self):
+        """
+        Replaces this structure's block relations with an equivalent
+        _CompactBlockRelations.  Since block relations read from it are
+        created anew each time, they are from then on copied on write.
+        """
+        if not self._has_compact_block_relations():
+            self._block_relations = _CompactBlockRelations.from_relations(self._block_relations)
+        self._owned_block_relations = set()
+
+    def _has_compact_block_relations(self):
+        """
+        Returns whether this structure's block relations are stored in
+        a _CompactBlockRelations.
+        """
+        return isinstance(self._block_relations, _CompactBlockRelations)
 
     @staticmethod
     def _add_to_relations(block_relations, parent_key, child_key):
@@ -294,6 +570,15 @@ class FieldData(object):
         # dict {string: any picklable type}
         self.fields = {}
 
+    def __copy__(self):
+        """
+        Returns a new instance with a shallow copy of this instance's
+        fields.
+        """
+        field_data = self.__class__.__new__(self.__class__)
+        field_data.fields = dict(self.fields)
+        return field_data
+
     def __getattr__(self, field_name):
         if self._is_own_field(field_name):
             return super(FieldData, self).__getattr__(field_name)
@@ -347,6 +632,16 @@ class TransformerDataMap(dict):
         key = self._translate_key(key)
         dict.__delitem__(self, key)
 
+    def copy(self):
+        """
+        Returns a new TransformerDataMap with copies of this map's
+        TransformerData.
+        """
+        return TransformerDataMap(
+            (name, transformer_data.__copy__())
+            for name, transformer_data in self.iteritems()
+        )
+
     def get_or_create(self, key):
         """
         Returns the TransformerData associated with the given
@@ -391,6 +686,16 @@ class BlockData(FieldData):
         # Map of transformer name to its block-specific data.
         self.transformer_data = TransformerDataMap()
 
+    def __copy__(self):
+        """
+        Returns a new instance with copies of this instance's fields and
+        transformer data.
+        """
+        block_data = super(BlockData, self).__copy__()
+        block_data.location = self.location
+        block_data.transformer_data = self.transformer_data.copy()
+        return block_data
+
 
 class BlockStructureBlockData(BlockStructure):
     """
@@ -414,18 +719,31 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Set of usage keys whose block data is owned by this block
+        # structure, when its block data is shared with other block
+        # structures.  See _owned_block_relations.
+        # set(UsageKey) or None
+        self._owned_block_data = None
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
-        deep-copy of this instance's contents.
+        copy-on-write copy of this instance's contents.
+
+        The new instance shares the relations and data of each block
+        with this instance until either instance updates them, so a
+        copy costs a dict copy rather than a copy of every block.
         """
         from .factory import BlockStructureFactory
-        return BlockStructureFactory.create_new(
+        block_structure = BlockStructureFactory.create_new(
             self.root_block_usage_key,
-            deepcopy(self._block_relations),
-            deepcopy(self.transformer_data),
-            deepcopy(self._block_data_map),
+            self._share_block_relations(),
+            self.transformer_data.copy(),
+            self._share_block_data_map(),
         )
+        block_structure._owned_block_relations = set()
+        block_structure._owned_block_data = set()
+        return block_structure
 
     def iteritems(self):
         """
@@ -559,7 +877,7 @@ class BlockStructureBlockData(BlockStructure):
                 requested block.
         """
         setattr(
-            self._get_or_create_block(usage_key).transformer_data.get_or_create(transformer),
+            self._get_or_create_block_for_update(usage_key).transformer_data.get_or_create(transformer),
             key,
             value,
         )
@@ -577,9 +895,12 @@ class BlockStructureBlockData(BlockStructure):
                 whose data entry is to be deleted.
         """
         try:
-            transformer_block_data = self.get_transformer_block_data(usage_key, transformer)
-            delattr(transformer_block_data, key)
-        except (AttributeError, KeyError):
+            self.get_transformer_block_data(usage_key, transformer)
+        except KeyError:
+            return
+        try:
+            delattr(self._get_or_create_block_for_update(usage_key).transformer_data[transformer], key)
+        except AttributeError:
             pass
 
     def remove_block(self, usage_key, keep_descendants):
@@ -607,11 +928,11 @@ class BlockStructureBlockData(BlockStructure):
 
         # Remove block from its children.
         for child in children:
-            self._block_relations[child].parents.remove(usage_key)
+            self._get_block_relations_for_update(child).parents.remove(usage_key)
 
         # Remove block from its parents.
         for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
+            self._get_block_relations_for_update(parent).children.remove(usage_key)
 
         # Remove block.
         self._block_relations.pop(usage_key, None)
@@ -745,8 +1066,34 @@ class BlockStructureBlockData(BlockStructure):
         except KeyError:
             block_data = BlockData(usage_key)
             self._block_data_map[usage_key] = block_data
+            if self._owned_block_data is not None:
+                self._owned_block_data.add(usage_key)
             return block_data
 
+    def _get_or_create_block_for_update(self, usage_key):
+        """
+        Returns the BlockData associated with the given usage_key,
+        copying it first if it is shared with another block structure.
+        If not found, creates and returns a new BlockData and maps it
+        to the given key.
+        """
+        block_data = self._get_or_create_block(usage_key)
+        if self._owned_block_data is not None and usage_key not in self._owned_block_data:
+            block_data = block_data.__copy__()
+            self._block_data_map[usage_key] = block_data
+            self._owned_block_data.add(usage_key)
+        return block_data
+
+    def _share_block_data_map(self):
+        """
+        Returns a shallow copy of this structure's block data map to be
+        shared with a new block structure.  From then on, any block data
+        in the map is copied before being updated by either block
+        structure.
+        """
+        self._owned_block_data = set()
+        return dict(self._block_data_map)
+
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
     """
@@ -2,21 +2,53 @@
 Module for the Cache class for BlockStructure objects.
 """
 # pylint: disable=protected-access
+import cPickle as pickle
 from logging import getLogger
+from uuid import uuid4
+import zlib
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+from openedx.core.lib.cache_utils import LRUCache, zpickle
 
-from .block_structure import BlockStructureBlockData
+from .block_structure import BlockStructureBlockData, _CompactBlockRelations
 from .factory import BlockStructureFactory
 
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
 
+# Default maximum size, in bytes of uncompressed pickled data, of the
+# block structures held in the process-local tier of the cache.
+DEFAULT_PROCESS_CACHE_MAX_SIZE = 50 * 1024 * 1024
+
+
 class BlockStructureCache(object):
     """
     Cache for BlockStructure objects.
+
+    The cache has two tiers:
+
+      * The given (shared) cache, which stores a compressed and pickled
+        serialization of each block structure along with a small version
+        token that changes each time the structure is re-collected.
+
+      * A process-local LRU cache, bounded by (serialized) bytes, which
+        stores the deserialized block structure keyed by the root usage
+        key and tagged with the version token it was read with.  A read
+        only needs to fetch the version token from the shared cache; the
+        (large) serialized structure is fetched and deserialized only
+        when the local copy is missing or out of date.
+
+    The locally cached block structures are never modified.  Instead,
+    each read returns a copy-on-write copy of them.
     """
+    # The process-local tier, shared by all instances of this class.
+    process_cache = LRUCache(max_size=DEFAULT_PROCESS_CACHE_MAX_SIZE)
+
+    # Whether to serialize block relations in their compact, array-backed
+    # representation.  Note: Processes running code that predates the
+    # compact representation cannot read structures serialized with it.
+    compact_block_relations = False
+
     def __init__(self, cache):
         """
         Arguments:
@@ -35,25 +67,37 @@ class BlockStructureCache(object):
         The data stored in the cache includes the structure's
         block relations, transformer data, and block data.
 
+        A new version token, stored alongside the data, is also
+        generated so that stale copies in the process-local tiers of
+        other processes are no longer used.
+
         Arguments:
             block_structure (BlockStructure) - The block structure
                 that is to be serialized to the given cache.
         """
+        block_relations = block_structure._block_relations
+        if self.compact_block_relations and not block_structure._has_compact_block_relations():
+            block_relations = _CompactBlockRelations.from_relations(block_relations)
         data_to_cache = (
-            block_structure._block_relations,
+            block_relations,
             block_structure.transformer_data,
             block_structure._block_data_map,
         )
         zp_data_to_cache = zpickle(data_to_cache)
+        root_block_usage_key = block_structure.root_block_usage_key
+        version = self._create_version(block_structure)
 
         # Set the timeout value for the cache to 1 day as a fail-safe
         # in case the signal to invalidate the cache doesn't come through.
         timeout_in_seconds = 60 * 60 * 24
-        self._cache.set(
-            self._encode_root_cache_key(block_structure.root_block_usage_key),
-            zp_data_to_cache,
+        self._cache.set_many(
+            {
+                self._encode_root_cache_key(root_block_usage_key): zp_data_to_cache,
+                self._encode_version_cache_key(root_block_usage_key): version,
+            },
             timeout=timeout_in_seconds,
         )
+        self.process_cache.delete(self._encode_root_cache_key(root_block_usage_key))
 
         logger.info(
             "Wrote BlockStructure %s to cache, size: %s",
@@ -81,29 +125,44 @@ class BlockStructureCache(object):
             NoneType - If the root_block_usage_key is not found in the cache.
         """
 
-        # Find root_block_usage_key in the cache.
-        zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
-        if not zp_data_from_cache:
+        # Find the current version of root_block_usage_key in the cache.
+        version = self._cache.get(self._encode_version_cache_key(root_block_usage_key))
+        if not version:
             logger.info(
                 "Did not find BlockStructure %r in the cache.",
                 root_block_usage_key,
             )
             return None
-        else:
-            logger.info(
-                "Read BlockStructure %r from cache, size: %s",
+
+        # Use the process-local copy if it is of the same version.
+        block_structure = self._get_from_process_cache(root_block_usage_key, version)
+        if block_structure is None:
+            zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
+            if not zp_data_from_cache:
+                logger.info(
+                    "Did not find BlockStructure %r in the cache.",
+                    root_block_usage_key,
+                )
+                return None
+            else:
+                logger.info(
+                    "Read BlockStructure %r from cache, size: %s",
+                    root_block_usage_key,
+                    len(zp_data_from_cache),
+                )
+
+            # Deserialize and construct the block structure.
+            p_data_from_cache = zlib.decompress(zp_data_from_cache)
+            block_relations, transformer_data, block_data_map = pickle.loads(p_data_from_cache)
+            block_structure = BlockStructureFactory.create_new(
                 root_block_usage_key,
-                len(zp_data_from_cache),
+                block_relations,
+                transformer_data,
+                block_data_map,
             )
+            self._add_to_process_cache(version, block_structure, len(p_data_from_cache))
 
-        # Deserialize and construct the block structure.
-        block_relations, transformer_data, block_data_map = zunpickle(zp_data_from_cache)
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
+        return block_structure.copy()
 
     def delete(self, root_block_usage_key):
         """
@@ -115,12 +174,75 @@ class BlockStructureCache(object):
                 of the block structure that is to be removed from
                 the cache.
         """
-        self._cache.delete(self._encode_root_cache_key(root_block_usage_key))
+        self._cache.delete_many([
+            self._encode_root_cache_key(root_block_usage_key),
+            self._encode_version_cache_key(root_block_usage_key),
+        ])
+        self.process_cache.delete(self._encode_root_cache_key(root_block_usage_key))
         logger.info(
             "Deleted BlockStructure %r from the cache.",
             root_block_usage_key,
         )
 
+    def _get_from_process_cache(self, root_block_usage_key, version):
+        """
+        Returns the block structure for the given root_block_usage_key
+        from the process-local cache, if it is found there with the
+        given version.  Otherwise, returns None.
+
+        The returned block structure must not be modified.
+        """
+        cached_version, block_structure = self.process_cache.get(
+            self._encode_root_cache_key(root_block_usage_key),
+            (None, None),
+        )
+        if cached_version != version:
+            return None
+        logger.info(
+            "Read BlockStructure %r from process cache.",
+            root_block_usage_key,
+        )
+        return block_structure
+
+    def _add_to_process_cache(self, version, block_structure, size):
+        """
+        Stores the given block structure, tagged with the given version,
+        in the process-local cache.  The given size, in bytes of its
+        uncompressed serialization, is used to bound the cache.
+        """
+        self.process_cache.set(
+            self._encode_root_cache_key(block_structure.root_block_usage_key),
+            (version, block_structure),
+            size=size,
+        )
+
+    @classmethod
+    def _create_version(cls, block_structure):
+        """
+        Returns a new version token for the given block structure.  The
+        token includes the course's published version, when it was
+        collected, and is unique for each collection of the structure.
+        """
+        course_version = block_structure.get_xblock_field(
+            block_structure.root_block_usage_key,
+            'course_version',
+        )
+        return u"{course_version}.{nonce}".format(
+            course_version=course_version or u'',
+            nonce=uuid4().hex,
+        )
+
+    @classmethod
+    def _encode_version_cache_key(cls, root_block_usage_key):
+        """
+        Returns the cache key to use for storing the version token of
+        the block structure for the given root_block_usage_key.
+        """
+        return "v{version}.root.version.{root_usage_key}".format(
+            version=unicode(BlockStructureBlockData.VERSION),
+            root_usage_key=unicode(root_block_usage_key),
+        )
+
     @classmethod
     def _encode_root_cache_key(cls, root_block_usage_key):
         """
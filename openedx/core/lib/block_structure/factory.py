@@ -90,6 +90,8 @@ class BlockStructureFactory(object):
         """
         block_structure = BlockStructureBlockData(root_block_usage_key)
         block_structure._block_relations = block_relations  # pylint: disable=protected-access
+        if block_structure._has_compact_block_relations():  # pylint: disable=protected-access
+            block_structure._compact_block_relations()  # pylint: disable=protected-access
         block_structure.transformer_data = transformer_data
         block_structure._block_data_map = block_data_map  # pylint: disable=protected-access
         return block_structure
@@ -95,6 +95,14 @@ class MockCache(object):
         self.map[key] = val
         self.timeout_from_last_call = timeout
 
+    def set_many(self, data, timeout):
+        """
+        Associates each of the given keys with its value in the cache.
+        """
+        self.set_call_count += 1
+        self.map.update(data)
+        self.timeout_from_last_call = timeout
+
     def get(self, key, default=None):
         """
         Returns the value associated with the given key in the cache;
@@ -108,6 +116,13 @@ class MockCache(object):
         """
         del self.map[key]
 
+    def delete_many(self, keys):
+        """
+        Deletes the given keys from the cache.
+        """
+        for key in keys:
+            self.map.pop(key, None)
+
 
 class MockModulestoreFactory(object):
     """
@@ -4,6 +4,7 @@ Tests for block_structure.py
 # pylint: disable=protected-access
 from collections import namedtuple
 from copy import deepcopy
+import cPickle as pickle
 import ddt
 import itertools
 from nose.plugins.attrib import attr
@@ -11,7 +12,7 @@ from unittest import TestCase
 
 from openedx.core.lib.graph_traversals import traverse_post_order
 
-from ..block_structure import BlockStructure, BlockStructureModulestoreData
+from ..block_structure import BlockStructure, BlockStructureModulestoreData, _CompactBlockRelations
 from ..exceptions import TransformerException
 from .helpers import MockXBlock, MockTransformer, ChildrenMapTestMixin
 
@@ -44,6 +45,26 @@ class TestBlockStructure(TestCase, ChildrenMapTestMixin):
             self.assertIn(node, block_structure)
         self.assertNotIn(len(children_map) + 1, block_structure)
 
+    @ddt.data(
+        [],
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_compact_relations(self, children_map):
+        block_structure = self.create_block_structure(children_map, BlockStructure)
+        block_structure._compact_block_relations()
+        self.assertTrue(block_structure._has_compact_block_relations())
+        self.assert_block_structure(block_structure, children_map)
+        self.assertEquals(len(block_structure), len(children_map) or 1)
+        self.assertSetEqual(set(block_structure), set(range(len(children_map) or 1)))
+
+        # serialization
+        unpickled_relations = pickle.loads(pickle.dumps(block_structure._block_relations, pickle.HIGHEST_PROTOCOL))
+        self.assertIsInstance(unpickled_relations, _CompactBlockRelations)
+        block_structure._block_relations = unpickled_relations
+        self.assert_block_structure(block_structure, children_map)
+
 
 @attr(shard=2)
 @ddt.ddt
@@ -157,6 +178,7 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
 
     @ddt.data(
         *itertools.product(
+            [True, False],
             [True, False],
             range(7),
             [
@@ -167,13 +189,15 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         )
     )
     @ddt.unpack
-    def test_remove_block(self, keep_descendants, block_to_remove, children_map):
+    def test_remove_block(self, compact, keep_descendants, block_to_remove, children_map):
         ### skip test if invalid
         if (block_to_remove >= len(children_map)) or (keep_descendants and block_to_remove == 0):
             return
 
         ### create structure
         block_structure = self.create_block_structure(children_map)
+        if compact:
+            block_structure._compact_block_relations()
         parents_map = self.get_parents_map(children_map)
 
         ### verify blocks pre-exist
@@ -196,6 +220,9 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
                     removed_children_map[parent].append(child)
 
         self.assert_block_structure(block_structure, removed_children_map, missing_blocks)
+        if compact:
+            unpickled_relations = pickle.loads(pickle.dumps(block_structure._block_relations))
+            self.assertEquals(set(unpickled_relations), set(block_structure))
 
         ### prune the structure
         block_structure._prune_unreachable()
@@ -267,3 +294,27 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEquals(_get_value(block_structure), 'edit1')
         self.assertEquals(_get_value(new_copy), 'edit2')
+
+    def test_copy_on_write(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        block_structure.set_transformer_block_field(3, 'transformer', 'test_key', 'original_value')
+        new_copy = block_structure.copy()
+
+        # unmodified blocks are shared by both structures
+        self.assertIs(block_structure[3], new_copy[3])
+
+        # a copy of a copy is independent of both
+        copy_of_copy = new_copy.copy()
+        new_copy.set_root_block(1)
+        new_copy._prune_unreachable()  # pylint: disable=protected-access
+        copy_of_copy.set_transformer_block_field(3, 'transformer', 'test_key', 'edit')
+        copy_of_copy.remove_block(4, keep_descendants=False)
+
+        self.assert_block_structure(block_structure, ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        self.assert_block_structure(new_copy, [[], [3, 4], [], [], []], missing_blocks=[0, 2])
+        self.assert_block_structure(copy_of_copy, [[1, 2], [3], [], [], []], missing_blocks=[4])
+        for structure in (block_structure, new_copy):
+            self.assertEquals(
+                structure.get_transformer_block_field(3, 'transformer', 'test_key'), 'original_value'
+            )
+        self.assertEquals(copy_of_copy.get_transformer_block_field(3, 'transformer', 'test_key'), 'edit')
@@ -19,6 +19,7 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.block_structure = self.create_block_structure(self.children_map)
         self.mock_cache = MockCache()
         self.block_structure_cache = BlockStructureCache(self.mock_cache)
+        BlockStructureCache.process_cache.clear()
 
     def add_transformers(self):
         """
@@ -54,3 +55,65 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.assertIsNone(
             self.block_structure_cache.get(self.block_structure.root_block_usage_key)
         )
+
+    def test_get_from_process_cache(self):
+        self.add_transformers()
+        self.block_structure_cache.add(self.block_structure)
+        self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+
+        # Remove the serialized data, but not its version, from the
+        # shared cache so it can only be read from the process cache.
+        root_cache_key = self.block_structure_cache._encode_root_cache_key(  # pylint: disable=protected-access
+            self.block_structure.root_block_usage_key
+        )
+        del self.mock_cache.map[root_cache_key]
+
+        cached_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        self.assertIsNotNone(cached_value)
+        self.assert_block_structure(cached_value, self.children_map)
+
+    def test_process_cache_outdated_version(self):
+        other_children_map = [[1], []]
+        other_block_structure = self.create_block_structure(other_children_map)
+        other_mock_cache = MockCache()
+        BlockStructureCache(other_mock_cache).add(other_block_structure)
+
+        self.block_structure_cache.add(self.block_structure)
+
+        # Simulate another process updating the shared cache with a newer
+        # version of the structure.
+        self.mock_cache.map.update(other_mock_cache.map)
+
+        cached_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(cached_value, other_children_map)
+
+    def test_process_cache_not_modified(self):
+        self.add_transformers()
+        self.block_structure_cache.add(self.block_structure)
+
+        block_structure = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        block_structure.remove_block(1, keep_descendants=False)
+        block_structure.set_transformer_block_field(0, MockTransformer, 'test', 'updated')
+
+        cached_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(cached_value, self.children_map)
+        self.assertEquals(
+            cached_value.get_transformer_block_field(0, MockTransformer, 'test'),
+            '{} val'.format(MockTransformer.name()),
+        )
+
+    def test_compact_block_relations(self):
+        self.add_transformers()
+        self.block_structure_cache.compact_block_relations = True
+        self.block_structure_cache.add(self.block_structure)
+
+        cached_value = self.block_structure_cache.get(self.block_structure.root_block_usage_key)
+        self.assertTrue(cached_value._has_compact_block_relations())  # pylint: disable=protected-access
+        self.assert_block_structure(cached_value, self.children_map)
+
+        cached_value.remove_block(1, keep_descendants=True)
+        self.assert_block_structure(cached_value, [[2, 3, 4], [], [], [], []], missing_blocks=[1])
+        self.assert_block_structure(
+            self.block_structure_cache.get(self.block_structure.root_block_usage_key),
+            self.children_map,
+        )
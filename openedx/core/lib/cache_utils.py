@@ -4,6 +4,7 @@ Utilities related to caching.
 import collections
 import cPickle as pickle
 import functools
+import threading
 import zlib
 from xblock.core import XBlock
 
@@ -83,6 +84,97 @@ class memoized(object):  # pylint: disable=invalid-name
         return functools.partial(self.__call__, obj)
 
 
+class LRUCache(object):
+    """
+    A thread-safe, size-bounded, least-recently-used cache for data that is
+    local to a single worker process.
+
+    Each entry is given a size (defaulting to 1) when it is set, so the cache
+    can be bounded either by number of entries or by an approximate number of
+    bytes.  Least-recently-used entries are evicted until the total size of
+    the cache is within max_size.
+
+    WARNING: Entries are shared across all threads and requests served by the
+    process.  Only cache values that are never mutated after being set, and
+    make sure they are invalidated (or keyed by an immutable version) when
+    the underlying data changes.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def size(self):
+        """
+        Returns the total size of all the entries in the cache.
+        """
+        return self._size
+
+    def get(self, key, default=None):
+        """
+        Returns the value associated with the given key, marking it as the
+        most recently used; returns default if not found.
+        """
+        with self._lock:
+            try:
+                value, size = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries[key] = (value, size)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size=1):
+        """
+        Associates the given value with the given key.  Values larger than
+        the cache's max_size are not cached at all.
+        """
+        with self._lock:
+            self._remove(key)
+            if size > self.max_size:
+                return
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        """
+        Removes the given key from the cache, if present.
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """
+        Removes all the entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        """
+        Removes the given key, if present.  The caller must hold the lock.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
 def hashvalue(arg):
     """
     If arg is an xblock, use its location. otherwise just turn it into a string
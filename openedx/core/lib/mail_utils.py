@@ -2,10 +2,23 @@
 Utilities related to mailing.
 """
 
+import re
 import textwrap
 
 MAX_LINE_LENGTH = 900
 
+# Whitespace, as it separates the chunks of text that textwrap wraps.
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _wrap_line(line, width):
+    """
+    Returns the lines that `line` is wrapped into.
+    """
+    return textwrap.wrap(
+        line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
+    )
+
 
 def wrap_message(message, width=MAX_LINE_LENGTH):
     """
@@ -14,9 +27,32 @@ def wrap_message(message, width=MAX_LINE_LENGTH):
     a line. To ensure that messages look consistent this helper function wraps long lines to a conservative length.
     """
     lines = message.split('\n')
-    wrapped_lines = [textwrap.fill(
-        line, width, expand_tabs=False, replace_whitespace=False, drop_whitespace=False, break_on_hyphens=False
-    ) for line in lines]
+    wrapped_lines = ['\n'.join(_wrap_line(line, width)) for line in lines]
     wrapped_message = '\n'.join(wrapped_lines)
 
     return wrapped_message
+
+
+def wrap_message_prefix(prefix, width=MAX_LINE_LENGTH):
+    """
+    Wraps as much of the beginning of a message as can be wrapped without
+    knowing the rest of it.
+
+    Returns a tuple (wrapped, rest), such that for any `suffix`,
+    wrap_message(prefix + suffix) == wrapped + wrap_message(rest + suffix).
+    """
+    head, newline, last_line = prefix.rpartition('\n')
+    wrapped = wrap_message(head, width) + newline if newline else ''
+
+    # The lines that textwrap finishes before the last whitespace of the prefix
+    # don't depend on what follows it.
+    last_whitespace = None
+    for last_whitespace in WHITESPACE_RE.finditer(last_line):
+        pass
+    if last_whitespace is None:
+        return wrapped, last_line
+    finished_lines = _wrap_line(last_line[:last_whitespace.start()], width)[:-1]
+    if not finished_lines:
+        return wrapped, last_line
+    wrapped += '\n'.join(finished_lines) + '\n'
+    return wrapped, last_line[sum(len(line) for line in finished_lines):]
@@ -5,7 +5,7 @@ import ddt
 from mock import MagicMock
 from unittest import TestCase
 
-from openedx.core.lib.cache_utils import memoize_in_request_cache
+from openedx.core.lib.cache_utils import LRUCache, memoize_in_request_cache
 
 
 @ddt.ddt
@@ -62,3 +62,44 @@ class TestMemoizeInRequestCache(TestCase):
                 func_to_memoize(*arg_list2)
 
             self.assertEquals(self.func_to_count.call_count, 2)
+
+
+class TestLRUCache(TestCase):
+    """
+    Test the LRUCache class.
+    """
+    def setUp(self):
+        super(TestLRUCache, self).setUp()
+        self.cache = LRUCache(max_size=10)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get('foo'))
+        self.cache.set('foo', 'bar')
+        self.assertEquals(self.cache.get('foo'), 'bar')
+        self.assertEquals((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1, size=4)
+        self.cache.set('b', 2, size=4)
+        self.cache.get('a')
+        self.cache.set('c', 3, size=4)
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+        self.assertIn('c', self.cache)
+        self.assertEquals(self.cache.size, 8)
+        self.assertEquals(self.cache.evictions, 1)
+
+    def test_too_large(self):
+        self.cache.set('a', 1, size=11)
+        self.assertNotIn('a', self.cache)
+        self.assertEquals(self.cache.size, 0)
+
+    def test_replace_and_delete(self):
+        self.cache.set('a', 1, size=4)
+        self.cache.set('a', 2, size=6)
+        self.assertEquals(self.cache.size, 6)
+        self.assertEquals(self.cache.get('a'), 2)
+        self.cache.delete('a')
+        self.cache.delete('a')
+        self.assertEquals(len(self.cache), 0)
+        self.assertEquals(self.cache.size, 0)